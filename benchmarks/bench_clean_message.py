@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Mesure le coût par message du nettoyage HTML de ``jsonise``.
+
+Compare l'ancienne implémentation (un ``Cleaner`` lxml construit et des
+expressions régulières recompilées à chaque message) au moteur partagé
+``TEXT_CLEANER``. Le corpus est soit un fichier mbox passé en argument, soit
+une série de newsletters HTML générées.
+
+Usage :
+    PYTHONPATH=src python benchmarks/bench_clean_message.py [--mbox FICHIER] [--messages N] [--repeat R]
+"""
+import argparse
+import re
+import time
+from email.mime.text import MIMEText
+
+from lxml import html as lxml_html
+from lxml.html.clean import Cleaner
+
+from mcps.email_processing.jsonise import clean_body, clean_message, extract_body, email_to_dict
+from mcps.email_processing.mbox_reader import iter_messages
+
+
+def legacy_clean_message(message):
+    """Implémentation d'origine de ``clean_message``, conservée comme référence."""
+    try:
+        payload_bytes = message.get_payload(decode=True)
+        charset = message.get_content_charset() or "utf-8"
+        html_text = payload_bytes.decode(charset, errors="replace")
+    except Exception:
+        return ""
+    try:
+        doc = lxml_html.fromstring(html_text)
+    except Exception:
+        return html_text
+    cleaner = Cleaner(
+        scripts=True, javascript=True, style=True, comments=True,
+        page_structure=False, safe_attrs_only=False,
+        remove_tags=[
+            "head", "title", "meta", "link",
+            "iframe", "object", "embed", "svg",
+            "table", "tr", "td", "th", "tbody", "thead", "tfoot"
+        ],
+    )
+    cleaned_doc = cleaner.clean_html(doc)
+    for el in cleaned_doc.iter():
+        if "style" in el.attrib:
+            del el.attrib["style"]
+        if el.text:
+            el.text = re.sub(r"\b\w+\s*\{[^}]*\}", "", el.text).strip()
+        if el.tail:
+            el.tail = re.sub(r"\b\w+\s*\{[^}]*\}", "", el.tail).strip()
+    body_text = cleaned_doc.text_content()
+    return re.sub(r"\n\s*\n+", "\n\n", body_text).strip()
+
+
+def legacy_email_to_dict(message):
+    """Implémentation d'origine du traitement d'un email, conservée comme référence."""
+    if message.get_content_type() == "text/html":
+        body_raw = legacy_clean_message(message)
+    else:
+        body_raw = extract_body(message)
+    body_clean = clean_body(body_raw)
+    body_clean = re.sub(r'(?<!\S)[^\s]{' + str(15 + 1) + r',}(?!\S)', '', body_clean)
+    body_clean = re.sub(r'[^\x00-\xFF]', '', body_clean)
+    body_clean = re.sub(r'[\n\xa0]', '.', body_clean)
+    body_clean = re.sub(r' +', ' ', body_clean)
+    return {
+        "from": message.get("From"),
+        "subject": message.get("Subject"),
+        "date": message.get("Date"),
+        "body": body_clean,
+    }
+
+
+def generate_corpus(count):
+    """Génère ``count`` newsletters HTML avec styles, tableaux et scripts."""
+    corpus = []
+    for i in range(count):
+        rows = "".join(
+            f'<tr><td style="padding:4px">Article {i}-{j} : une brève de quelques mots '
+            f'pour remplir la lettre <a href="https://example.com/{j}">lire la suite</a></td></tr>'
+            for j in range(40)
+        )
+        html = (
+            '<html><head><title>Lettre</title><style>body {color: #333;} td {padding: 0}</style></head>'
+            f'<body><div style="font-family:Arial"><h1>Lettre n°{i}</h1>'
+            f'<script>track({i});</script><table>{rows}</table>'
+            '<p>p {margin:0} Pour vous désabonner, cliquez ici.</p></div></body></html>'
+        )
+        msg = MIMEText(html, 'html', 'utf-8')
+        msg['From'] = 'lettre@example.com'
+        msg['Subject'] = f'Lettre {i}'
+        corpus.append(msg)
+    return corpus
+
+
+def bench(label, func, corpus, repeat):
+    """Exécute ``func`` sur le corpus et affiche le meilleur temps par message."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    per_message = best / len(corpus) * 1000
+    print(f"{label:<32} {per_message:8.3f} ms/message  ({len(corpus)} messages)")
+    return per_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mbox", help="Fichier mbox à utiliser comme corpus")
+    parser.add_argument("--messages", type=int, default=200, help="Nombre de newsletters générées")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de passes (meilleur temps retenu)")
+    args = parser.parse_args()
+
+    corpus = list(iter_messages(args.mbox)) if args.mbox else generate_corpus(args.messages)
+    corpus = [m for m in corpus if m.get_content_type() == "text/html"] or corpus
+
+    # Les deux implémentations doivent produire le même texte
+    for message in corpus:
+        assert legacy_clean_message(message) == clean_message(message)
+        assert legacy_email_to_dict(message) == email_to_dict(message)
+
+    before = bench("clean_message (avant)", legacy_clean_message, corpus, args.repeat)
+    after = bench("clean_message (TEXT_CLEANER)", clean_message, corpus, args.repeat)
+    print(f"gain : {(1 - after / before) * 100:.1f} %")
+    before = bench("traitement complet (avant)", legacy_email_to_dict, corpus, args.repeat)
+    after = bench("email_to_dict (TEXT_CLEANER)", email_to_dict, corpus, args.repeat)
+    print(f"gain : {(1 - after / before) * 100:.1f} %")
+
+
+if __name__ == "__main__":
+    main()
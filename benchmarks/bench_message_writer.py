@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Mesure le débit d'écriture des messages JSON-RPC du serveur.
+
+Compare l'ancien ``send_message`` (``json.dump`` sur la couche texte de stdout,
+puis ``write("\\n")`` et ``flush()``) à ``MessageWriter``, qui encode une fois et
+écrit d'un bloc dans le tampon binaire, avec ``json`` puis ``orjson`` s'il est
+installé. Les messages sont écrits dans ``/dev/null`` depuis un ou plusieurs threads.
+
+Usage :
+    PYTHONPATH=src python benchmarks/bench_message_writer.py [--messages N] [--threads T] [--size OCTETS]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from mcps.mcp_server import message_writer
+from mcps.mcp_server.message_writer import MessageWriter
+
+
+def legacy_sender(stream):
+    """Implémentation d'origine de ``send_message``, conservée comme référence."""
+    lock = threading.Lock()
+
+    def send(msg):
+        with lock:
+            json.dump(msg, stream, ensure_ascii=False)
+            stream.write("\n")
+            stream.flush()
+    return send
+
+
+def bench(label, send, messages, threads):
+    """Envoie ``messages`` messages répartis sur ``threads`` threads et affiche le débit."""
+    per_thread = messages // threads
+    text = bench.text
+
+    def worker(number):
+        for i in range(per_thread):
+            send({"jsonrpc": "2.0", "id": f"{number}-{i}",
+                  "result": {"content": [{"type": "text", "text": text}]}})
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    rate = per_thread * threads / elapsed
+    print(f"{label:<32} {rate:10.0f} messages/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="Nombre de messages envoyés")
+    parser.add_argument("--threads", type=int, default=4, help="Nombre de threads émetteurs")
+    parser.add_argument("--size", type=int, default=2000, help="Taille du texte de chaque réponse")
+    args = parser.parse_args()
+    bench.text = "Résumé : " + "é" * (args.size // 2) + "a" * (args.size - args.size // 2)
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        before = bench("send_message (avant)", legacy_sender(sink), args.messages, args.threads)
+        with patch.object(message_writer, "orjson", None):
+            after = bench("MessageWriter (json)", MessageWriter(sink).send, args.messages, args.threads)
+        print(f"gain : {(after / before - 1) * 100:.1f} %")
+        if message_writer.orjson is not None:
+            after = bench("MessageWriter (orjson)", MessageWriter(sink).send, args.messages, args.threads)
+            print(f"gain : {(after / before - 1) * 100:.1f} %")
+        else:
+            print("orjson non installé : mesure ignorée")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Mesure le temps de démarrage du serveur ``mcp_perso``.
+
+Deux mesures, chacune répétée dans des processus neufs :
+
+* ``python -X importtime`` sur ``mcps.mcp_server.mcp_perso`` : temps d'import
+  cumulé du module et modules les plus coûteux ;
+* temps entre le lancement du serveur et la réception de la réponse à
+  ``initialize``, tel que le perçoit un client MCP.
+
+Usage :
+    PYTHONPATH=src python benchmarks/bench_startup.py [--runs N] [--top K]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULE = "mcps.mcp_server.mcp_perso"
+INITIALIZE = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}
+
+
+def server_env():
+    """Environnement du serveur : ``src`` ajouté au PYTHONPATH."""
+    env = dict(os.environ)
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return env
+
+
+def import_times():
+    """Lance ``-X importtime`` et retourne {module: (propre µs, cumulé µs)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        env=server_env(), capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def time_to_initialize():
+    """Temps en ms entre le lancement du serveur et sa réponse à ``initialize``."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", MODULE], env=server_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE) + "\n")
+        proc.stdin.flush()
+        response = json.loads(proc.stdout.readline())
+        elapsed = (time.perf_counter() - start) * 1000
+        assert response.get("id") == 1, response
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "method": "exit"}) + "\n")
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Nombre de lancements (meilleur temps et médiane)")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de modules les plus coûteux affichés")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times[MODULE][1])
+    totals = [times[MODULE][1] / 1000 for times in runs]
+    print(f"import {MODULE} : meilleur {min(totals):.1f} ms, médiane {statistics.median(totals):.1f} ms")
+    print("modules les plus coûteux (temps propre, meilleur lancement) :")
+    heaviest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"    {name:<40} {self_us / 1000:7.2f} ms  (cumulé {cumulative_us / 1000:7.2f} ms)")
+
+    latencies = [time_to_initialize() for _ in range(args.runs)]
+    print(f"réponse à initialize : meilleur {min(latencies):.1f} ms, médiane {statistics.median(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
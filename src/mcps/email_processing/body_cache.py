@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Cache sur disque des corps d'emails nettoyés.
+
+Les mêmes lettres d'information et messages transférés reviennent à chaque
+``resume_emails`` et repassent par ``extract_body``, lxml et ``clean_body``. Ce
+cache associe au condensé de la partie MIME brute (voir ``jsonise.body_key``)
+le corps nettoyé qu'elle produit : une partie déjà vue n'est plus ni décodée ni
+analysée.
+
+Le cache est une base SQLite compacte, bornée en taille : au-delà de
+``max_bytes``, les corps les moins récemment utilisés sont supprimés. Les
+lectures et écritures sont regroupées en mémoire et enregistrées par
+``flush()`` en une seule transaction, ce qui permet à plusieurs processus
+(pool de ``process_raw_messages``) de partager le même fichier.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from mcps.utils.config import on_config_reload
+
+# Taille maximale par défaut des corps en cache (mbox.body_cache_size_mb)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Nombre d'opérations en attente au-delà duquel elles sont enregistrées d'office
+FLUSH_THRESHOLD = 256
+
+
+def default_cache_path(mbox_path: str) -> str:
+    """Retourne le chemin par défaut du cache de corps associé à un fichier mbox."""
+    return f"{mbox_path}.bodies.sqlite"
+
+
+class BodyCache:
+    """Cache SQLite, adressé par contenu, des corps d'emails nettoyés."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Parameters
+        ----------
+        path : str
+            Chemin du fichier SQLite, créé au premier accès.
+        max_bytes : int
+            Taille totale maximale des corps conservés, en octets.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending_puts: Dict[str, str] = {}
+        self._pending_touches: Dict[str, float] = {}
+
+    def __getstate__(self):
+        # Transmis aux processus du pool : ni connexion ni opérations en attente
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["max_bytes"])
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion du processus courant, ouverte au premier accès."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bodies ("
+                " key TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS bodies_last_used ON bodies (last_used)")
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le corps nettoyé associé à ``key``, ou None s'il n'est pas en cache."""
+        with self._lock:
+            body = self._pending_puts.get(key)
+            if body is not None:
+                return body
+            try:
+                row = self._connect().execute("SELECT body FROM bodies WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logging.info(f"Cache des corps illisible ({self.path}) : {e}")
+                return None
+            if row is None:
+                return None
+            self._pending_touches[key] = time.time()
+            flush = len(self._pending_touches) >= FLUSH_THRESHOLD
+        if flush:
+            self.flush()
+        return row[0]
+
+    def put(self, key: str, body: str) -> None:
+        """Ajoute un corps nettoyé ; il est enregistré au prochain ``flush()``."""
+        with self._lock:
+            self._pending_puts[key] = body
+            flush = len(self._pending_puts) >= FLUSH_THRESHOLD
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Enregistre les opérations en attente puis applique la limite de taille."""
+        with self._lock:
+            if not self._pending_puts and not self._pending_touches:
+                return
+            now = time.time()
+            puts: List[Tuple[str, str, int, float]] = [
+                (key, body, len(body.encode("utf-8")), now) for key, body in self._pending_puts.items()
+            ]
+            touches = [(last_used, key) for key, last_used in self._pending_touches.items()]
+            self._pending_puts = {}
+            self._pending_touches = {}
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("UPDATE bodies SET last_used = ? WHERE key = ?", touches)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO bodies (key, body, size, last_used) VALUES (?, ?, ?, ?)", puts
+                    )
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                logging.info(f"Écriture du cache des corps impossible ({self.path}) : {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Supprime les corps les moins récemment utilisés au-delà de ``max_bytes``."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM bodies ORDER BY last_used"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM bodies WHERE key = ?", evicted)
+
+    def close(self) -> None:
+        """Enregistre les opérations en attente et ferme la connexion."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+
+
+_caches: Dict[str, BodyCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_body_cache(path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> BodyCache:
+    """Retourne le cache de corps du processus pour un fichier, créé au premier appel."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = BodyCache(path, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
+
+
+@on_config_reload
+def close_body_caches() -> None:
+    """Enregistre, ferme et oublie les caches de corps du processus (après un rechargement de la configuration)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+    for cache in caches:
+        cache.close()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Sélection et pagination des emails d'un mbox sur leurs seuls en-têtes.
+
+``resume_emails`` peut se limiter aux emails récents (``since``), à un
+expéditeur (``from``) ou à un sujet (``subject``), et les servir par pages
+(``limit``, ``offset``, ``cursor``). Les critères sont évalués sur les en-têtes
+seuls, découpés avant la ligne vide qui les sépare du corps : le corps des
+emails écartés n'est jamais décodé ni nettoyé.
+
+Le curseur d'une page est la position, dans le fichier mbox, du premier email
+qui n'a pas été lu : la page suivante reprend la lecture à cet endroit, sans
+relire le début du fichier.
+"""
+from datetime import datetime, timezone
+from email.header import decode_header, make_header
+from email.message import Message
+from email.parser import BytesHeaderParser
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from mcps.email_processing.mbox_reader import iter_raw_messages
+from mcps.utils.cancellation import CancelToken
+
+_HEADER_PARSER = BytesHeaderParser()
+
+
+def header_bytes(raw: bytes) -> bytes:
+    """En-têtes d'un message brut, jusqu'à la ligne vide qui précède le corps."""
+    for separator in (b"\n\n", b"\r\n\r\n"):
+        end = raw.find(separator)
+        if end >= 0:
+            return raw[:end + len(separator)]
+    return raw
+
+
+def parse_headers(raw: bytes) -> Message:
+    """Analyse les seuls en-têtes d'un message brut (le corps n'est pas lu)."""
+    return _HEADER_PARSER.parsebytes(header_bytes(raw))
+
+
+def decode_header_value(value: Optional[str]) -> str:
+    """Décode un en-tête encodé RFC 2047 (``=?utf-8?q?...?=``) ; chaîne vide si absent."""
+    if not value:
+        return ""
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return str(value)
+
+
+def header_date(value: Optional[str]) -> Optional[datetime]:
+    """Date d'un en-tête ``Date``, avec fuseau (UTC par défaut), ou None si illisible."""
+    if not value:
+        return None
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    return date if date.tzinfo is not None else date.replace(tzinfo=timezone.utc)
+
+
+def parse_since(value: Any) -> datetime:
+    """Convertit la borne ``since`` (date ou date et heure ISO 8601) en datetime avec fuseau.
+
+    Une date sans fuseau est comprise dans le fuseau local.
+
+    Raises
+    ------
+    ValueError
+        Si la valeur n'est pas une date ISO 8601.
+    """
+    if isinstance(value, datetime):
+        since = value
+    else:
+        try:
+            since = datetime.fromisoformat(str(value).strip())
+        except ValueError:
+            raise ValueError(f"date 'since' invalide : {value} (attendu : AAAA-MM-JJ)") from None
+    return since if since.tzinfo is not None else since.astimezone()
+
+
+def _non_negative_int(name: str, value: Any) -> int:
+    """Valide un entier positif ou nul."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' doit être un entier : {value}") from None
+    if number < 0:
+        raise ValueError(f"'{name}' doit être positif : {value}")
+    return number
+
+
+def _positive_int(name: str, value: Any) -> int:
+    """Valide un entier strictement positif."""
+    number = _non_negative_int(name, value)
+    if number == 0:
+        raise ValueError(f"'{name}' doit être supérieur ou égal à 1 : {value}")
+    return number
+
+
+class EmailSelection:
+    """Critères de sélection et fenêtre de pagination des emails d'un mbox."""
+
+    def __init__(self, since: Optional[datetime] = None, sender: Optional[str] = None,
+                 subject: Optional[str] = None, limit: Optional[int] = None,
+                 offset: int = 0, cursor: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        since : datetime, optional
+            Date à partir de laquelle un email est retenu (en-tête ``Date``).
+        sender : str, optional
+            Texte recherché, sans tenir compte de la casse, dans l'en-tête ``From``.
+        subject : str, optional
+            Texte recherché, sans tenir compte de la casse, dans l'en-tête ``Subject``.
+        limit : int, optional
+            Nombre maximal d'emails renvoyés (au moins 1).
+        offset : int
+            Nombre d'emails retenus à sauter avant le premier renvoyé.
+        cursor : int, optional
+            Position dans le mbox à laquelle reprendre la lecture (page suivante).
+        """
+        self.since = since
+        self.sender = sender.casefold() if sender else None
+        self.subject = subject.casefold() if subject else None
+        self.limit = limit
+        self.offset = offset
+        self.cursor = cursor
+
+    @classmethod
+    def from_arguments(cls, arguments: Dict[str, Any]) -> "EmailSelection":
+        """Construit la sélection à partir des arguments de ``resume_emails``.
+
+        Raises
+        ------
+        ValueError
+            Si un argument est invalide.
+        """
+        since = arguments.get("since")
+        limit = arguments.get("limit")
+        cursor = arguments.get("cursor")
+        return cls(
+            since=parse_since(since) if since else None,
+            sender=arguments.get("from") or None,
+            subject=arguments.get("subject") or None,
+            # Une page vide renverrait le même curseur : le client bouclerait
+            limit=_positive_int("limit", limit) if limit is not None else None,
+            offset=_non_negative_int("offset", arguments.get("offset") or 0),
+            cursor=_non_negative_int("cursor", cursor) if cursor not in (None, "") else None,
+        )
+
+    def is_empty(self) -> bool:
+        """Vrai si la sélection retient tous les emails du mbox."""
+        return (self.since is None and self.sender is None and self.subject is None
+                and self.limit is None and not self.offset and self.cursor is None)
+
+    def matches(self, headers: Message) -> bool:
+        """Indique si un email, d'après ses en-têtes, satisfait les critères."""
+        if self.sender is not None and self.sender not in decode_header_value(headers.get("From")).casefold():
+            return False
+        if self.subject is not None and self.subject not in decode_header_value(headers.get("Subject")).casefold():
+            return False
+        if self.since is not None:
+            date = header_date(headers.get("Date"))
+            # Sans date lisible, rien ne prouve que l'email est récent
+            if date is None or date < self.since:
+                return False
+        return True
+
+
+class MboxWindow:
+    """Parcours d'un mbox restreint à une sélection, avec le curseur de la page suivante."""
+
+    def __init__(self, mbox_path: str, selection: EmailSelection):
+        self.mbox_path = mbox_path
+        self.selection = selection
+        # Position du premier email non lu, connue une fois la page parcourue
+        self.next_cursor: Optional[int] = None
+
+    def _iter(self, cancel_token: Optional[CancelToken]) -> Iterator[Tuple[bytes, Message]]:
+        """Renvoie (message brut, en-têtes) pour chaque message retenu."""
+        selection = self.selection
+        self.next_cursor = None
+        skipped = 0
+        taken = 0
+        for offset, raw in iter_raw_messages(self.mbox_path, selection.cursor or 0):
+            if cancel_token is not None:
+                cancel_token.check()
+            if selection.limit is not None and taken >= selection.limit:
+                self.next_cursor = offset
+                return
+            headers = parse_headers(raw)
+            if not selection.matches(headers):
+                continue
+            if skipped < selection.offset:
+                skipped += 1
+                continue
+            taken += 1
+            yield raw, headers
+
+    def iter_raw(self, cancel_token: Optional[CancelToken] = None) -> Iterator[bytes]:
+        """Renvoie les messages bruts retenus, dans l'ordre du fichier.
+
+        Seuls les en-têtes des messages sont analysés ; après ``limit`` messages,
+        la lecture s'arrête et ``next_cursor`` désigne le message suivant.
+
+        Yields
+        ------
+        bytes
+            Contenu brut de chaque message retenu.
+        """
+        for raw, _ in self._iter(cancel_token):
+            yield raw
+
+    def iter_headers(self, cancel_token: Optional[CancelToken] = None) -> Iterator[Message]:
+        """Renvoie les en-têtes des messages retenus, sans jamais lire leur corps."""
+        for _, headers in self._iter(cancel_token):
+            yield headers
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Pré-résumé extractif des textes trop longs.
+
+Avant d'être transmis au modèle, un corps d'email ou un texte du presse-papiers
+qui dépasse un seuil (en mots) est réduit à ses phrases les plus
+représentatives, restituées dans leur ordre d'origine. Les phrases sont pondérées
+par TF-IDF sur des mots normalisés pour le français (casse, élisions ``l'``,
+``qu'``…, mots vides, pluriels simples) :
+
+* avec NumPy, les phrases sont classées par TextRank (PageRank sur la matrice de
+  similarité cosinus des vecteurs TF-IDF) ;
+* sans NumPy, ou pour les très longs textes, chaque phrase est notée par sa
+  similarité avec le centroïde TF-IDF du texte.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle
+    np = None
+
+# Au-delà de ce nombre de phrases, la matrice de similarité serait trop coûteuse : centroïde
+MAX_TEXTRANK_SENTENCES = 1500
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+STOPWORDS = frozenset("""
+a ai aie aient aies ait alors as au aucun aura aurai auraient aurais aurait aux avaient avais avait avec
+avez aviez avions avoir avons ayant bon car ce ceci cela celle celles celui cependant ces cet cette ceux
+chaque ci comme comment dans de des donc dont du elle elles en encore entre est et etaient etais etait
+etant ete etre eu eux fait faire fois font hors ici il ils je juste la le les leur leurs lui ma mais me
+meme memes mes moi moins mon ne ni nos notre nous on ont ou par parce pas peu peut plus pour pourquoi
+qu quand que quel quelle quelles quels qui sa sans se sera ses si sien son sont sous soyez sur ta tandis
+te tes toi ton tous tout toute toutes tres tu un une vos votre vous vu ça
+the and for are but not you all any can had her was one our out has have been this that with from they
+will would there their what about which when your into than then them these some its also just more
+""".split())
+
+_TOKEN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+_ELISION = re.compile(r"^(?:[cdjlmnst]|qu|jusqu|lorsqu|puisqu|quoiqu)['’]")
+# Frontières de phrase : fin de phrase suivie d'une espace ou d'un saut de ligne puis
+# d'une majuscule (pas « M.Dupont » ni « etc.Ensuite »), ligne commençant par une
+# majuscule, ligne vide, puce. Les corps d'emails sont réduits avant que
+# ``normalise_body`` ne remplace leurs sauts de ligne.
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[.!?…])[\"»)]?\s+(?=[\"«(]?[A-ZÀ-Ý])|\n(?=[ \t]*[\"«(]?[A-ZÀ-Ý])"
+    r"|\n[ \t]*\n|\n(?=[ \t]*[-•*][ \t])"
+)
+
+
+def _fold(word: str) -> str:
+    """Minuscules sans accents."""
+    decomposed = unicodedata.normalize("NFKD", word.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Découpe un texte en phrases (ponctuation finale, débuts de ligne en majuscule, lignes vides, puces).
+
+    Les morceaux sans lettre ni chiffre sont écartés.
+    """
+    sentences = (sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text))
+    return [sentence for sentence in sentences if any(char.isalnum() for char in sentence)]
+
+
+def tokenize(sentence: str) -> List[str]:
+    """Mots significatifs d'une phrase : sans casse, accents, élisions, mots vides ni pluriels simples."""
+    tokens = []
+    for word in _TOKEN.findall(sentence):
+        word = _fold(_ELISION.sub("", word.casefold()))
+        if len(word) < 3 or word in STOPWORDS:
+            continue
+        if len(word) > 4 and word[-1] in "sx":
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _idf(sentence_tokens: Sequence[List[str]]) -> Dict[str, float]:
+    """IDF lissé de chaque mot, les phrases jouant le rôle de documents."""
+    count = len(sentence_tokens)
+    document_frequency = Counter(word for tokens in sentence_tokens for word in set(tokens))
+    return {word: math.log((1 + count) / (1 + df)) + 1 for word, df in document_frequency.items()}
+
+
+def _centroid_scores(sentence_tokens: Sequence[List[str]]) -> List[float]:
+    """Similarité cosinus de chaque phrase avec le centroïde TF-IDF du texte (sans NumPy)."""
+    idf = _idf(sentence_tokens)
+    vectors = []
+    centroid: Counter = Counter()
+    for tokens in sentence_tokens:
+        counts = Counter(tokens)
+        vector = {word: (count / len(tokens)) * idf[word] for word, count in counts.items()} if tokens else {}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vector = {word: weight / norm for word, weight in vector.items()}
+        vectors.append(vector)
+        centroid.update(vector)
+    centroid_norm = math.sqrt(sum(weight * weight for weight in centroid.values())) or 1.0
+    return [sum(weight * centroid[word] for word, weight in vector.items()) / centroid_norm for vector in vectors]
+
+
+def _tfidf_matrix(sentence_tokens: Sequence[List[str]]):
+    """Matrice TF-IDF (phrases × mots) aux lignes normalisées."""
+    vocabulary: Dict[str, int] = {}
+    rows, columns = [], []
+    for row, tokens in enumerate(sentence_tokens):
+        for word in tokens:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(word, len(vocabulary)))
+    counts = np.zeros((len(sentence_tokens), max(1, len(vocabulary))))
+    np.add.at(counts, (np.array(rows, dtype=int), np.array(columns, dtype=int)), 1.0)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentence_tokens)) / (1 + document_frequency)) + 1
+    lengths = counts.sum(axis=1, keepdims=True)
+    weights = np.divide(counts, lengths, out=np.zeros_like(counts), where=lengths > 0) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
+
+
+def _textrank_scores(sentence_tokens: Sequence[List[str]]) -> List[float]:
+    """Score TextRank de chaque phrase (PageRank sur les similarités cosinus)."""
+    weights = _tfidf_matrix(sentence_tokens)
+    count = weights.shape[0]
+    if count > MAX_TEXTRANK_SENTENCES:
+        centroid = weights.sum(axis=0)
+        return list(weights @ (centroid / (np.linalg.norm(centroid) or 1.0)))
+    similarity = weights @ weights.T
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    # Une phrase sans voisin redistribue son score uniformément
+    transition = np.divide(similarity, row_sums, out=np.full_like(similarity, 1.0 / count), where=row_sums > 0)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return list(scores)
+
+
+def score_sentences(sentences: Sequence[str]) -> List[float]:
+    """Importance de chaque phrase dans le texte (TextRank avec NumPy, centroïde TF-IDF sinon)."""
+    sentence_tokens = [tokenize(sentence) for sentence in sentences]
+    if not sentences:
+        return []
+    if np is not None:
+        return [float(score) for score in _textrank_scores(sentence_tokens)]
+    return _centroid_scores(sentence_tokens)
+
+
+def summarize(text: str, max_words: int) -> str:
+    """Réduit un texte à ses phrases les mieux classées, dans l'ordre d'origine.
+
+    Parameters
+    ----------
+    text : str
+        Texte à réduire.
+    max_words : int
+        Nombre de mots visé ; au moins une phrase est toujours conservée.
+
+    Returns
+    -------
+    str
+        Phrases retenues, séparées par une espace.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return text.strip()
+    scores = score_sentences(sentences)
+    ranking = sorted(range(len(sentences)), key=lambda index: (-scores[index], index))
+    selected = []
+    words = 0
+    for index in ranking:
+        length = len(sentences[index].split())
+        if selected and words + length > max_words:
+            continue
+        selected.append(index)
+        words += length
+        if words >= max_words:
+            break
+    return " ".join(sentences[index] for index in sorted(selected))
+
+
+def reduce_text(text: str, threshold_words: int, target_words: int) -> str:
+    """Réduit ``text`` à environ ``target_words`` mots s'il dépasse ``threshold_words`` mots.
+
+    Un seuil nul ou négatif désactive la réduction ; un texte sous le seuil est
+    renvoyé tel quel.
+    """
+    if threshold_words <= 0 or not text or len(text.split()) <= threshold_words:
+        return text
+    return summarize(text, max(1, target_words))
@@ -1,14 +1,113 @@
 #!/usr/bin/env python3
+import email
+import hashlib
 import logging
-import mailbox
+import multiprocessing
+import threading
 import yaml
 import json
 import os
 import sys
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
 from lxml import html as lxml_html
 from lxml.html.clean import Cleaner
 from mcps.utils.config import get_config_value
+from mcps.utils.cancellation import current_token
+from mcps.utils.progress import ProgressReporter, current_reporter
+from mcps.email_processing.body_cache import DEFAULT_MAX_BYTES, BodyCache, default_cache_path, get_body_cache
+from mcps.email_processing.email_selection import EmailSelection, MboxWindow, decode_header_value
+from mcps.email_processing.extractive_summary import reduce_text
+from mcps.email_processing.mbox_index import MboxIndex, default_index_path
+from mcps.email_processing.mbox_reader import iter_raw_messages
+
+# Consigne placée en tête du texte renvoyé par ``run_jsonise``
+PROMPT_RESUME = "écrit un résumé de 80 mots pour chacun des emails qui suivent : "
+# Indication ajoutée en fin de condensé quand d'autres emails restent à lire
+NEXT_PAGE_NOTE = "(emails suivants : relancer avec cursor = \"{cursor}\")"
+
+# Valeurs par défaut du traitement parallèle (mbox.workers / mbox.chunksize)
+DEFAULT_WORKERS = 1
+DEFAULT_CHUNKSIZE = 16
+# À incrémenter dès que le nettoyage des corps change : invalide le cache des corps
+CLEANER_VERSION = "1"
+# Emails par morceau du condensé envoyé en avance (mbox.stream_chunk, 0 = aucun envoi)
+DEFAULT_STREAM_CHUNK = 0
+# Nombre de mots visé par le pré-résumé d'un corps trop long (mbox.presummary_target_words)
+DEFAULT_PRESUMMARY_TARGET_WORDS = 250
+
+class TextCleaner:
+    """Text-cleaning engine shared by every message.
+
+    Holds the configured lxml ``Cleaner`` and the compiled regular expressions
+    so that they are built once per process instead of once per message.
+    """
+
+    def __init__(self, max_word_length: int = 15):
+        # Cleaner removing unwanted tags and content
+        self.cleaner = Cleaner(
+            scripts=True,        # Remove <script> elements
+            javascript=True,     # Remove javascript: URLs
+            style=True,          # Remove <style> elements and their content
+            comments=True,       # Remove HTML comments
+            page_structure=False, # Keep structural tags like <body>, <div>
+            safe_attrs_only=False, # Keep most attributes (we’ll strip style later)
+            remove_tags=[
+                "head", "title", "meta", "link",  # Metadata tags
+                "iframe", "object", "embed", "svg",  # Embedded objects
+                "table", "tr", "td", "th", "tbody", "thead", "tfoot"
+            ],  # Remove table structures (keep inner text later)
+        )
+        self.css_fragment = re.compile(r"\b\w+\s*\{[^}]*\}")
+        self.blank_lines = re.compile(r"\n\s*\n+")
+        self.extra_blank_lines = re.compile(r"\n{3,}")
+        self.long_word = re.compile(r'(?<!\S)[^\s]{' + str(max_word_length + 1) + r',}(?!\S)')
+        self.non_latin1 = re.compile(r'[^\x00-\xFF]')
+        self.line_breaks = re.compile(r'[\n\xa0]')
+        self.spaces = re.compile(r' +')
+
+    def _strip_css(self, text: str) -> str:
+        """Remove CSS rule fragments; the regex only runs when a brace is present."""
+        if "{" in text:
+            text = self.css_fragment.sub("", text)
+        return text.strip()
+
+    def clean_document(self, doc) -> str:
+        """Sanitize a parsed HTML document and return its visible text."""
+        # Apply the cleaner to obtain a sanitized DOM
+        cleaned_doc = self.cleaner.clean_html(doc)
+
+        # Further strip any remaining inline style attributes and stray CSS text
+        for el in cleaned_doc.iter():
+            # Delete inline style attributes
+            if "style" in el.attrib:
+                del el.attrib["style"]
+            # Remove CSS rule fragments that may appear as text nodes
+            if el.text:
+                el.text = self._strip_css(el.text)
+            if el.tail:
+                el.tail = self._strip_css(el.tail)
+
+        # Extract the clean visible text
+        body_text = cleaned_doc.text_content()
+        # Collapse multiple blank lines (keeps compatibility with clean_body)
+        return self.blank_lines.sub("\n\n", body_text).strip()
+
+    def collapse_blank_lines(self, text: str) -> str:
+        """Reduce runs of three or more newlines to a single blank line."""
+        return self.extra_blank_lines.sub("\n\n", text)
+
+    def normalise_body(self, text: str) -> str:
+        """Final pass of process_email: long words, non latin-1 characters, line breaks."""
+        text = self.long_word.sub('', text)
+        text = self.non_latin1.sub('', text) # supprime tous les caractères spéciaux
+        text = self.line_breaks.sub('.', text)
+        return self.spaces.sub(' ', text) # Remove multiple spaces left by long word removal
+
+# Shared engine, built once per process
+TEXT_CLEANER = TextCleaner()
 
 def clean_message(message):
     # -------------------------------------------------
@@ -31,43 +130,31 @@ def clean_message(message):
         # If parsing fails, return the raw HTML (fallback)
         return html_text
 
-    # b) Define a Cleaner to remove unwanted tags and content
-    cleaner = Cleaner(
-        scripts=True,        # Remove <script> elements
-        javascript=True,     # Remove javascript: URLs
-        style=True,          # Remove <style> elements and their content
-        comments=True,       # Remove HTML comments
-        page_structure=False, # Keep structural tags like <body>, <div>
-        safe_attrs_only=False, # Keep most attributes (we’ll strip style later)
-        remove_tags=[
-            "head", "title", "meta", "link",  # Metadata tags
-            "iframe", "object", "embed", "svg",  # Embedded objects
-            "table", "tr", "td", "th", "tbody", "thead", "tfoot"
-        ],  # Remove table structures (keep inner text later)
-    )
-
-    # c) Apply the cleaner to obtain a sanitized DOM
-    cleaned_doc = cleaner.clean_html(doc)
-
-    # d) Further strip any remaining inline style attributes and stray CSS text
-    for el in cleaned_doc.iter():
-        # Delete inline style attributes
-        if "style" in el.attrib:
-            del el.attrib["style"]
-        # Remove CSS rule fragments that may appear as text nodes
-        if el.text:
-            el.text = re.sub(r"\b\w+\s*\{[^}]*\}", "", el.text).strip()
-        if el.tail:
-            el.tail = re.sub(r"\b\w+\s*\{[^}]*\}", "", el.tail).strip()
-
-    # e) Extract the clean visible text
-    body_text = cleaned_doc.text_content()
-    # Collapse multiple blank lines (keeps compatibility with clean_body)
-    body_text = re.sub(r"\n\s*\n+", "\n\n", body_text).strip()
-    return body_text
+    # b) Clean the document with the shared engine
+    return TEXT_CLEANER.clean_document(doc)
 
 # ----------------------------------------------------------------------------------------------
 
+def find_body_part(message):
+    """Return the first plain-text or HTML leaf part of the message, or None.
+
+    Only the MIME tree is walked: nothing is decoded.
+    """
+    for part in message.walk():
+        if not part.is_multipart() and part.get_content_type() in ("text/plain", "text/html"):
+            return part
+    return None
+
+def decode_body_part(part):
+    """Decode a part found by ``find_body_part``; HTML is reduced to its visible text."""
+    if part is None:
+        return ""
+    if part.get_content_type() == "text/plain":
+        payload = part.get_payload(decode=True)
+        charset = part.get_content_charset() or "utf-8"
+        return payload.decode(charset, errors="replace")
+    return clean_message(part)
+
 def extract_body(message):
     """Recursively walk the message tree and return the first suitable plain‑text part.
     If no plain‑text part exists, fall back to the first HTML part and extract visible text using lxml.
@@ -75,25 +162,28 @@ def extract_body(message):
     :param message: the parsed email message
     :return: text body
     """
-    # Base case – if this is a leaf node
-    if not message.is_multipart():
-        if message.get_content_type() == "text/plain":
-            payload = message.get_payload(decode=True)
-            charset = message.get_content_charset() or "utf-8"
-            return payload.decode(charset, errors="replace")
-        if message.get_content_type() == "text/html":
-            return clean_message(message)
-
-    # Recursive case – walk the children
-    for part in message.walk():
-        if not part.is_multipart():
-            if part.get_content_type() == "text/plain":
-                payload = part.get_payload(decode=True)
-                charset = part.get_content_charset() or "utf-8"
-                return payload.decode(charset, errors="replace")
-            if part.get_content_type() == "text/html":
-                return clean_message(part)
-    return ""
+    return decode_body_part(find_body_part(message))
+
+def presummary_variant(presummary) -> str:
+    """Réglages du pré-résumé sous forme de texte (vide s'il est désactivé), pour les clés de cache."""
+    if not presummary or presummary[0] <= 0:
+        return ""
+    return f"presummary:{presummary[0]}:{presummary[1]}"
+
+def body_key(part, presummary=None):
+    """Clé du cache des corps : condensé de la partie MIME brute, de la version du nettoyage et du pré-résumé."""
+    digest = hashlib.blake2b(digest_size=20)
+    values = [CLEANER_VERSION, part.get_content_type(), part.get_content_charset() or "",
+              part.get("Content-Transfer-Encoding", "")]
+    if presummary_variant(presummary):
+        values.append(presummary_variant(presummary))
+    for value in values:
+        digest.update(value.encode("utf-8", errors="surrogateescape") + b"\0")
+    payload = part.get_payload(decode=False)
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8", errors="surrogateescape")
+    digest.update(payload or b"")
+    return digest.hexdigest()
 
 def clean_body(text):
     lines = text.splitlines()
@@ -108,7 +198,7 @@ def clean_body(text):
         cleaned.append(line)
     # nettoyer lignes vides multiples
     text = "\n".join(cleaned)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = TEXT_CLEANER.collapse_blank_lines(text)
     return text.strip()
 
 def has_attachment(message):
@@ -117,66 +207,409 @@ def has_attachment(message):
         for part in message.walk()
     )
 
-def process_email(message):
-    """Process an email message and return its JSON representation."""
-    body_raw = extract_body(message)
-    body_clean = clean_body(body_raw)
-    body_clean = re.sub(r'(?<!\S)[^\s]{' + str(15 + 1) + r',}(?!\S)', '', body_clean)  
-    body_clean = re.sub(r'[^\x00-\xFF]', '', body_clean) # supprime tous les caractères spéciaux 
-    body_clean = re.sub(r'[\n\xa0]', '.', body_clean)
-    body_clean = re.sub(r' +', ' ', body_clean) # Remove multiple spaces left by long word removal
-    out = {
+def email_to_dict(message, body_cache=None, presummary=None):
+    """Process an email message and return its structured representation.
+
+    :param message: the parsed email message
+    :param body_cache: optional ``BodyCache`` consulted before decoding and cleaning the body
+    :param presummary: optional ``(threshold_words, target_words)``; a longer body is reduced to its
+        most representative sentences (see ``extractive_summary.reduce_text``) while its line breaks
+        still mark sentence boundaries, before ``normalise_body`` replaces them
+    :return: dict with the "from", "subject", "date" and cleaned "body" fields
+    """
+    part = find_body_part(message)
+    key = body_key(part, presummary) if body_cache is not None and part is not None else None
+    body_clean = body_cache.get(key) if key is not None else None
+    if body_clean is None:
+        body_raw = decode_body_part(part)
+        body = clean_body(body_raw)
+        if presummary_variant(presummary):
+            body = reduce_text(body, *presummary)
+        body_clean = TEXT_CLEANER.normalise_body(body)
+        if key is not None:
+            body_cache.put(key, body_clean)
+    return {
         "from": message.get("From"),
         "subject": message.get("Subject"),
         "date": message.get("Date"),
         "body": body_clean,
     }
-    return json.dumps(out, ensure_ascii=False, indent=2)
 
+def headers_to_dict(message):
+    """Extrait d'un email ses seuls en-têtes ``from``, ``subject`` et ``date``, décodés.
+
+    Aucune partie MIME n'est parcourue ni décodée : ``message`` peut ne contenir
+    que les en-têtes (voir ``iter_email_headers``).
+    """
+    return {
+        "from": decode_header_value(message.get("From")),
+        "subject": decode_header_value(message.get("Subject")),
+        "date": message.get("Date"),
+    }
+
+def process_email(message):
+    """Process an email message and return its JSON representation."""
+    return json.dumps(email_to_dict(message), ensure_ascii=False, indent=2)
+
+def _process_batch(raw_messages: List[bytes], body_cache: Optional[BodyCache] = None,
+                   presummary: Optional[Tuple[int, int]] = None) -> List[dict]:
+    """Analyse et traite un lot de messages bruts (exécuté dans un processus du pool)."""
+    if body_cache is not None:
+        # Copie reçue du processus parent : le cache du processus garde sa connexion d'un lot à l'autre
+        body_cache = get_body_cache(body_cache.path, body_cache.max_bytes)
+    try:
+        return [email_to_dict(email.message_from_bytes(raw), body_cache, presummary) for raw in raw_messages]
+    finally:
+        if body_cache is not None:
+            body_cache.flush()
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Retourne le pool de processus partagé, recréé si le nombre de workers change.
+
+    Le pool utilise ``forkserver`` : le serveur MCP est multi-thread et un simple
+    ``fork`` pourrait hériter d'un verrou tenu par un autre thread.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_workers = workers
+        return _pool
+
+def process_raw_messages(raw_messages: Iterable[bytes], workers: int = DEFAULT_WORKERS,
+                         chunksize: int = DEFAULT_CHUNKSIZE,
+                         body_cache: Optional[BodyCache] = None,
+                         presummary: Optional[Tuple[int, int]] = None) -> Iterator[dict]:
+    """Traite des messages bruts et renvoie leur contenu dans l'ordre d'origine.
+
+    Avec ``workers`` > 1, les messages sont regroupés en lots de ``chunksize`` et
+    répartis sur un pool de processus. Au plus ``2 * workers`` lots sont en cours
+    à la fois, si bien que la mémoire reste bornée quelle que soit la taille du mbox.
+
+    Parameters
+    ----------
+    raw_messages : iterable of bytes
+        Messages bruts, tels que découpés dans le mbox.
+    workers : int
+        Nombre de processus. 1 traite les messages en série dans le processus courant.
+    chunksize : int
+        Nombre de messages envoyés à un processus en une fois.
+    body_cache : BodyCache, optional
+        Cache des corps nettoyés, partagé par les processus du pool.
+    presummary : tuple, optional
+        Seuil et cible (en mots) du pré-résumé des corps trop longs (voir ``email_to_dict``).
+
+    Yields
+    ------
+    dict
+        Contenu structuré de chaque message (voir ``email_to_dict``).
+    """
+    if workers <= 1:
+        try:
+            for raw in raw_messages:
+                yield email_to_dict(email.message_from_bytes(raw), body_cache, presummary)
+        finally:
+            if body_cache is not None:
+                body_cache.flush()
+        return
+
+    pool = _get_process_pool(workers)
+    chunksize = max(1, chunksize)
+    pending = deque()
+    batch = []
+    try:
+        for raw in raw_messages:
+            batch.append(raw)
+            if len(batch) >= chunksize:
+                pending.append(pool.submit(_process_batch, batch, body_cache, presummary))
+                batch = []
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+        if batch:
+            pending.append(pool.submit(_process_batch, batch, body_cache, presummary))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Lecture interrompue (annulation, erreur) : les lots pas encore démarrés sont abandonnés
+        for future in pending:
+            future.cancel()
+
+def iter_emails(mbox_path, index_path=None, workers=DEFAULT_WORKERS, chunksize=DEFAULT_CHUNKSIZE,
+                cancel_token=None, window=None, body_cache=None, presummary=None):
+    """Renvoie le contenu structuré de chaque email d'un fichier mbox.
+
+    Si ``index_path`` est fourni, l'index persistant ``MboxIndex`` est utilisé :
+    seuls les emails ajoutés depuis le dernier appel sont analysés. Sinon, le
+    mbox est lu en flux : chaque email est traité dès qu'il est découpé.
+    ``workers`` et ``chunksize`` sont transmis à ``process_raw_messages``.
+    ``cancel_token`` (``CancelToken``) est consulté entre deux emails.
+
+    Avec ``window`` (``MboxWindow``), seuls les emails retenus d'après leurs
+    en-têtes sont traités, sans passer par l'index : les autres ne sont ni
+    décodés ni nettoyés.
+
+    ``body_cache`` (``BodyCache``) évite de nettoyer de nouveau un corps déjà vu.
+    ``presummary`` (seuil et cible en mots) réduit les corps trop longs à leurs
+    phrases les plus représentatives ; l'index est reconstruit si ces réglages changent.
+
+    Yields
+    ------
+    dict
+        Contenu de chaque email (voir ``email_to_dict``).
+
+    Raises
+    ------
+    Cancelled
+        Si le jeton est annulé ou expire pendant la lecture.
+    """
+    def process(raw_messages):
+        return process_raw_messages(raw_messages, workers, chunksize, body_cache, presummary)
+
+    if window is not None:
+        return process(window.iter_raw(cancel_token))
+    if index_path:
+        return MboxIndex(mbox_path, index_path, presummary_variant(presummary)).iter_emails(process, cancel_token)
+
+    def raw_messages():
+        for _, raw in iter_raw_messages(mbox_path):
+            if cancel_token is not None:
+                cancel_token.check()
+            yield raw
+    return process(raw_messages())
+
+def digest_parts(emails) -> Iterator[str]:
+    """Encode chaque email en JSON, une seule fois, pour le condensé."""
+    for email_data in emails:
+        yield json.dumps(email_data, ensure_ascii=False, indent=2)
+
+def iter_email_headers(mbox_path, selection=None, cancel_token=None):
+    """Renvoie les en-têtes de chaque email d'un mbox, sans décoder les corps.
+
+    Chaque message est analysé avec ``BytesHeaderParser`` sur ses seuls
+    en-têtes : ni arbre MIME, ni décodage, ni passe lxml.
+
+    Parameters
+    ----------
+    mbox_path : str
+        Chemin du fichier mbox.
+    selection : EmailSelection, optional
+        Filtres et pagination (voir ``email_selection``).
+    cancel_token : CancelToken, optional
+        Jeton consulté entre deux emails.
+
+    Yields
+    ------
+    dict
+        En-têtes de chaque email (voir ``headers_to_dict``).
+    """
+    window = MboxWindow(mbox_path, selection or EmailSelection())
+    for headers in window.iter_headers(cancel_token):
+        yield headers_to_dict(headers)
+
+def format_digest(emails, prompt=PROMPT_RESUME) -> str:
+    """Assemble la consigne et les emails en un seul texte.
+
+    Chaque email est encodé une seule fois en JSON ; le texte final est
+    construit en une passe.
+    """
+    parts = [prompt]
+    parts.extend(digest_parts(emails))
+    return "\n".join(parts)
+
+def report_digest(parts: Iterable[str], reporter: ProgressReporter, stream_chunk: int = 0,
+                  prompt: str = PROMPT_RESUME) -> Iterator[str]:
+    """Relaie les emails du condensé en signalant l'avancement au client.
 
+    Parameters
+    ----------
+    parts : iterable of str
+        Emails encodés (voir ``digest_parts``).
+    reporter : ProgressReporter
+        Émetteur des notifications de progression de l'appel.
+    stream_chunk : int
+        Si positif, le condensé est aussi envoyé par morceaux de ``stream_chunk``
+        emails dans les notifications, pour que le client commence à résumer
+        avant la fin. Le premier morceau commence par ``prompt`` : les morceaux
+        joints par des fins de ligne redonnent le condensé complet.
 
-def process_mbox(mbox_path):
-    """Traite un fichier mbox et convertit chaque email en JSON."""
+    Chaque notification attend la lecture de l'email suivant : la dernière,
+    seule à porter ``total``, n'est ainsi jamais précédée d'une notification de
+    même progression (qui la ferait ignorer).
+
+    Yields
+    ------
+    str
+        Les éléments de ``parts``, inchangés.
+    """
+    pending = [prompt] if stream_chunk > 0 else []
+    count = 0
+
+    def notify(total=None):
+        nonlocal pending
+        if stream_chunk <= 0:
+            reporter.report(count, total=total, message=f"{count} emails lus", force=total is not None)
+        elif total is not None or count % stream_chunk == 0:
+            reporter.partial(count, "\n".join(pending), total=total)
+            pending = []
+
+    for part in parts:
+        if count:
+            notify()
+        count += 1
+        if stream_chunk > 0:
+            pending.append(part)
+        yield part
+    notify(total=count)
+
+def process_mbox(mbox_path, index_path=None, workers=DEFAULT_WORKERS, chunksize=DEFAULT_CHUNKSIZE):
+    """Traite un fichier mbox et écrit chaque email en JSON sur stdout.
+
+    Les paramètres sont ceux de ``iter_emails``.
+    """
     if not os.path.isfile(mbox_path):
         logging.info(f"Erreur : pas de mbox à {mbox_path}")
         sys.exit(1)
-    mbox = mailbox.mbox(mbox_path)
-    for message in mbox:
-        email_data = process_email(message)
-        print(json.dumps(email_data, indent=2))
+    for email_data in iter_emails(mbox_path, index_path, workers, chunksize):
+        print(json.dumps(email_data, ensure_ascii=False, indent=2))
+
+def _mbox_file(mbox_config) -> Optional[str]:
+    """Chemin du mbox configuré (``mbox.path``/``mbox.SRC``), ou None s'il n'est pas défini."""
+    mbox_src = mbox_config.get("SRC") if isinstance(mbox_config, dict) else None
+    mbox_path = mbox_config.get("path") if isinstance(mbox_config, dict) else None
+    if not (mbox_src and mbox_path):
+        return None
+    return f"{os.path.expanduser(mbox_path)}/{mbox_src}"
 
-def run_jsonise() -> dict:
+def run_jsonise(cancel_token=None, stream_chunk=None, selection=None) -> dict:
     """Execute le processus de jsonise et retourne son output.
 
+    Si l'appel d'outil en cours suit sa progression (``current_reporter()``),
+    une notification est émise au fil des emails lus.
+
+    Parameters
+    ----------
+    cancel_token : CancelToken, optional
+        Jeton consulté entre deux emails. Par défaut, celui de l'appel d'outil
+        en cours (``current_token()``).
+    stream_chunk : int, optional
+        Nombre d'emails par morceau du condensé envoyé en avance dans les
+        notifications de progression (voir ``report_digest``). Par défaut,
+        ``mbox.stream_chunk``.
+    selection : EmailSelection, optional
+        Filtres et pagination, évalués sur les en-têtes : seuls les emails
+        retenus sont décodés et nettoyés.
+
     Returns
     -------
     dict
         {"output": <text>, "error": <msg>} – la clé "error" n'est présente qu'en cas d'échec.
+        Si une page ne contient pas tous les emails retenus, la clé "cursor"
+        donne la position de reprise, également rappelée en fin de texte.
+
+    Raises
+    ------
+    Cancelled
+        Si l'appel est annulé ou dépasse son délai.
     """
+    cancel_token = cancel_token or current_token()
+    mbox_file = None
     try:
         # Load mbox configuration from centralized configuration
         mbox_config = get_config_value("mbox", {})
-        mbox_src = mbox_config.get("SRC") if isinstance(mbox_config, dict) else None
-        mbox_path = mbox_config.get("path") if isinstance(mbox_config, dict) else None
+        mbox_file = _mbox_file(mbox_config)
 
         # Validate that both SRC and path are defined
-        if not (mbox_src and mbox_path):
+        if mbox_file is None:
             return {"error": "SRC ou path non défini"}
 
-        mbox_path = os.path.expanduser(mbox_path)
-
-        # Capture l'output de process_mbox
-        from io import StringIO
-        import sys
-        # Redirige stdout pour capturer l'output
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
-        process_mbox(f"{mbox_path}/{mbox_src}")
-        # Rétablit stdout
-        sys.stdout = old_stdout
-        prompt = "écrit un résumé de 80 mots pour chacun des emails qui suivent : "
-        output = captured_output.getvalue().strip()
-        combined = f"{prompt}\n{output}" if output else prompt
-        return {"output": combined}
+        # Index persistant optionnel (mbox.index / mbox.index_path)
+        index_path = None
+        if mbox_config.get("index", False):
+            index_path = os.path.expanduser(mbox_config.get("index_path") or default_index_path(mbox_file))
+
+        # Cache optionnel des corps nettoyés (mbox.body_cache / body_cache_path / body_cache_size_mb)
+        body_cache = None
+        if mbox_config.get("body_cache", False):
+            max_bytes = int(float(mbox_config.get("body_cache_size_mb", DEFAULT_MAX_BYTES / 2**20)) * 2**20)
+            body_cache = get_body_cache(
+                os.path.expanduser(mbox_config.get("body_cache_path") or default_cache_path(mbox_file)), max_bytes
+            )
+
+        # Traitement parallèle optionnel (mbox.workers / mbox.chunksize)
+        workers = int(mbox_config.get("workers", DEFAULT_WORKERS))
+        chunksize = int(mbox_config.get("chunksize", DEFAULT_CHUNKSIZE))
+
+        if not os.path.isfile(mbox_file):
+            logging.info(f"Erreur : pas de mbox à {mbox_file}")
+            return {"error": f"pas de mbox à {mbox_file}"}
+
+        window = None
+        if selection is not None and not selection.is_empty():
+            window = MboxWindow(mbox_file, selection)
+        # Pré-résumé extractif optionnel des corps trop longs (mbox.presummary_words / presummary_target_words)
+        presummary = None
+        presummary_words = int(mbox_config.get("presummary_words", 0) or 0)
+        if presummary_words > 0:
+            target_words = int(mbox_config.get("presummary_target_words", DEFAULT_PRESUMMARY_TARGET_WORDS))
+            presummary = (presummary_words, target_words)
+        emails = iter_emails(mbox_file, index_path, workers, chunksize, cancel_token, window, body_cache,
+                             presummary)
+        reporter = current_reporter()
+        if reporter is None:
+            output = format_digest(emails)
+        else:
+            if stream_chunk is None:
+                stream_chunk = mbox_config.get("stream_chunk", DEFAULT_STREAM_CHUNK)
+            parts = report_digest(digest_parts(emails), reporter, int(stream_chunk or 0))
+            output = "\n".join([PROMPT_RESUME, *parts])
+        if window is not None and window.next_cursor is not None:
+            cursor = str(window.next_cursor)
+            return {"output": f"{output}\n{NEXT_PAGE_NOTE.format(cursor=cursor)}", "cursor": cursor}
+        return {"output": output}
+    except Exception as exc:
+        return {"error": f"exécution échouée : {exc} {mbox_file}"}
+
+def run_liste_emails(selection=None, cancel_token=None) -> dict:
+    """Liste les emails du mbox configuré d'après leurs seuls en-têtes.
+
+    Parameters
+    ----------
+    selection : EmailSelection, optional
+        Filtres et pagination.
+    cancel_token : CancelToken, optional
+        Jeton consulté entre deux emails. Par défaut, celui de l'appel d'outil en cours.
+
+    Returns
+    -------
+    dict
+        {"output": <text>, "error": <msg>} – une ligne JSON par email
+        (``from``, ``subject``, ``date``) ; "cursor" comme pour ``run_jsonise``.
+    """
+    cancel_token = cancel_token or current_token()
+    mbox_file = _mbox_file(get_config_value("mbox", {}))
+    if mbox_file is None:
+        return {"error": "SRC ou path non défini"}
+    if not os.path.isfile(mbox_file):
+        logging.info(f"Erreur : pas de mbox à {mbox_file}")
+        return {"error": f"pas de mbox à {mbox_file}"}
+    try:
+        window = MboxWindow(mbox_file, selection or EmailSelection())
+        lines = [json.dumps(headers_to_dict(headers), ensure_ascii=False)
+                 for headers in window.iter_headers(cancel_token)]
     except Exception as exc:
-        return {"error": f"exécution échouée : {exc} {mbox_src} {mbox_path}"}
+        return {"error": f"lecture échouée : {exc} {mbox_file}"}
+    if not lines:
+        return {"output": "Aucun email."}
+    if window.next_cursor is not None:
+        cursor = str(window.next_cursor)
+        lines.append(NEXT_PAGE_NOTE.format(cursor=cursor))
+        return {"output": "\n".join(lines), "cursor": cursor}
+    return {"output": "\n".join(lines)}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Index persistant d'un fichier mbox en ajout seul.
+
+L'index est une base SQLite annexe qui mémorise, pour chaque message, sa
+position dans le fichier, sa taille, son Message-ID et le JSON produit par
+``email_to_dict``, encodé en JSON. Seuls les messages ajoutés depuis le dernier passage sont
+relus et traités ; les autres sont servis depuis le cache.
+
+Un dernier message qui ne se termine pas par la ligne vide de séparation est
+peut-être encore en cours d'écriture : il est renvoyé mais pas mis en cache, et
+l'index s'arrête à la fin du dernier message complet pour le relire au passage
+suivant.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from email.parser import BytesHeaderParser
+from typing import Callable, Iterable, Iterator, Optional
+
+from mcps.email_processing.mbox_reader import iter_raw_messages
+from mcps.utils.cancellation import CancelToken
+
+# À incrémenter dès que le format du JSON mis en cache change
+INDEX_VERSION = "2"
+
+# Taille maximale de l'en-tête du fichier servant à détecter une réécriture
+HEAD_SIZE = 4096
+
+# Attente maximale d'un verrou tenu par un autre appel sur le même index, en secondes
+BUSY_TIMEOUT = 30.0
+# Messages en cache lus par requête : aucun verrou n'est gardé pendant qu'ils sont renvoyés
+READ_BATCH = 256
+
+
+def default_index_path(mbox_path: str) -> str:
+    """Retourne le chemin par défaut de l'index associé à un fichier mbox."""
+    return f"{mbox_path}.index.sqlite"
+
+
+class MboxIndex:
+    """Index SQLite annexe d'un fichier mbox."""
+
+    def __init__(self, mbox_path: str, index_path: Optional[str] = None, variant: str = ""):
+        """
+        Parameters
+        ----------
+        mbox_path : str
+            Chemin du fichier mbox indexé.
+        index_path : str, optional
+            Chemin de la base d'index. Par défaut, à côté du fichier mbox.
+        variant : str
+            Réglages du traitement (pré-résumé des corps) : un index construit
+            avec d'autres réglages est reconstruit.
+        """
+        self.mbox_path = mbox_path
+        self.index_path = index_path or default_index_path(mbox_path)
+        self.variant = variant
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base d'index en créant le schéma si nécessaire."""
+        conn = sqlite3.connect(self.index_path, timeout=BUSY_TIMEOUT)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " offset INTEGER PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " message_id TEXT,"
+            " processed TEXT)"
+        )
+        return conn
+
+    def _head_hash(self, length: int) -> str:
+        """Empreinte des ``length`` premiers octets du fichier mbox."""
+        with open(self.mbox_path, "rb") as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+
+    def _ends_with_separator(self, size: int) -> bool:
+        """Vrai si les ``size`` premiers octets du mbox se terminent par la ligne vide de séparation."""
+        with open(self.mbox_path, "rb") as f:
+            f.seek(max(0, size - 4))
+            return f.read(min(4, size)).endswith((b"\n\n", b"\r\n\r\n"))
+
+    def _indexed_size(self, conn: sqlite3.Connection, stat: os.stat_result) -> int:
+        """Retourne la fin du dernier message indexé, ou 0 après remise à zéro de l'index.
+
+        L'index est invalidé si sa version ou ses réglages diffèrent, si le fichier a rétréci ou si
+        son début ne correspond plus : le mbox a alors été réécrit, pas complété.
+        """
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        size = int(meta.get("size", 0))
+        head_len = int(meta.get("head_len", 0))
+        valid = (
+            meta.get("version") == INDEX_VERSION
+            and meta.get("variant", "") == self.variant
+            and size <= stat.st_size
+            and self._head_hash(head_len) == meta.get("head")
+        )
+        if valid:
+            return size
+        if meta:
+            logging.info(f"Index mbox invalidé, reconstruction complète : {self.index_path}")
+        conn.execute("DELETE FROM messages")
+        conn.execute("DELETE FROM meta")
+        return 0
+
+    def iter_emails(self, process: Callable[[Iterable[bytes]], Iterator[dict]],
+                    cancel_token: Optional[CancelToken] = None) -> Iterator[dict]:
+        """Renvoie le contenu de chaque message du mbox, dans l'ordre du fichier.
+
+        Les messages déjà indexés sont servis depuis le cache ; les messages
+        ajoutés depuis le dernier passage sont analysés, traités par ``process``
+        puis enregistrés dans l'index.
+
+        Parameters
+        ----------
+        process : callable
+            Fonction transformant des messages bruts en dictionnaires, dans le
+            même ordre (``process_raw_messages``).
+        cancel_token : CancelToken, optional
+            Jeton consulté entre deux messages ; l'index n'est alors pas mis à jour.
+
+        Aucune transaction n'est ouverte pendant que les messages sont renvoyés :
+        plusieurs appels peuvent lire et compléter le même index en parallèle.
+
+        Yields
+        ------
+        dict
+            Contenu de chaque message.
+        """
+        conn = self._connect()
+        try:
+            stat = os.stat(self.mbox_path)
+            start = self._indexed_size(conn, stat)
+            # Remise à zéro validée aussitôt : les appels concurrents ne restent pas bloqués
+            conn.commit()
+
+            # Messages indexés avant ``start`` seulement : ceux qu'un appel concurrent
+            # ajoute entre-temps sont relus plus bas, pas renvoyés deux fois
+            last_offset = -1
+            while True:
+                rows = conn.execute(
+                    "SELECT offset, processed FROM messages WHERE offset > ? AND offset < ? ORDER BY offset LIMIT ?",
+                    (last_offset, start, READ_BATCH)
+                ).fetchall()
+                if not rows:
+                    break
+                for last_offset, processed in rows:
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    yield json.loads(processed)
+
+            if start == stat.st_size:
+                return
+
+            # ``process`` peut lire en avance : les métadonnées sont relevées au
+            # passage et associées aux résultats, qui arrivent dans le même ordre
+            header_parser = BytesHeaderParser()
+            entries = []
+
+            def raw_messages():
+                for offset, raw in iter_raw_messages(self.mbox_path, start, stat.st_size):
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    headers = header_parser.parsebytes(raw)
+                    entries.append((offset, len(raw), headers.get("Message-ID")))
+                    yield raw
+
+            new_rows = []
+            for position, email_data in enumerate(process(raw_messages())):
+                new_rows.append(entries[position] + (json.dumps(email_data, ensure_ascii=False),))
+                yield email_data
+
+            # Dernier message inachevé (ajout en cours) : relu au prochain passage
+            indexed_end = stat.st_size
+            if not self._ends_with_separator(stat.st_size):
+                indexed_end = new_rows.pop()[0] if new_rows else start
+
+            head_len = min(HEAD_SIZE, indexed_end)
+            conn.executemany(
+                "INSERT OR REPLACE INTO messages (offset, size, message_id, processed) VALUES (?, ?, ?, ?)",
+                new_rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("version", INDEX_VERSION),
+                    ("variant", self.variant),
+                    ("size", str(indexed_end)),
+                    ("mtime", str(stat.st_mtime)),
+                    ("head_len", str(head_len)),
+                    ("head", self._head_hash(head_len)),
+                ]
+            )
+            conn.commit()
+        finally:
+            conn.close()
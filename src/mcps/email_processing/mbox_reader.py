@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Lecture en flux d'un fichier mbox.
+
+Contrairement à ``mailbox.mbox``, qui parcourt tout le fichier pour construire sa
+table des matières avant de renvoyer le premier message, ce lecteur projette le
+fichier en mémoire (``mmap``) et découpe les messages au fil de l'eau sur les
+lignes ``From ``. Seul le message en cours est copié : la mémoire consommée ne
+dépend pas de la taille du mbox.
+"""
+import email
+import mmap
+from email.message import Message
+from typing import Iterator, Optional, Tuple
+
+_FROM = b"From "
+_SEPARATOR = b"\nFrom "
+
+
+def _strip_separator(raw: bytes) -> bytes:
+    """Retire la ligne vide qui sépare un message du suivant (comme ``mailbox.mbox``)."""
+    if raw.endswith(b"\n\n"):
+        return raw[:-1]
+    if raw.endswith(b"\r\n\r\n"):
+        return raw[:-2]
+    return raw
+
+
+def iter_raw_messages(mbox_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """Renvoie (offset, octets bruts) pour chaque message du mbox.
+
+    Parameters
+    ----------
+    mbox_path : str
+        Chemin du fichier mbox.
+    start : int
+        Position à partir de laquelle chercher le premier message.
+    end : int, optional
+        Position de fin de lecture (par défaut, la fin du fichier).
+
+    Yields
+    ------
+    tuple
+        Position du message dans le fichier et son contenu brut, ligne ``From `` incluse.
+    """
+    with open(mbox_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Fichier vide : rien à projeter
+            return
+        with mm:
+            end = len(mm) if end is None else min(end, len(mm))
+            if mm[start:start + len(_FROM)] == _FROM and (start == 0 or mm[start - 1:start] == b"\n"):
+                offset = start
+            else:
+                found = mm.find(_SEPARATOR, max(start - 1, 0), end)
+                if found < 0:
+                    return
+                offset = found + 1
+            while offset < end:
+                found = mm.find(_SEPARATOR, offset, end)
+                stop = end if found < 0 else found + 1
+                yield offset, _strip_separator(mm[offset:stop])
+                offset = stop
+
+
+def iter_messages(mbox_path: str) -> Iterator[Message]:
+    """Renvoie paresseusement chaque message du mbox, déjà analysé."""
+    for _, raw in iter_raw_messages(mbox_path):
+        yield email.message_from_bytes(raw)
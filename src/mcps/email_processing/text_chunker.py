@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Découpage des textes longs pour une synthèse en map-reduce.
+
+Un long rapport collé dans le presse-papiers dépasserait le contexte du modèle
+s'il était transmis d'un bloc par ``prepare_synthese``. Le texte est alors
+découpé en parties de taille bornée, en suivant sa structure : titres d'abord,
+puis paragraphes, lignes, phrases et, en dernier recours, mots. Chaque partie
+est servie séparément avec une consigne map-reduce : synthèse de chaque partie
+(map), puis assemblage des synthèses partielles (reduce).
+
+Les textes découpés sont conservés en mémoire (les plus récents seulement) :
+une partie se récupère par son curseur ``<document>:<numéro>``, dans n'importe
+quel ordre, ce qui permet au client de résumer les parties en parallèle.
+"""
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# Taille maximale par défaut d'une partie, en caractères (synthese.max_chars)
+DEFAULT_MAX_CHARS = 6000
+# Nombre de textes découpés gardés en mémoire
+MAX_DOCUMENTS = 8
+
+PROMPT_MAP_REDUCE = (
+    "Le texte est trop long pour être synthétisé d'un bloc : il est découpé en {total} parties. "
+    "Étape 1 (map) : fais une synthèse intermédiaire de chaque partie, en récupérant les autres "
+    "parties avec l'outil prepare_synthese et leur cursor (les appels peuvent être faits en parallèle). "
+    "Étape 2 (reduce) : assemble les synthèses intermédiaires en une seule synthèse structurée et affiche-la."
+)
+
+# Séparateurs, du plus structurant au plus fin : titres, paragraphes, lignes, phrases, mots
+_HEADING = re.compile(r"\n(?=[ \t]*(?:#{1,6}\s|[IVXLC]+[.)]\s|\d+(?:\.\d+)*[.)]\s))")
+_PARAGRAPH = re.compile(r"\n[ \t]*\n")
+_LINE = re.compile(r"\n")
+_SENTENCE = re.compile(r"(?<=[.!?…])\s+")
+_WORD = re.compile(r"\s+")
+_SEPARATORS = (
+    (_HEADING, "\n"),
+    (_PARAGRAPH, "\n\n"),
+    (_LINE, "\n"),
+    (_SENTENCE, " "),
+    (_WORD, " "),
+)
+
+
+def _split(text: str, max_chars: int, level: int) -> List[str]:
+    """Découpe ``text`` au séparateur ``level`` puis regroupe les morceaux jusqu'à ``max_chars``."""
+    if len(text) <= max_chars:
+        return [text]
+    if level >= len(_SEPARATORS):
+        # Aucun séparateur : coupure franche
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+    pattern, joiner = _SEPARATORS[level]
+    pieces = [piece for piece in pattern.split(text) if piece.strip()]
+    if len(pieces) <= 1:
+        return _split(text, max_chars, level + 1)
+
+    parts: List[str] = []
+    current = ""
+    for piece in pieces:
+        for chunk in _split(piece, max_chars, level + 1):
+            if current and len(current) + len(joiner) + len(chunk) > max_chars:
+                parts.append(current)
+                current = chunk
+            else:
+                current = f"{current}{joiner}{chunk}" if current else chunk
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_text(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> List[str]:
+    """Découpe un texte en parties d'au plus ``max_chars`` caractères, sur ses frontières structurelles.
+
+    Parameters
+    ----------
+    text : str
+        Texte à découper.
+    max_chars : int
+        Taille maximale d'une partie.
+
+    Returns
+    -------
+    list of str
+        Parties, dans l'ordre du texte (aucune si le texte est vide).
+    """
+    text = text.strip()
+    if not text:
+        return []
+    return [part.strip() for part in _split(text, max(1, max_chars), 0)]
+
+
+class ChunkedText:
+    """Texte découpé, identifié par l'empreinte de son contenu."""
+
+    __slots__ = ("id", "parts")
+
+    def __init__(self, text: str, max_chars: int = DEFAULT_MAX_CHARS):
+        self.id = hashlib.blake2b(f"{max_chars}\0{text}".encode("utf-8", errors="surrogatepass"),
+                                  digest_size=6).hexdigest()
+        self.parts = split_text(text, max_chars)
+
+    def cursor(self, index: int) -> str:
+        """Curseur de la partie ``index`` (numérotée à partir de 1)."""
+        return f"{self.id}:{index}"
+
+
+_documents: "OrderedDict[str, ChunkedText]" = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def chunk_text(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> ChunkedText:
+    """Découpe un texte et le garde en mémoire pour la récupération par curseur."""
+    document = ChunkedText(text, max_chars)
+    with _documents_lock:
+        _documents[document.id] = document
+        _documents.move_to_end(document.id)
+        while len(_documents) > MAX_DOCUMENTS:
+            _documents.popitem(last=False)
+    return document
+
+
+def parse_cursor(cursor: str) -> Tuple[str, int]:
+    """Sépare un curseur en (document, numéro de partie).
+
+    Raises
+    ------
+    ValueError
+        Si le curseur est mal formé.
+    """
+    document_id, _, index = str(cursor).partition(":")
+    if not document_id or not index.isdigit():
+        raise ValueError(f"cursor invalide : {cursor}")
+    return document_id, int(index)
+
+
+def get_part(cursor: str) -> Tuple[Optional[ChunkedText], int]:
+    """Retrouve le texte découpé et le numéro de partie d'un curseur (texte None s'il a été oublié)."""
+    document_id, index = parse_cursor(cursor)
+    with _documents_lock:
+        document = _documents.get(document_id)
+        if document is not None:
+            _documents.move_to_end(document_id)
+    return document, index
+
+
+def format_part(document: ChunkedText, index: int) -> str:
+    """Réponse de ``prepare_synthese`` pour une partie : consigne map-reduce, texte et curseurs."""
+    total = len(document.parts)
+    payload = {
+        "**OBJECTIF**": PROMPT_MAP_REDUCE.format(total=total),
+        "**PARTIE**": f"{index}/{total}",
+        "**TEXTE CIBLE**": document.parts[index - 1],
+    }
+    if index == 1:
+        payload["**CURSEURS**"] = [document.cursor(i) for i in range(2, total + 1)]
+    elif index < total:
+        payload["**SUITE**"] = document.cursor(index + 1)
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def decoupe_pour_synthese(texte: str, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """Découpe un texte long et renvoie sa première partie, avec les curseurs des suivantes."""
+    document = chunk_text(texte, max_chars)
+    if not document.parts:
+        return json.dumps("Texte vide")
+    return format_part(document, 1)
+
+
+def partie_de_synthese(cursor: str) -> str:
+    """Renvoie la partie désignée par un curseur de ``decoupe_pour_synthese``."""
+    try:
+        document, index = get_part(cursor)
+    except ValueError as e:
+        return json.dumps(str(e), ensure_ascii=False)
+    if document is None:
+        return json.dumps("Texte découpé introuvable : relancer prepare_synthese sans cursor")
+    if not 1 <= index <= len(document.parts):
+        return json.dumps(f"Partie {index} inexistante (1 à {len(document.parts)})")
+    return format_part(document, index)
@@ -6,8 +6,10 @@ Ce module implémente un serveur MCP personnel qui fournit les fonctionnalités
 
 * **calcul** – Effectue l'addition de deux nombres
 * **resume_emails** – Résume les emails en 80 mots maximum
+* **liste_emails** – Liste les emails (expéditeur, sujet, date) sans lire leur contenu
 * **marque_recette_faite** – Met à jour la date de réalisation d'une recette
 * **propose_des_recettes** – Propose des recettes à partir d'une source donnée
+* **cherche_recettes** – Recherche plein texte dans les recettes
 * **prepare_synthese** – Réalise des synthèses de textes
 * **gourmandise_recette** – Convertit des recettes au format gourmand
 
@@ -15,6 +17,33 @@ Le serveur communique via stdio (stdin/stdout) au format JSON-RPC 2.0 et s'intè
 avec d'autres modules du projet pour fournir une solution complète de gestion de recettes
 et de traitement de texte.
 
+Les outils sont déclarés dans le registre ``TOOLS`` (voir ``tool_registry``) :
+schéma, fonction et caractéristiques d'exécution au même endroit.
+
+Les réponses à ``initialize`` et ``tools/list`` sont encodées une seule fois
+(puis à chaque rechargement de la configuration, ``kill -HUP``) : seul l'``id``
+de la requête y est inséré avant l'écriture dans le tampon binaire de stdout.
+
+Les appels ``tools/call`` sont exécutés dans un pool de threads (taille fixée par
+``server.max_workers``) : la lecture de stdin se poursuit pendant qu'un outil lent
+travaille et chaque réponse est écrite, avec son ``id``, dès qu'elle est prête.
+Les lots JSON-RPC (tableau de requêtes) sont exécutés en parallèle, dans la
+limite de ``server.batch_concurrency``, et reçoivent un seul tableau de réponses.
+
+Les modules des outils (lxml, sqlite3, presse-papiers…) ne sont importés qu'au
+premier appel de l'outil, pour répondre au plus vite à ``initialize`` ; un thread
+de préchargement optionnel (``server.warmup``) les importe en tâche de fond une
+fois l'initialisation faite. Avec ``clipboard.watch``, un thread garde en mémoire
+la dernière sélection X : les outils de presse-papiers n'attendent plus ``xclip``.
+
+Chaque appel d'outil reçoit un jeton d'annulation (``mcps.utils.cancellation``) :
+une notification ``notifications/cancelled`` l'annule et le délai configuré
+pour l'outil (``server.timeouts``) le fait expirer, ce qui interrompt les
+traitements longs et renvoie une erreur -32001 en cas de dépassement.
+Si la requête porte un ``progressToken`` (``params._meta``), l'outil signale son
+avancement par des notifications ``notifications/progress`` (``mcps.utils.progress``) ;
+``resume_emails`` peut y joindre le condensé par morceaux.
+
 Configuration centralisée via le module mcps.config.
 """
 import logging
@@ -26,280 +55,645 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+import importlib
 import json
+import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 # Import configuration module
-from mcps.utils.config import get_config_value
+from mcps.utils.config import DEFAULT_CHECK_INTERVAL, get_config_value, on_config_reload, refresh_config, reload_config
+from mcps.utils.cancellation import CancelToken, Cancelled, bind_token
+from mcps.utils.progress import ProgressReporter, bind_reporter
+from mcps.mcp_server.message_writer import MessageWriter, encode_message
+from mcps.mcp_server.tool_registry import ToolRegistry, CACHEABLE, CPU_BOUND, IO_BOUND, SIDE_EFFECT
 
-# Import helper functions from dedicated modules
-from mcps.email_processing.jsonise import run_jsonise
+# Prompts embarqués dans les descriptions des outils (modules sans dépendances)
 from mcps.email_processing.synthetise_texte import PROMPT_SYNTHESE
-
-from mcps.recipes.marque_recette_faite import marque_recette_faite
-from mcps.recipes.propose_des_recettes import propose_des_recettes
 from mcps.recipes.gourmandise_recette import PROMPT_GOURMAND
 
-from mcps.utils.send_clipboard import recuperer_texte_du_presse_papier
+# Fonctions des outils, importées au premier accès : nom -> (module, attribut)
+_LAZY_IMPORTS = {
+    "run_jsonise": ("mcps.email_processing.jsonise", "run_jsonise"),
+    "run_liste_emails": ("mcps.email_processing.jsonise", "run_liste_emails"),
+    "EmailSelection": ("mcps.email_processing.email_selection", "EmailSelection"),
+    "marque_recette_faite": ("mcps.recipes.marque_recette_faite", "marque_recette_faite"),
+    "propose_des_recettes": ("mcps.recipes.propose_des_recettes", "propose_des_recettes"),
+    "cherche_recettes": ("mcps.recipes.cherche_recettes", "cherche_recettes"),
+    "recuperer_texte_du_presse_papier": ("mcps.utils.send_clipboard", "recuperer_texte_du_presse_papier"),
+    "start_clipboard_watcher": ("mcps.utils.send_clipboard", "start_clipboard_watcher"),
+    "decoupe_pour_synthese": ("mcps.email_processing.text_chunker", "decoupe_pour_synthese"),
+    "partie_de_synthese": ("mcps.email_processing.text_chunker", "partie_de_synthese"),
+    "reduce_text": ("mcps.email_processing.extractive_summary", "reduce_text"),
+}
+
+# Nombre de threads par défaut pour l'exécution des outils
+DEFAULT_MAX_WORKERS = 4
+# Nombre maximal de requêtes d'un même lot exécutées en parallèle
+DEFAULT_BATCH_CONCURRENCY = 4
+# Taille au-delà de laquelle prepare_synthese découpe le texte (synthese.max_chars)
+DEFAULT_SYNTHESE_MAX_CHARS = 6000
+# Nombre de mots visé par le pré-résumé d'un texte trop long (synthese.presummary_target_words)
+DEFAULT_SYNTHESE_PRESUMMARY_TARGET_WORDS = 1500
+
+# Écriture sur stdout : un verrou unique, les réponses des workers ne s'entrelacent pas
+_writer = MessageWriter()
+
+# Jetons d'annulation des appels d'outils en cours, par id de requête
+_active_requests: dict[Any, CancelToken] = {}
+_active_requests_lock = threading.Lock()
+
+_warm_up_started = threading.Event()
+_reload_requested = threading.Event()
+
+
+def __getattr__(name: str) -> Any:
+    """Importe à la demande les fonctions des outils (PEP 562)."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def _tool(name: str) -> Any:
+    """Retourne la fonction d'un outil, en l'important au premier appel."""
+    return getattr(sys.modules[__name__], name)
+
+
+def _warm_up() -> None:
+    """Importe tous les modules des outils pour que leur premier appel soit rapide."""
+    for name in _LAZY_IMPORTS:
+        try:
+            _tool(name)
+        except Exception as e:
+            logging.info(f"Préchargement de {name} impossible : {e}")
+
+
+def start_warm_up() -> None:
+    """Lance une seule fois le préchargement en tâche de fond si ``server.warmup`` est activé."""
+    if _warm_up_started.is_set() or not get_config_value("server.warmup", False):
+        return
+    _warm_up_started.set()
+    threading.Thread(target=_warm_up, name="mcp-warmup", daemon=True).start()
+
+def start_clipboard_watch() -> None:
+    """Lance la surveillance du presse-papiers si ``clipboard.watch`` est activé."""
+    if not get_config_value("clipboard.watch", False):
+        return
+    try:
+        _tool("start_clipboard_watcher")(
+            get_config_value("clipboard.interval", None), get_config_value("clipboard.history", None)
+        )
+    except Exception as e:
+        logging.info(f"Surveillance du presse-papiers impossible : {e}")
 
 def send_message(msg: dict[str, Any]) -> None:
-    """Envoie un message JSON au client via stdout."""
+    """Envoie un message JSON au client via stdout, en une seule écriture."""
     try:
-        json.dump(msg, sys.stdout, ensure_ascii=False)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        _writer.send(msg)
     except Exception as e:
         # Log error to file
         logging.info(f"Error sending message: {e}")
 
-def handle_initialize(request_id: str) -> None:
-    """Répond à la requête d'initialisation en listant les capacités."""
+def send_bytes(data: bytes) -> None:
+    """Envoie au client un message déjà sérialisé et encodé, fin de ligne comprise."""
+    try:
+        _writer.write(data)
+    except Exception as e:
+        logging.info(f"Error sending message: {e}")
+
+
+# Outils exposés par le serveur, dans l'ordre de tools/list
+TOOLS = ToolRegistry()
+
+
+@TOOLS.tool(
+    "calcul", "Additionne deux nombres",
+    properties={
+        "a": {"type": "number", "description": "Premier nombre"},
+        "b": {"type": "number", "description": "Second nombre"}
+    },
+    required=["a", "b"],
+    traits=[CPU_BOUND, CACHEABLE]
+)
+def _calcul(arguments: dict) -> str:
+    """Additionne ``a`` et ``b``."""
+    a = arguments.get("a", 0)
+    b = arguments.get("b", 0)
+    resultat = a + b
+    return f"Le résultat de {a} + {b} = {resultat}"
+
+
+@TOOLS.tool(
+    "resume_emails",
+    "Lit les emails et renvoie les emails pour que tu les résumes en 80 mots maximum. Les filtres (since, from, subject) et la pagination (limit, offset, cursor) évitent de lire tout l'historique ; quand d'autres emails restent, le texte se termine par le cursor de la page suivante.",
+    properties={
+        "since": {"type": "string", "description": "Date ISO 8601 (AAAA-MM-JJ) à partir de laquelle lire les emails"},
+        "from": {"type": "string", "description": "Texte recherché dans l'expéditeur"},
+        "subject": {"type": "string", "description": "Texte recherché dans le sujet"},
+        "limit": {"type": "integer", "minimum": 1, "description": "Nombre maximal d'emails renvoyés"},
+        "offset": {"type": "integer", "description": "Nombre d'emails retenus à sauter"},
+        "cursor": {"type": "string", "description": "Curseur de la page suivante, renvoyé par l'appel précédent"},
+        "lot": {"type": "integer", "description": "Nombre d'emails par morceau envoyé en avance dans les notifications de progression (0 : aucun)"}
+    },
+    traits=[IO_BOUND, CPU_BOUND]
+)
+def _resume_emails(arguments: dict) -> str:
+    """Renvoie le condensé des emails du mbox configuré, filtré et paginé."""
+    try:
+        selection = _tool("EmailSelection").from_arguments(arguments)
+    except ValueError as e:
+        return f"Argument invalide : {e}"
+    options = {}
+    if arguments.get("lot") is not None:
+        options["stream_chunk"] = arguments["lot"]
+    if not selection.is_empty():
+        options["selection"] = selection
+    result = _tool("run_jsonise")(**options)
+    return result.get("output", "")
+
+
+@TOOLS.tool(
+    "liste_emails",
+    "Liste les emails (expéditeur, sujet, date) sans lire leur contenu, une ligne JSON par email. Accepte les mêmes filtres et la même pagination que resume_emails ; utile pour choisir les emails à résumer.",
+    properties={
+        "since": {"type": "string", "description": "Date ISO 8601 (AAAA-MM-JJ) à partir de laquelle lister les emails"},
+        "from": {"type": "string", "description": "Texte recherché dans l'expéditeur"},
+        "subject": {"type": "string", "description": "Texte recherché dans le sujet"},
+        "limit": {"type": "integer", "minimum": 1, "description": "Nombre maximal d'emails listés"},
+        "offset": {"type": "integer", "description": "Nombre d'emails retenus à sauter"},
+        "cursor": {"type": "string", "description": "Curseur de la page suivante, renvoyé par l'appel précédent"}
+    },
+    traits=[IO_BOUND]
+)
+def _liste_emails(arguments: dict) -> str:
+    """Liste les en-têtes des emails du mbox configuré, filtrés et paginés."""
+    try:
+        selection = _tool("EmailSelection").from_arguments(arguments)
+    except ValueError as e:
+        return f"Argument invalide : {e}"
+    result = _tool("run_liste_emails")(selection)
+    return result.get("output", result.get("error", ""))
+
+
+@TOOLS.tool(
+    "marque_recette_faite",
+    "Met à jour le champ description d'une recette. Reçoit un titre de recette, de préférence exact ; un titre approché (casse, accents) est corrigé s'il est sans ambiguïté, sinon les titres proches sont renvoyés.",
+    properties={"titre": {"type": "string", "description": "Titre de la recette"}},
+    required=["titre"],
+    traits=[IO_BOUND, SIDE_EFFECT]
+)
+def _marque_recette_faite(arguments: dict) -> str:
+    """Inscrit la date du jour dans la recette ``titre``."""
+    titre = arguments.get("titre")
+    if not titre:
+        return "Veuillez spécifier le titre de la recette."
+    return _tool("marque_recette_faite")(titre)
+
+
+@TOOLS.tool(
+    "propose_des_recettes",
+    "Propose un nombre défini de recettes d'une source donnée. Ne modifie pas la casse des titres reçus.",
+    properties={
+        "source": {"type": "string", "description": "Source des recettes"},
+        "quantite": {"type": "integer", "description": "Nombre de recettes à proposer"}
+    },
+    required=["source", "quantite"],
+    traits=[IO_BOUND]
+)
+def _propose_des_recettes(arguments: dict) -> str:
+    """Propose ``quantite`` recettes de ``source``."""
+    source = arguments.get("source")
+    quantite = arguments.get("quantite")
+    if not source or quantite is None:
+        return "Veuillez spécifier la source et la quantité de recettes."
+    return _tool("propose_des_recettes")(source, quantite)
+
+
+@TOOLS.tool(
+    "cherche_recettes",
+    "Recherche des recettes par mots-clés dans leur titre, leurs catégories, leurs ingrédients et leurs instructions. Tolère les fautes de casse et d'accents ; renvoie les titres exacts, du plus au moins pertinent, avec un extrait.",
+    properties={
+        "requete": {"type": "string", "description": "Mots recherchés"},
+        "quantite": {"type": "integer", "description": "Nombre maximal de recettes (10 par défaut)"}
+    },
+    required=["requete"],
+    traits=[IO_BOUND]
+)
+def _cherche_recettes(arguments: dict) -> str:
+    """Recherche plein texte des recettes correspondant à ``requete``."""
+    requete = arguments.get("requete")
+    quantite = arguments.get("quantite", 10)
+    if not requete:
+        return "Veuillez spécifier les mots recherchés."
+    return _tool("cherche_recettes")(requete, quantite)
+
+
+@TOOLS.tool(
+    "prepare_synthese",
+    f"Cet outils te transmets maintenant le texte d’un article pour \
+                        que tu en fasses une synthèse et l’affiche. {PROMPT_SYNTHESE} \
+Un texte trop long est découpé en parties numérotées : la réponse indique la consigne map-reduce \
+et les cursor des autres parties, à récupérer en rappelant l'outil avec cursor.",
+    properties={
+        "cursor": {"type": "string", "description": "Curseur d'une partie d'un texte découpé"}
+    },
+    traits=[IO_BOUND]
+)
+def _prepare_synthese(arguments: dict) -> str:
+    """Renvoie le texte du presse-papiers avec la consigne de synthèse, pré-résumé ou découpé s'il est long."""
+    cursor = arguments.get("cursor")
+    if cursor:
+        return _tool("partie_de_synthese")(cursor)
+    contexte_a_etablir = _tool("recuperer_texte_du_presse_papier")()
+    try:
+        max_chars = max(1, int(get_config_value("synthese.max_chars", DEFAULT_SYNTHESE_MAX_CHARS)))
+    except (TypeError, ValueError):
+        max_chars = DEFAULT_SYNTHESE_MAX_CHARS
+    try:
+        presummary_words = int(get_config_value("synthese.presummary_words", 0) or 0)
+        target_words = int(get_config_value("synthese.presummary_target_words",
+                                            DEFAULT_SYNTHESE_PRESUMMARY_TARGET_WORDS))
+    except (TypeError, ValueError):
+        presummary_words = 0
+    if len(contexte_a_etablir) > max_chars or presummary_words > 0:
+        try:
+            texte = json.loads(contexte_a_etablir)
+        except ValueError:
+            texte = contexte_a_etablir
+        if isinstance(texte, str):
+            # Pré-résumé extractif d'un texte trop long, puis découpage s'il reste long
+            reduit = _tool("reduce_text")(texte, presummary_words, target_words) if presummary_words > 0 else texte
+            if len(reduit) > max_chars:
+                return _tool("decoupe_pour_synthese")(reduit, max_chars)
+            if reduit is not texte:
+                contexte_a_etablir = json.dumps(reduit, ensure_ascii=False)
+    return f"{{ '**OBJECTIF**': 'fait une synthèse du texte suivant et affiche la : ', '**TEXTE CIBLE**': {contexte_a_etablir}}}"
+
+
+@TOOLS.tool(
+    "gourmandise_recette",
+    f"Convertis, encode, prépare des recettes au format gourmand. {PROMPT_GOURMAND}",
+    traits=[IO_BOUND]
+)
+def _gourmandise_recette(arguments: dict) -> str:
+    """Renvoie le texte du presse-papiers à convertir au format gourmand."""
+    return _tool("recuperer_texte_du_presse_papier")()
+
+
+def _initialize_result() -> dict[str, Any]:
+    """Résultat de ``initialize`` : version du protocole, serveur et capacités."""
     # Load server configuration from centralized config
     protocol_version = get_config_value("server.protocolVersion", "2024-11-05")
     server_name = get_config_value("server.name", "serveur-mcp")
     server_version = get_config_value("server.version", "1.0.0")
+    return {
+        "protocolVersion": protocol_version,
+        "serverInfo": {"name": server_name, "version": server_version},
+        "capabilities": {"tools": TOOLS.capabilities()}
+    }
 
-    send_message({
-        "jsonrpc": "2.0",
-        "id": request_id,
-        "result": {
-            "protocolVersion": protocol_version,
-            "serverInfo": {"name": server_name, "version": server_version},
-            "capabilities": {
-                "tools": {
-                    "calcul": {},
-                    "resume_emails": {},
-                    "marque_recette_faite": {},
-                    "propose_des_recettes": {},
-                    "prepare_synthese": {},
-                    "gourmandise_recette": {}
-                }
-            }
-        }
-    })
+# Réponses invariables, encodées une fois : méthode -> (octets avant l'id, octets après l'id)
+_static_responses: dict[str, tuple[bytes, bytes]] = {}
+_static_responses_lock = threading.Lock()
+
+def _static_response(method: str) -> tuple[bytes, bytes]:
+    """Retourne la réponse encodée de ``initialize`` ou ``tools/list``, calculée au premier appel."""
+    with _static_responses_lock:
+        parts = _static_responses.get(method)
+        if parts is None:
+            if method == "initialize":
+                result = json.dumps(_initialize_result(), ensure_ascii=False)
+            else:
+                # La liste embarque les longs prompts de synthèse et de conversion
+                result = f'{{"tools": {TOOLS.tools_json()}}}'
+            parts = (b'{"jsonrpc": "2.0", "id": ', f', "result": {result}}}\n'.encode("utf-8"))
+            _static_responses[method] = parts
+        return parts
+
+@on_config_reload
+def invalidate_static_responses() -> None:
+    """Oublie les réponses pré-sérialisées (après un rechargement de la configuration)."""
+    with _static_responses_lock:
+        _static_responses.clear()
+
+def _static_bytes(method: str, request_id: Any) -> bytes:
+    """Réponse pré-sérialisée, avec seulement l'``id`` inséré."""
+    prefix, suffix = _static_response(method)
+    return prefix + json.dumps(request_id, ensure_ascii=False).encode("utf-8") + suffix
+
+def handle_initialize(request_id: str) -> None:
+    """Répond à la requête d'initialisation en listant les capacités."""
+    send_bytes(_static_bytes("initialize", request_id))
 
 def handle_list_tools(request_id: str) -> None:
     """Renvoie la description des outils disponibles."""
-    send_message({
+    send_bytes(_static_bytes("tools/list", request_id))
+
+def _error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    """Réponse d'erreur JSON-RPC."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+def _tool_timeout(tool_name: str) -> float | None:
+    """Délai d'exécution d'un outil (``server.timeouts``), en secondes, ou None."""
+    timeouts = get_config_value("server.timeouts", {})
+    if not isinstance(timeouts, dict):
+        return None
+    value = timeouts.get(tool_name, timeouts.get("default"))
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def track_request(request_id: Any) -> CancelToken:
+    """Crée le jeton d'annulation d'une requête, retrouvable par son ``id``."""
+    token = CancelToken()
+    if isinstance(request_id, (str, int, float)):
+        with _active_requests_lock:
+            _active_requests[request_id] = token
+    return token
+
+def untrack_request(request_id: Any, token: CancelToken) -> None:
+    """Oublie le jeton d'une requête terminée."""
+    with _active_requests_lock:
+        if isinstance(request_id, (str, int, float)) and _active_requests.get(request_id) is token:
+            del _active_requests[request_id]
+
+def cancel_request(request_id: Any, reason: str | None = None) -> bool:
+    """Annule une requête en cours (``notifications/cancelled``).
+
+    Returns
+    -------
+    bool
+        True si la requête était en cours.
+    """
+    with _active_requests_lock:
+        token = _active_requests.get(request_id) if isinstance(request_id, (str, int, float)) else None
+    if token is None:
+        return False
+    token.cancel(reason or "requête annulée par le client")
+    return True
+
+def _progress_reporter(params: dict, token: CancelToken) -> ProgressReporter | None:
+    """Émetteur de ``notifications/progress`` si la requête porte un ``progressToken``."""
+    meta = params.get("_meta")
+    progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+    if not isinstance(progress_token, (str, int)):
+        return None
+
+    def send(progress: float, total: float | None, message: str | None) -> None:
+        # Plus aucune notification pour une requête annulée
+        if token.cancelled:
+            return
+        notification_params = {"progressToken": progress_token, "progress": progress}
+        if total is not None:
+            notification_params["total"] = total
+        if message is not None:
+            notification_params["message"] = message
+        send_message({"jsonrpc": "2.0", "method": "notifications/progress", "params": notification_params})
+    return ProgressReporter(send)
+
+def call_tool(request_id: str, params: dict, token: CancelToken | None = None) -> dict[str, Any] | None:
+    """Exécute l'outil demandé et retourne la réponse JSON-RPC (résultat ou erreur).
+
+    L'outil s'exécute avec ``token`` comme jeton courant, après lui avoir fixé
+    le délai configuré dans ``server.timeouts``, et avec un émetteur de
+    progression si le client a fourni un ``progressToken``.
+
+    Returns
+    -------
+    dict or None
+        Réponse JSON-RPC, erreur -32001 si le délai est dépassé, ou None si la
+        requête a été annulée par le client (aucune réponse n'est alors due).
+    """
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+
+    tool = TOOLS.get(tool_name)
+    if tool is None:
+        return _error(request_id, -32601, f"Outil inconnu: {tool_name}")
+    token = token or CancelToken()
+    token.set_timeout(_tool_timeout(tool_name))
+    try:
+        with bind_token(token), bind_reporter(_progress_reporter(params, token)):
+            token.check()
+            result_text = tool.handler(arguments)
+        # Résultat arrivé trop tard : le délai l'emporte
+        token.check()
+    except Cancelled as e:
+        if not e.timeout:
+            logging.info(f"Requête {request_id} ({tool_name}) annulée : {e.reason}")
+            return None
+        logging.info(f"Requête {request_id} ({tool_name}) interrompue : {e.reason}")
+        return _error(request_id, -32001, f"{tool_name} : {e.reason}")
+    except Exception as e:
+        return _error(request_id, -32603, str(e))
+    return {
         "jsonrpc": "2.0",
         "id": request_id,
-        "result": {
-            "tools": [
-                {
-                    "name": "calcul",
-                    "description": "Additionne deux nombres",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "a": {"type": "number", "description": "Premier nombre"},
-                            "b": {"type": "number", "description": "Second nombre"}
-                        },
-                        "required": ["a", "b"]
-                    }
-                },
-                {
-                    "name": "resume_emails",
-                    "description": "Lit les emails et renvoie les emails pour que tu les résumes en 80 mots maximum.",
-                    "inputSchema": {"type": "object", "properties": {}, "required": []}
-                },
-                {
-                    "name": "marque_recette_faite",
-                    "description": "Met à jour le champ description d'une recette. Reçoit un titre de recette qu’il ne faut pas modifier, même au niveau de la casse.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {"titre": {"type": "string", "description": "Titre de la recette"}},
-                        "required": ["titre"]
-                    }
-                },
-                {
-                    "name": "propose_des_recettes",
-                    "description": "Propose un nombre défini de recettes d'une source donnée. Ne modifie pas la casse des titres reçus.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "source": {"type": "string", "description": "Source des recettes"},
-                            "quantite": {"type": "integer", "description": "Nombre de recettes à proposer"}
-                        },
-                        "required": ["source", "quantite"]
-                    }
-                },
-                {
-                    "name": "prepare_synthese",
-                    "description": f"Cet outils te transmets maintenant le texte d’un article pour \
-                        que tu en fasses une synthèse et l’affiche. {PROMPT_SYNTHESE}",
-                    "inputSchema": {"type": "object", "properties": {}, "required": []}
-                },
-                {
-                    "name": "gourmandise_recette",
-                    "description": f"Convertis, encode, prépare des recettes au format gourmand. {PROMPT_GOURMAND}",
-                    "inputSchema": {"type": "object", "properties": {}, "required": []}
-                }
-
-            ]
-        }
-    })
-
-def handle_call_tool(request_id: str, params: dict) -> None:
+        "result": {"content": [{"type": "text", "text": result_text}]}
+    }
+
+def handle_call_tool(request_id: str, params: dict, token: CancelToken | None = None) -> None:
     """Exécution d'un outil demandé via ``tools/call``."""
-    tool_name = params.get("name")
-    arguments = params.get("arguments", {})
+    response = call_tool(request_id, params, token)
+    if response is not None:
+        send_message(response)
 
-    if tool_name == "calcul":
-        a = arguments.get("a", 0)
-        b = arguments.get("b", 0)
-        resultat = a + b
-        send_message({
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {"content": [{"type": "text", "text": f"Le résultat de {a} + {b} = {resultat}"}]}
-        })
-    elif tool_name == "resume_emails":
-        try:
-            result = run_jsonise()
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": result.get("output", "")}]}
-            })
-        except Exception as e:
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": str(e)}
-            })
-    elif tool_name == "marque_recette_faite":
-        try:
-            titre = arguments.get("titre")
-            if not titre:
-                result_text = "Veuillez spécifier le titre de la recette."
-            else:
-                result_text = marque_recette_faite(titre)
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": result_text}]}
-            })
-        except Exception as e:
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": str(e)}
-            })
-    elif tool_name == "propose_des_recettes":
-        try:
-            source = arguments.get("source")
-            quantite = arguments.get("quantite")
-            if not source or quantite is None:
-                result_text = "Veuillez spécifier la source et la quantité de recettes."
-            else:
-                result_text = propose_des_recettes(source, quantite)
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": result_text}]}
-            })
-        except Exception as e:
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": str(e)}
-            })
-    elif tool_name == "prepare_synthese":
-        try:
-            contexte_a_etablir = recuperer_texte_du_presse_papier()
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [
-                    {"type": "text", 
-                     "text": f"{{ '**OBJECTIF**': 'fait une synthèse du texte suivant et affiche la : ', '**TEXTE CIBLE**': {contexte_a_etablir}}}"}
-                ]}
-            })        
-        except Exception as e:
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": str(e)}
-            })
-    elif tool_name == "gourmandise_recette":
+def _run_tool_call(request_id: str, params: dict, token: CancelToken | None = None) -> None:
+    """Exécute ``handle_call_tool`` dans un worker en garantissant une réponse."""
+    try:
+        handle_call_tool(request_id, params, token)
+    except Exception as e:
+        logging.info(f"Erreur dans le worker pour la requête {request_id}: {e}")
+        send_message(_error(request_id, -32603, f"Internal error: {str(e)}"))
+    finally:
+        if token is not None:
+            untrack_request(request_id, token)
+
+def respond(message: Any, token: CancelToken | None = None) -> bytes | None:
+    """Calcule la réponse encodée à une requête JSON-RPC, sans l'envoyer.
+
+    Parameters
+    ----------
+    message : any
+        Requête décodée.
+    token : CancelToken, optional
+        Jeton d'annulation d'un ``tools/call`` (voir ``track_request``).
+
+    Returns
+    -------
+    bytes or None
+        Réponse terminée par une fin de ligne, ou None pour une notification
+        ou une requête annulée.
+    """
+    if not isinstance(message, dict):
+        return encode_message(_error(None, -32600, "Invalid Request"))
+    method = message.get("method")
+    request_id = message.get("id")
+    params = message.get("params", {})
+    try:
+        if method in ("initialize", "tools/list"):
+            return _static_bytes(method, request_id)
+        if method == "tools/call":
+            response = call_tool(request_id, params, token)
+            return None if response is None else encode_message(response)
+        if method == "notifications/cancelled":
+            cancel_request(params.get("requestId"), params.get("reason"))
+            return None
+        if method in ("notifications/initialized", "exit"):
+            return None
+        if method == "shutdown":
+            return encode_message({"jsonrpc": "2.0", "id": request_id, "result": {}})
+        return encode_message(_error(request_id, -32601, f"Méthode inconnue: {method}"))
+    except Exception as e:
+        # Handle unexpected errors in method processing
+        return encode_message(_error(request_id, -32603, f"Internal error: {str(e)}"))
+
+def _get_max_workers() -> int:
+    """Lit ``server.max_workers`` dans la configuration (au moins 1)."""
+    try:
+        return max(1, int(get_config_value("server.max_workers", DEFAULT_MAX_WORKERS)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_WORKERS
+
+def _get_batch_concurrency() -> int:
+    """Lit ``server.batch_concurrency`` dans la configuration (au moins 1)."""
+    try:
+        return max(1, int(get_config_value("server.batch_concurrency", DEFAULT_BATCH_CONCURRENCY)))
+    except (TypeError, ValueError):
+        return DEFAULT_BATCH_CONCURRENCY
+
+def _get_config_check_interval() -> float:
+    """Lit ``server.config_check_interval`` : délai minimal entre deux contrôles de config.yaml."""
+    try:
+        return float(get_config_value("server.config_check_interval", DEFAULT_CHECK_INTERVAL))
+    except (TypeError, ValueError):
+        return DEFAULT_CHECK_INTERVAL
+
+def handle_batch(messages: list, executor: ThreadPoolExecutor) -> None:
+    """Traite un lot JSON-RPC (tableau de requêtes) et envoie un seul tableau de réponses.
+
+    Les requêtes du lot sont exécutées en parallèle dans le pool de threads, au
+    plus ``server.batch_concurrency`` à la fois ; les réponses gardent l'ordre
+    des requêtes et les notifications n'en produisent pas.
+
+    Parameters
+    ----------
+    messages : list
+        Requêtes du lot.
+    executor : ThreadPoolExecutor
+        Pool partagé des outils. Cette fonction ne doit pas y être exécutée
+        elle-même, sous peine de bloquer le pool en attendant ses propres tâches.
+    """
+    if not messages:
+        send_message(_error(None, -32600, "Invalid Request"))
+        return
+    slots = threading.Semaphore(_get_batch_concurrency())
+    tokens = {}
+    for position, message in enumerate(messages):
+        if isinstance(message, dict) and message.get("method") == "tools/call":
+            tokens[position] = track_request(message.get("id"))
+
+    def run(message: Any, token: CancelToken | None) -> bytes | None:
         try:
-            contexte_a_etablir = recuperer_texte_du_presse_papier()
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": contexte_a_etablir}]}
-            })
-        except Exception as e:
-            send_message({
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {"code": -32603, "message": str(e)}
-            })
-    else:
-        send_message({
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "error": {"code": -32601, "message": f"Outil inconnu: {tool_name}"}
-        })
+            return respond(message, token)
+        finally:
+            slots.release()
+
+    futures = []
+    try:
+        for position, message in enumerate(messages):
+            slots.acquire()
+            try:
+                futures.append(executor.submit(run, message, tokens.get(position)))
+            except Exception:
+                slots.release()
+                raise
+        responses = [future.result() for future in futures]
+    finally:
+        for position, token in tokens.items():
+            untrack_request(messages[position].get("id"), token)
+    parts = [response.rstrip(b"\n") for response in responses if response is not None]
+    if parts:
+        send_bytes(b"[" + b", ".join(parts) + b"]\n")
+
+def _run_batch(messages: list, executor: ThreadPoolExecutor) -> None:
+    """Exécute ``handle_batch`` dans un thread dédié en garantissant une réponse."""
+    try:
+        handle_batch(messages, executor)
+    except Exception as e:
+        logging.info(f"Erreur lors du traitement d'un lot: {e}")
+        send_message(_error(None, -32603, f"Internal error: {str(e)}"))
 
 def main() -> None:
-    """Boucle principale du serveur – lit les requêtes JSON sur stdin."""
+    """Boucle principale du serveur – lit les requêtes JSON sur stdin.
+
+    Les requêtes ``tools/call`` sont confiées au pool de threads ; les autres
+    méthodes, peu coûteuses, sont traitées directement dans la boucle de lecture.
+    Un lot (tableau JSON) est suivi par un thread dédié qui répartit ses
+    requêtes dans le pool et renvoie toutes les réponses d'un bloc.
+    """
+    if hasattr(signal, "SIGHUP") and threading.current_thread() is threading.main_thread():
+        # ``kill -HUP`` demande une relecture de la configuration, faite avant la
+        # requête suivante (pas dans le gestionnaire, qui pourrait interrompre un verrou)
+        signal.signal(signal.SIGHUP, lambda signum, frame: _reload_requested.set())
+    executor = ThreadPoolExecutor(max_workers=_get_max_workers(), thread_name_prefix="mcp-tool")
+    batches: list[threading.Thread] = []
     try:
         for line in sys.stdin:
             try:
                 message = json.loads(line)
             except json.JSONDecodeError:
                 # Send error response for invalid JSON
-                send_message({
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {"code": -32700, "message": "Parse error"}
-                })
+                send_message(_error(None, -32700, "Parse error"))
                 continue
             
-            method = message.get("method")
-            request_id = message.get("id")
-            params = message.get("params", {})
-            
-            try:
+            if _reload_requested.is_set():
+                _reload_requested.clear()
+                reload_config()
+            else:
+                # Relecture automatique si config.yaml a changé (server.config_check_interval, 0 = jamais)
+                refresh_config(_get_config_check_interval())
+
+            if isinstance(message, list):
+                batches = [thread for thread in batches if thread.is_alive()]
+                thread = threading.Thread(target=_run_batch, args=(message, executor),
+                                          name="mcp-batch", daemon=True)
+                thread.start()
+                batches.append(thread)
+                continue
+
+            method = message.get("method") if isinstance(message, dict) else None
+            if method == "tools/call":
+                token = track_request(message.get("id"))
+                executor.submit(_run_tool_call, message.get("id"), message.get("params", {}), token)
+            elif method == "exit":
+                break
+            else:
+                response = respond(message)
+                if response is not None:
+                    send_bytes(response)
                 if method == "initialize":
-                    handle_initialize(request_id)
-                elif method == "tools/list":
-                    handle_list_tools(request_id)
-                elif method == "tools/call":
-                    handle_call_tool(request_id, params)
-                elif method == "notifications/initialized":
-                    pass
-                elif method == "shutdown":
-                    send_message({"jsonrpc": "2.0", "id": request_id, "result": {}})
-                elif method == "exit":
-                    break
-                else:
-                    send_message({
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32601, "message": f"Méthode inconnue: {method}"}
-                    })
-            except Exception as e:
-                # Handle unexpected errors in method processing
-                send_message({
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
-                })
+                    start_warm_up()
+                    start_clipboard_watch()
     except Exception as e:
         # Handle fatal errors in main loop
-        error_msg = {
-            "jsonrpc": "2.0",
-            "id": None,
-            "error": {"code": -32603, "message": f"Fatal server error: {str(e)}"}
-        }
+        error_msg = _error(None, -32603, f"Fatal server error: {str(e)}")
         try:
             send_message(error_msg)
         except:
             pass  # Ignore errors when sending fatal error message
+        executor.shutdown(wait=False, cancel_futures=True)
         sys.exit(1)
+    # Attendre la fin des lots et des outils en cours pour ne perdre aucune réponse
+    for thread in batches:
+        thread.join()
+    executor.shutdown(wait=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Écriture des messages JSON-RPC sur la sortie standard.
+
+Chaque message est encodé une seule fois en octets, fin de ligne comprise, puis
+écrit d'un bloc dans le tampon binaire de stdout et vidé : un seul appel
+d'écriture par message au lieu d'un ``json.dump`` en morceaux suivi d'un
+``write("\\n")`` et d'un ``flush()`` sur la couche texte. Un verrou unique
+garantit que les réponses des différents workers ne s'entrelacent pas.
+
+``orjson`` est utilisé s'il est installé ; à défaut, ou pour les valeurs qu'il
+ne sait pas encoder, le module ``json`` de la bibliothèque standard prend le relais.
+"""
+import json
+import sys
+import threading
+from typing import Any, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+
+def encode_message(msg: Any) -> bytes:
+    """Encode un message JSON en UTF-8, terminé par une fin de ligne."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(msg, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # Clés non textuelles, entiers hors 64 bits… : encodage standard
+            pass
+    return (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class MessageWriter:
+    """Écrit des messages JSON sur un flux, un bloc d'octets par message."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Parameters
+        ----------
+        stream : file object, optional
+            Flux texte de destination. Par défaut, ``sys.stdout`` tel qu'il est
+            au moment de chaque écriture.
+        """
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, data: bytes) -> None:
+        """Écrit un message déjà encodé, fin de ligne comprise.
+
+        Les octets vont directement dans le tampon binaire du flux ; un flux
+        texte sans tampon (``StringIO``) reçoit le texte décodé.
+        """
+        stream = self._stream if self._stream is not None else sys.stdout
+        buffer = getattr(stream, "buffer", None)
+        with self._lock:
+            if buffer is not None:
+                # Vide d'abord la couche texte pour conserver l'ordre des messages
+                stream.flush()
+                buffer.write(data)
+                buffer.flush()
+            else:
+                stream.write(data.decode("utf-8"))
+                stream.flush()
+
+    def send(self, msg: Any) -> None:
+        """Encode puis écrit un message JSON."""
+        self.write(encode_message(msg))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Registre déclaratif des outils exposés par le serveur MCP.
+
+Chaque outil est déclaré par un décorateur qui associe à sa fonction son nom,
+sa description, le schéma de ses arguments et ses caractéristiques
+d'exécution. Le serveur s'appuie sur le registre pour :
+
+* trouver l'outil d'un ``tools/call`` par simple accès à un dictionnaire ;
+* construire les capacités annoncées à ``initialize`` ;
+* produire la liste ``tools/list``, sérialisée une seule fois.
+
+Exemple ::
+
+    TOOLS = ToolRegistry()
+
+    @TOOLS.tool("calcul", "Additionne deux nombres",
+                properties={"a": {"type": "number"}, "b": {"type": "number"}},
+                required=["a", "b"], traits=[CPU_BOUND, CACHEABLE])
+    def calcul(arguments):
+        return str(arguments["a"] + arguments["b"])
+"""
+import json
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+# Caractéristiques d'exécution d'un outil
+CPU_BOUND = "cpu"
+IO_BOUND = "io"
+CACHEABLE = "cacheable"
+SIDE_EFFECT = "side_effect"
+TRAITS = frozenset({CPU_BOUND, IO_BOUND, CACHEABLE, SIDE_EFFECT})
+
+# Fonction d'un outil : reçoit les arguments de ``tools/call`` et renvoie le texte de la réponse
+ToolHandler = Callable[[Dict[str, Any]], str]
+
+
+class Tool:
+    """Déclaration d'un outil : description, schéma, fonction et caractéristiques."""
+
+    __slots__ = ("name", "description", "input_schema", "handler", "traits")
+
+    def __init__(self, name: str, description: str, input_schema: Dict[str, Any],
+                 handler: ToolHandler, traits: FrozenSet[str]):
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler = handler
+        self.traits = traits
+
+    def has_trait(self, trait: str) -> bool:
+        """Indique si l'outil possède une caractéristique (``CPU_BOUND``, ``CACHEABLE``…)."""
+        return trait in self.traits
+
+    def schema(self) -> Dict[str, Any]:
+        """Entrée de l'outil dans la réponse à ``tools/list``."""
+        return {"name": self.name, "description": self.description, "inputSchema": self.input_schema}
+
+
+class ToolRegistry:
+    """Ensemble ordonné des outils du serveur."""
+
+    def __init__(self):
+        self._tools: Dict[str, Tool] = {}
+        self._tools_json: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def tool(self, name: str, description: str, properties: Optional[Dict[str, Any]] = None,
+             required: Iterable[str] = (), traits: Iterable[str] = ()) -> Callable[[ToolHandler], ToolHandler]:
+        """Décorateur déclarant une fonction comme outil.
+
+        Parameters
+        ----------
+        name : str
+            Nom de l'outil dans ``tools/call``.
+        description : str
+            Description transmise au client.
+        properties : dict, optional
+            Propriétés du schéma JSON des arguments.
+        required : iterable of str
+            Arguments obligatoires.
+        traits : iterable of str
+            Caractéristiques d'exécution, parmi ``TRAITS``.
+
+        Returns
+        -------
+        callable
+            Décorateur enregistrant la fonction et la renvoyant inchangée.
+        """
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            input_schema = {"type": "object", "properties": dict(properties or {}), "required": list(required)}
+            self.register(Tool(name, description, input_schema, handler, frozenset(traits)))
+            return handler
+        return decorator
+
+    def register(self, tool: Tool) -> None:
+        """Ajoute un outil au registre.
+
+        Raises
+        ------
+        ValueError
+            Si le nom est déjà pris ou si une caractéristique est inconnue.
+        """
+        unknown = tool.traits - TRAITS
+        if unknown:
+            raise ValueError(f"Caractéristiques inconnues pour {tool.name}: {', '.join(sorted(unknown))}")
+        with self._lock:
+            if tool.name in self._tools:
+                raise ValueError(f"Outil déjà déclaré: {tool.name}")
+            self._tools[tool.name] = tool
+            self._tools_json = None
+
+    def get(self, name: Optional[str]) -> Optional[Tool]:
+        """Retourne l'outil nommé ``name``, ou None s'il n'existe pas."""
+        return self._tools.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __iter__(self) -> Iterator[Tool]:
+        return iter(list(self._tools.values()))
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def capabilities(self) -> Dict[str, Dict[str, Any]]:
+        """Outils annoncés dans la réponse à ``initialize``."""
+        return {name: {} for name in self._tools}
+
+    def schemas(self) -> List[Dict[str, Any]]:
+        """Liste des outils telle que renvoyée par ``tools/list``."""
+        return [tool.schema() for tool in self._tools.values()]
+
+    def tools_json(self) -> str:
+        """Liste ``tools/list`` sérialisée en JSON, calculée une seule fois."""
+        with self._lock:
+            if self._tools_json is None:
+                self._tools_json = json.dumps(self.schemas(), ensure_ascii=False)
+            return self._tools_json
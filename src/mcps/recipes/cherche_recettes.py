@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Module providing the cherche_recettes function."""
+import os
+from mcps.recipes.recipe_search import get_search_index
+from mcps.utils.config import get_config_value
+
+
+def cherche_recettes(requete: str, quantite: int = 10) -> str:
+    """Recherche des recettes en plein texte (titre, catégories, ingrédients, instructions).
+
+    Parameters
+    ----------
+    requete: str
+        Mots recherchés, sans exigence d'exactitude sur la casse ou les accents.
+    quantite: int
+        Nombre maximal de recettes renvoyées.
+
+    Returns
+    -------
+    str
+        Une ligne par recette, de la plus à la moins pertinente : titre exact et extrait
+        du texte correspondant, ou un message si aucune recette ne correspond.
+    """
+    # Load database path from centralized configuration
+    db_path = get_config_value("database.path", "/home/courses/.local/share/gourmand/recipes.db")
+    db_path = os.path.expanduser(db_path)
+    index_path = get_config_value("database.fts_path")
+    index_path = os.path.expanduser(index_path) if index_path else None
+
+    try:
+        results = get_search_index(db_path, index_path).search(requete, quantite)
+    except Exception as e:
+        return f"Erreur lors de la recherche: {e}"
+    if not results:
+        return f"Aucune recette trouvée pour '{requete}'."
+    return "\n".join(f"{title} : {snippet}" for title, _, snippet in results)
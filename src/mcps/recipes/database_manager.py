@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """Module providing the DatabaseManager interface and its implementation."""
 import logging
-from typing import List, Optional, Any
+import os
+import threading
+from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 import sqlite3
 
+from mcps.utils.config import on_config_reload
+
+# Nombre de connexions conservées par base de données
+DEFAULT_POOL_SIZE = 2
+
 
 class DatabaseManager:
     """Interface pour la gestion de la base de données."""
@@ -29,17 +36,174 @@ class DatabaseManager:
         pass
 
 
+class SQLiteConnectionPool:
+    """Pool de connexions SQLite réutilisées pendant toute la vie du processus.
+
+    Au plus ``size`` connexions sont prêtées simultanément ; les suivantes
+    attendent qu'une connexion soit rendue. Chaque connexion est vérifiée avant
+    d'être prêtée et rouverte si elle ne répond plus ou si le fichier de la base
+    a été remplacé. Une fois le pool fermé, les connexions encore prêtées sont
+    fermées à leur retour.
+    """
+
+    def __init__(self, db_path: str, size: int = DEFAULT_POOL_SIZE):
+        self.db_path = db_path
+        # ``database.pool_size`` peut venir de la configuration sous forme de texte ou de null
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            logging.info(f"Taille de pool invalide ({size!r}), {DEFAULT_POOL_SIZE} connexions par défaut")
+            size = DEFAULT_POOL_SIZE
+        self.size = max(1, size)
+        self.closed = False
+        self._idle: List[sqlite3.Connection] = []
+        self._inodes: Dict[int, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _inode(self) -> Optional[int]:
+        """Inode du fichier de la base, ou None s'il n'existe pas."""
+        try:
+            return os.stat(self.db_path).st_ino
+        except OSError:
+            return None
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Vérifie qu'une connexion répond et pointe toujours sur le bon fichier."""
+        if self._inodes.get(id(conn)) != self._inode():
+            return False
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Ferme une connexion sans la remettre dans le pool."""
+        self._inodes.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """Emprunte une connexion, en l'ouvrant si aucune n'est disponible.
+
+        Raises
+        ------
+        TimeoutError
+            Si aucune connexion ne se libère avant ``timeout`` secondes.
+        """
+        if not self._slots.acquire(timeout=timeout if timeout is not None else -1):
+            raise TimeoutError(f"Aucune connexion disponible pour {self.db_path}")
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    self._inodes[id(conn)] = self._inode()
+                    return conn
+                if self._is_healthy(conn):
+                    return conn
+                logging.info(f"Connexion SQLite invalide, reconnexion à {self.db_path}")
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Rend une connexion au pool en annulant toute transaction restée ouverte.
+
+        Si le pool a été fermé entre-temps, la connexion est fermée.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                if not self.closed:
+                    self._idle.append(conn)
+                    return
+            self._discard(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        """Ferme les connexions inactives du pool ; les connexions prêtées le seront à leur retour."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+def database_signature(db_path: str) -> str:
+    """Taille et date de modification d'une base SQLite et de son journal WAL.
+
+    Sert aux index en mémoire ou annexes pour savoir si la base a changé
+    depuis leur dernière construction.
+    """
+    parts = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "/".join(parts)
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str, size: int = DEFAULT_POOL_SIZE) -> SQLiteConnectionPool:
+    """Retourne le pool de connexions du processus pour ``db_path``, créé au premier appel.
+
+    Aucune connexion n'est ouverte tant que le pool n'est pas sollicité.
+    """
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = SQLiteConnectionPool(db_path, size)
+        return pool
+
+
+@on_config_reload
+def close_connection_pools() -> None:
+    """Ferme et oublie tous les pools de connexions du processus.
+
+    Appelée après un rechargement de la configuration : les appels suivants
+    ouvrent des pools neufs, sur le chemin et avec la taille configurés.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
 class SQLiteDatabaseManager(DatabaseManager):
-    """Implémentation de DatabaseManager pour SQLite."""
+    """Implémentation de DatabaseManager pour SQLite.
+
+    Avec un ``pool``, ``connect`` emprunte une connexion existante et ``close``
+    la rend au pool au lieu de la fermer.
+    """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
+        self.pool = pool
         self.conn = None
 
     def connect(self) -> bool:
         """Établit une connexion à la base de données."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            if self.pool is not None:
+                self.conn = self.pool.acquire()
+            else:
+                self.conn = sqlite3.connect(self.db_path)
             return True
         except Exception as e:
             logging.info(f"Erreur dlors de la connexion à la base de données: {e} ")
@@ -61,5 +225,8 @@ class SQLiteDatabaseManager(DatabaseManager):
     def close(self) -> None:
         """Fermer la connexion à la base de données."""
         if self.conn:
-            self.conn.close()
+            if self.pool is not None:
+                self.pool.release(self.conn)
+            else:
+                self.conn.close()
             self.conn = None
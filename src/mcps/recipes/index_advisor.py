@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Module providing the IndexAdvisor maintenance tool.
+
+La table ``recipe`` de Gourmand n'a pas d'index sur les colonnes filtrées par
+``SQLiteRecipeManager`` : chaque recherche parcourt toute la table puis trie le
+résultat. Ce module examine le plan d'exécution (``EXPLAIN QUERY PLAN``) de ces
+requêtes, crée à la demande les index couvrants adaptés et compare plans et
+temps d'exécution avant et après.
+
+Usage :
+    python -m mcps.recipes.index_advisor [--db CHEMIN] [--apply]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from mcps.recipes.database_manager import DatabaseManager, SQLiteDatabaseManager
+from mcps.recipes.recipe_manager import GET_RECIPE_QUERY, SEARCH_RECIPES_QUERY, UPDATE_RECIPE_QUERY
+from mcps.utils.config import get_config_value
+
+# Index recommandés : couvrant pour search_recipes, simple pour les accès par titre
+RECOMMENDED_INDEXES = {
+    "mcps_recipe_source_description": "CREATE INDEX IF NOT EXISTS mcps_recipe_source_description "
+                                      "ON recipe (source, description, title)",
+    "mcps_recipe_title": "CREATE INDEX IF NOT EXISTS mcps_recipe_title ON recipe (title)",
+}
+
+# Bases dont les index ont déjà été vérifiés par ce processus
+_indexed_paths: Set[str] = set()
+_indexed_lock = threading.Lock()
+
+
+class IndexAdvisor:
+    """Analyse les requêtes de SQLiteRecipeManager et crée les index manquants."""
+
+    def __init__(self, db_manager: DatabaseManager, repeat: int = 20):
+        """
+        Parameters
+        ----------
+        db_manager : DatabaseManager
+            Gestionnaire déjà connecté à la base Gourmand.
+        repeat : int
+            Nombre d'exécutions par requête pour la mesure (meilleur temps retenu).
+        """
+        self.db_manager = db_manager
+        self.repeat = max(1, repeat)
+
+    def _sample_values(self) -> Tuple[str, str]:
+        """Retourne une source et un titre représentatifs pour les mesures."""
+        source = self.db_manager.execute_query(
+            "SELECT source FROM recipe GROUP BY source ORDER BY count(*) DESC LIMIT 1"
+        )
+        title = self.db_manager.execute_query("SELECT title FROM recipe LIMIT 1")
+        return (source[0][0] if source else ""), (title[0][0] if title else "")
+
+    def _queries(self) -> List[Tuple[str, str, tuple, bool]]:
+        """Requêtes analysées : (libellé, SQL, paramètres, mesurable sans effet de bord)."""
+        source, title = self._sample_values()
+        return [
+            ("search_recipes", SEARCH_RECIPES_QUERY, (source, 10), True),
+            ("get_recipe", GET_RECIPE_QUERY, (title,), True),
+            # La mise à jour n'est jamais exécutée : seul son plan est examiné
+            ("update_recipe", UPDATE_RECIPE_QUERY, ("", title), False),
+        ]
+
+    def query_plan(self, query: str, params: tuple = ()) -> List[str]:
+        """Retourne les étapes du plan d'exécution d'une requête."""
+        rows = self.db_manager.execute_query(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row[-1] for row in rows]
+
+    def time_query(self, query: str, params: tuple = ()) -> float:
+        """Meilleur temps d'exécution d'une requête, en millisecondes."""
+        best = float("inf")
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self.db_manager.execute_query(query, params)
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    def existing_indexes(self) -> Set[str]:
+        """Noms des index déjà présents sur la table ``recipe``."""
+        rows = self.db_manager.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'recipe'"
+        )
+        return {row[0] for row in rows}
+
+    def missing_indexes(self) -> List[str]:
+        """Noms des index recommandés absents de la base."""
+        existing = self.existing_indexes()
+        return [name for name in RECOMMENDED_INDEXES if name not in existing]
+
+    def analyse(self) -> Dict[str, Dict[str, Any]]:
+        """Plan et temps d'exécution de chaque requête du gestionnaire de recettes.
+
+        Returns
+        -------
+        dict
+            ``{libellé: {"plan": [...], "full_scan": bool, "ms": float | None}}``
+        """
+        report = {}
+        for label, query, params, timed in self._queries():
+            plan = self.query_plan(query, params)
+            report[label] = {
+                "plan": plan,
+                "full_scan": any(step.startswith("SCAN") or "TEMP B-TREE" in step for step in plan),
+                "ms": self.time_query(query, params) if timed else None,
+            }
+        return report
+
+    def apply(self) -> Dict[str, Any]:
+        """Crée les index manquants et retourne l'analyse avant/après.
+
+        Returns
+        -------
+        dict
+            ``{"created": [...], "before": analyse, "after": analyse}``
+        """
+        before = self.analyse()
+        created = self.missing_indexes()
+        for name in created:
+            self.db_manager.execute_query(RECOMMENDED_INDEXES[name])
+        if created:
+            # Met à jour les statistiques utilisées par le planificateur
+            self.db_manager.execute_query("ANALYZE recipe")
+        self.db_manager.commit()
+        return {"created": created, "before": before, "after": self.analyse()}
+
+
+def ensure_recommended_indexes(db_manager: SQLiteDatabaseManager) -> List[str]:
+    """Crée les index recommandés une seule fois par base et par processus.
+
+    Utilisée par les outils de recettes quand ``database.auto_index`` est activé.
+
+    Une erreur SQLite (base verrouillée par Gourmand, fichier en lecture seule)
+    est journalisée sans être propagée : la base n'est marquée comme vérifiée
+    qu'après la validation des index, et la création sera retentée au prochain appel.
+
+    Returns
+    -------
+    list
+        Noms des index créés (vide si la base était déjà indexée, déjà vérifiée ou en erreur).
+    """
+    with _indexed_lock:
+        if db_manager.db_path in _indexed_paths:
+            return []
+    try:
+        created = IndexAdvisor(db_manager).missing_indexes()
+        for name in created:
+            db_manager.execute_query(RECOMMENDED_INDEXES[name])
+        db_manager.commit()
+    except sqlite3.Error as e:
+        logging.info(f"Création des index impossible sur {db_manager.db_path}: {e}")
+        return []
+    with _indexed_lock:
+        _indexed_paths.add(db_manager.db_path)
+    if created:
+        logging.info(f"Index créés sur {db_manager.db_path}: {', '.join(created)}")
+    return created
+
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    """Met en forme le résultat de ``IndexAdvisor.analyse``."""
+    lines = []
+    for label, entry in report.items():
+        timing = f"{entry['ms']:.3f} ms" if entry["ms"] is not None else "non mesurée"
+        status = "parcours complet" if entry["full_scan"] else "index utilisé"
+        lines.append(f"{label} : {timing} ({status})")
+        lines.extend(f"    {step}" for step in entry["plan"])
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Analyse et indexation de la table recipe de Gourmand.")
+    parser.add_argument("--db", help="Chemin de la base (par défaut : database.path de la configuration)")
+    parser.add_argument("--apply", action="store_true", help="Crée les index manquants")
+    args = parser.parse_args()
+
+    db_path = os.path.expanduser(args.db or get_config_value("database.path", "~/.local/share/gourmand/recipes.db"))
+    db_manager = SQLiteDatabaseManager(db_path)
+    if not db_manager.connect():
+        raise SystemExit(f"Impossible de se connecter à {db_path}")
+    try:
+        advisor = IndexAdvisor(db_manager)
+        if not args.apply:
+            print(format_report(advisor.analyse()))
+            missing = advisor.missing_indexes()
+            print(f"\nIndex manquants : {', '.join(missing) if missing else 'aucun'}")
+            return
+        result = advisor.apply()
+        print("Avant :\n" + format_report(result["before"]))
+        print(f"\nIndex créés : {', '.join(result['created']) if result['created'] else 'aucun'}")
+        print("\nAprès :\n" + format_report(result["after"]))
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
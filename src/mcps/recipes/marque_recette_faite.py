@@ -3,7 +3,9 @@
 import os
 from datetime import datetime
 from mcps.recipes.recipe_manager import SQLiteRecipeManager
-from mcps.recipes.database_manager import SQLiteDatabaseManager
+from mcps.recipes.database_manager import SQLiteDatabaseManager, get_connection_pool, DEFAULT_POOL_SIZE
+from mcps.recipes.index_advisor import ensure_recommended_indexes
+from mcps.recipes.title_index import get_title_index
 from mcps.utils.config import get_config_value
 
 
@@ -13,23 +15,38 @@ def marque_recette_faite(titre: str) -> str:
     Parameters
     ----------
     titre: str
-        Le titre de la recette à marquer comme faite.
+        Le titre de la recette à marquer comme faite. Un titre approché (casse,
+        accents, petite faute) est ramené au titre exact s'il n'y a pas d'ambiguïté.
 
     Returns
     -------
     str
-        Chaîne contenant le titre et la nouvelle valeur de la colonne `description`.
+        Chaîne contenant le titre et la nouvelle valeur de la colonne `description`,
+        ou la liste des titres proches si la saisie est ambiguë.
     """
     # Load database path from centralized configuration
     db_path = get_config_value("database.path", "/home/courses/.local/share/gourmand/recipes.db")
     db_path = os.path.expanduser(db_path)
-    db_manager = SQLiteDatabaseManager(db_path)
+    # Connexion empruntée au pool du processus plutôt qu'ouverte à chaque appel
+    pool = get_connection_pool(db_path, get_config_value("database.pool_size", DEFAULT_POOL_SIZE))
+    db_manager = SQLiteDatabaseManager(db_path, pool)
     recipe_manager = SQLiteRecipeManager(db_manager)
 
     if db_manager.connect():
         date_today = datetime.now().strftime("%Y-%m-%d")
-        result = recipe_manager.update_recipe(titre, date_today)
-        db_manager.close()
+        try:
+            if get_config_value("database.auto_index", False):
+                ensure_recommended_indexes(db_manager)
+            # Résout les titres approchés en un seul appel plutôt qu'à force d'essais
+            title_index = get_title_index(db_path)
+            title_index.refresh(db_manager)
+            canonical, proches = title_index.resolve(titre)
+            if canonical is None and proches:
+                return f"Recette '{titre}' introuvable. Titres proches : " + "; ".join(proches)
+            result = recipe_manager.update_recipe(canonical or titre, date_today)
+        finally:
+            # Rend la connexion au pool même en cas d'erreur
+            db_manager.close()
         if result is None:
             return f"Aucune recette trouvée avec le titre '{titre}'."
         return result
@@ -2,7 +2,8 @@
 """Module providing the propose_des_recettes function."""
 import os
 from mcps.recipes.recipe_manager import SQLiteRecipeManager
-from mcps.recipes.database_manager import SQLiteDatabaseManager
+from mcps.recipes.database_manager import SQLiteDatabaseManager, get_connection_pool, DEFAULT_POOL_SIZE
+from mcps.recipes.index_advisor import ensure_recommended_indexes
 from mcps.utils.config import get_config_value
 
 def propose_des_recettes(source: str, quantite: int) -> str:
@@ -23,12 +24,19 @@ def propose_des_recettes(source: str, quantite: int) -> str:
     # Load database path from centralized configuration
     db_path = get_config_value("database.path", "/home/courses/.local/share/gourmand/recipes.db")
     db_path = os.path.expanduser(db_path)
-    db_manager = SQLiteDatabaseManager(db_path)
+    # Connexion empruntée au pool du processus plutôt qu'ouverte à chaque appel
+    pool = get_connection_pool(db_path, get_config_value("database.pool_size", DEFAULT_POOL_SIZE))
+    db_manager = SQLiteDatabaseManager(db_path, pool)
     recipe_manager = SQLiteRecipeManager(db_manager)
 
     if db_manager.connect():
-        results = recipe_manager.search_recipes(source, quantite)
-        db_manager.close()
+        try:
+            if get_config_value("database.auto_index", False):
+                ensure_recommended_indexes(db_manager)
+            results = recipe_manager.search_recipes(source, quantite)
+        finally:
+            # Rend la connexion au pool même en cas d'erreur
+            db_manager.close()
         return "\n".join(results)
     else:
         return "Impossible de se connecter à la base de données."
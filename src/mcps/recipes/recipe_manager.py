@@ -4,6 +4,11 @@ from typing import List, Optional
 from abc import ABC, abstractmethod
 from mcps.recipes.database_manager import DatabaseManager
 
+# Requêtes exécutées par SQLiteRecipeManager (analysées par index_advisor)
+UPDATE_RECIPE_QUERY = "UPDATE recipe SET description = ? WHERE title = ?"
+GET_RECIPE_QUERY = "SELECT title, description FROM recipe WHERE title = ?"
+SEARCH_RECIPES_QUERY = "SELECT description, title FROM recipe WHERE source = ? ORDER BY description LIMIT ?"
+
 
 class RecipeManager:
     """Interface pour la gestion des recettes."""
@@ -33,12 +38,12 @@ class SQLiteRecipeManager(RecipeManager):
         """Met à jour la description d'une recette."""
         try:
             self.db_manager.execute_query(
-                "UPDATE recipe SET description = ? WHERE title = ?",
+                UPDATE_RECIPE_QUERY,
                 (description, titre)
             )
             self.db_manager.commit()
             row = self.db_manager.execute_query(
-                "SELECT title, description FROM recipe WHERE title = ?",
+                GET_RECIPE_QUERY,
                 (titre,)
             )
             if row:
@@ -52,7 +57,7 @@ class SQLiteRecipeManager(RecipeManager):
         """Récupère une recette par son titre."""
         try:
             row = self.db_manager.execute_query(
-                "SELECT title, description FROM recipe WHERE title = ?",
+                GET_RECIPE_QUERY,
                 (titre,)
             )
             if row:
@@ -66,7 +71,7 @@ class SQLiteRecipeManager(RecipeManager):
         """Recherche des recettes par source et retourne une liste de résultats."""
         try:
             rows = self.db_manager.execute_query(
-                "SELECT description, title FROM recipe WHERE source = ? ORDER BY description LIMIT ?",
+                SEARCH_RECIPES_QUERY,
                 (source, quantite)
             )
             if rows:
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Module providing the RecipeSearchIndex full-text search engine.
+
+L'index est une table FTS5 placée dans une base SQLite annexe : la base
+Gourmand n'est ouverte qu'en lecture (``ATTACH`` en mode ``ro``). Il couvre le
+titre, les catégories, les ingrédients et les instructions de chaque recette et
+se resynchronise de façon incrémentale, seulement quand le fichier de la base
+Gourmand a changé : seules les recettes ajoutées, modifiées ou supprimées sont
+réindexées.
+"""
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from urllib.parse import quote
+from typing import Dict, List, Optional, Tuple
+
+from mcps.recipes.database_manager import database_signature
+from mcps.utils.config import on_config_reload
+
+# Poids bm25 des colonnes (titre, catégorie, ingrédients, instructions)
+COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def default_index_path(db_path: str) -> str:
+    """Retourne le chemin par défaut de l'index plein texte d'une base Gourmand."""
+    return f"{db_path}.fts.sqlite"
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """Transforme une saisie libre en requête FTS5.
+
+    Chaque mot devient un préfixe entre guillemets ; les mots sont combinés par
+    ``OR`` pour tolérer un titre approximatif, bm25 classant en tête les
+    recettes qui en contiennent le plus.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " OR ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+
+class RecipeSearchIndex:
+    """Index plein texte FTS5 d'une base Gourmand."""
+
+    def __init__(self, db_path: str, index_path: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        db_path : str
+            Chemin de la base Gourmand (lue seulement).
+        index_path : str, optional
+            Chemin de la base annexe contenant l'index. Par défaut, à côté de la base.
+        """
+        self.db_path = db_path
+        self.index_path = index_path or default_index_path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        # Signature de la base Gourmand au moment où elle a été attachée
+        self._attached_signature: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre l'index, crée son schéma et attache la base Gourmand en lecture seule."""
+        if self._conn is not None:
+            return self._conn
+        conn = sqlite3.connect(self.index_path, check_same_thread=False, uri=True)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_fts USING fts5("
+                "title, category, ingredients, instructions, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS recipe_state (recipe_id INTEGER PRIMARY KEY, stamp TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.commit()
+            self._attach(conn)
+        except Exception:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def _attach(self, conn: sqlite3.Connection, signature: Optional[str] = None) -> None:
+        """Attache la base Gourmand en lecture seule, en la détachant d'abord si elle l'était déjà.
+
+        La base attachée reste liée au fichier ouvert : si ce fichier est remplacé
+        (renommage atomique), seul un nouvel ``ATTACH`` lit le nouveau.
+        """
+        if self._attached_signature is not None:
+            conn.execute("DETACH DATABASE gourmand")
+        conn.execute("ATTACH DATABASE ? AS gourmand", (f"file:{quote(self.db_path)}?mode=ro",))
+        self._attached_signature = signature or database_signature(self.db_path)
+
+    def _columns(self, conn: sqlite3.Connection, table: str) -> List[str]:
+        """Colonnes d'une table de la base Gourmand (vide si la table n'existe pas)."""
+        return [row[1] for row in conn.execute(f"PRAGMA gourmand.table_info({table})")]
+
+    def _documents_query(self, conn: sqlite3.Connection) -> Tuple[str, bool]:
+        """Construit la requête extrayant les documents selon le schéma disponible.
+
+        Les bases Gourmand complètes ont des tables ``categories`` et
+        ``ingredients`` et une colonne ``last_modified`` ; les bases réduites
+        (tests, exports partiels) n'ont parfois que la table ``recipe``.
+
+        Returns
+        -------
+        tuple
+            Requête SQL et booléen indiquant si ``last_modified`` sert d'empreinte.
+        """
+        recipe_columns = self._columns(conn, "recipe")
+        instructions = "r.instructions" if "instructions" in recipe_columns else "''"
+        categories = "''"
+        if {"recipe_id", "category"} <= set(self._columns(conn, "categories")):
+            categories = ("(SELECT group_concat(c.category, ' ') FROM gourmand.categories c "
+                          "WHERE c.recipe_id = r.id)")
+        ingredients = "''"
+        if {"recipe_id", "item"} <= set(self._columns(conn, "ingredients")):
+            ingredients = ("(SELECT group_concat(i.item, ' ') FROM gourmand.ingredients i "
+                           "WHERE i.recipe_id = r.id)")
+        has_stamp = "last_modified" in recipe_columns
+        stamp = "r.last_modified" if has_stamp else "NULL"
+        where = "WHERE coalesce(r.deleted, 0) = 0" if "deleted" in recipe_columns else ""
+        query = (
+            f"SELECT r.id, {stamp}, coalesce(r.title, ''), coalesce({categories}, ''), "
+            f"coalesce({ingredients}, ''), coalesce({instructions}, '') "
+            f"FROM gourmand.recipe r {where}"
+        )
+        return query, has_stamp
+
+    def _recipes_stamp(self, conn: sqlite3.Connection) -> Optional[str]:
+        """Agrégat peu coûteux de la table ``recipe``, ou None sans colonne ``last_modified``.
+
+        Gourmand met ``last_modified`` à jour à chaque modification d'une recette
+        (titre, catégories, ingrédients, instructions) : tant que cet agrégat ne
+        change pas, aucune recette n'est à réindexer. Une écriture qui ne touche
+        que ``description`` (``marque_recette_faite``) le laisse inchangé.
+        """
+        recipe_columns = self._columns(conn, "recipe")
+        if "last_modified" not in recipe_columns:
+            return None
+        deleted = ", total(coalesce(deleted, 0))" if "deleted" in recipe_columns else ""
+        row = conn.execute(
+            f"SELECT count(*), max(id), max(last_modified){deleted} FROM gourmand.recipe"
+        ).fetchone()
+        return "/".join(str(value) for value in row)
+
+    def sync(self) -> int:
+        """Met l'index à jour si la base Gourmand a changé depuis la dernière synchronisation.
+
+        Returns
+        -------
+        int
+            Nombre de recettes réindexées ou retirées de l'index.
+        """
+        with self._lock:
+            conn = self._connect()
+            signature = database_signature(self.db_path)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+            if row and row[0] == signature:
+                return 0
+            if signature != self._attached_signature:
+                self._attach(conn, signature)
+            # Le fichier a changé : parcours complet seulement si une recette a pu changer
+            recipes_stamp = self._recipes_stamp(conn)
+            if recipes_stamp is not None:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'recipes'").fetchone()
+                if row and row[0] == recipes_stamp:
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (signature,))
+                    conn.commit()
+                    return 0
+
+            query, has_stamp = self._documents_query(conn)
+            stored: Dict[int, str] = dict(conn.execute("SELECT recipe_id, stamp FROM recipe_state"))
+            seen = set()
+            changed = []
+            for recipe_id, stamp, *fields in conn.execute(query):
+                if not has_stamp or stamp is None:
+                    stamp = hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+                stamp = str(stamp)
+                seen.add(recipe_id)
+                if stored.get(recipe_id) != stamp:
+                    changed.append((recipe_id, stamp, fields))
+            removed = [recipe_id for recipe_id in stored if recipe_id not in seen]
+
+            for recipe_id in removed:
+                conn.execute("DELETE FROM recipe_fts WHERE rowid = ?", (recipe_id,))
+                conn.execute("DELETE FROM recipe_state WHERE recipe_id = ?", (recipe_id,))
+            for recipe_id, stamp, fields in changed:
+                conn.execute("DELETE FROM recipe_fts WHERE rowid = ?", (recipe_id,))
+                conn.execute(
+                    "INSERT INTO recipe_fts (rowid, title, category, ingredients, instructions) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (recipe_id, *fields)
+                )
+                conn.execute("INSERT OR REPLACE INTO recipe_state (recipe_id, stamp) VALUES (?, ?)",
+                             (recipe_id, stamp))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (signature,))
+            if recipes_stamp is not None:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('recipes', ?)", (recipes_stamp,))
+            conn.commit()
+            if changed or removed:
+                logging.info(f"Index plein texte {self.index_path}: {len(changed)} recette(s) indexée(s), "
+                             f"{len(removed)} retirée(s)")
+            return len(changed) + len(removed)
+
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, float, str]]:
+        """Recherche des recettes classées par pertinence (bm25).
+
+        Parameters
+        ----------
+        text : str
+            Mots recherchés, en saisie libre.
+        limit : int
+            Nombre maximal de résultats.
+
+        Returns
+        -------
+        list
+            Tuples (titre, score, extrait) du plus au moins pertinent ; plus le
+            score est bas, plus la recette est pertinente.
+        """
+        match = build_match_query(text)
+        if match is None:
+            return []
+        self.sync()
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT title, bm25(recipe_fts, {weights}) AS score, "
+                "snippet(recipe_fts, -1, '[', ']', '…', 12) "
+                "FROM recipe_fts WHERE recipe_fts MATCH ? ORDER BY score LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        return [(title, score, snippet) for title, score, snippet in rows]
+
+    def close(self) -> None:
+        """Ferme la connexion à l'index."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._attached_signature = None
+
+
+_indexes: Dict[Tuple[str, str], RecipeSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(db_path: str, index_path: Optional[str] = None) -> RecipeSearchIndex:
+    """Retourne l'index plein texte du processus pour une base, créé au premier appel."""
+    index_path = index_path or default_index_path(db_path)
+    with _indexes_lock:
+        index = _indexes.get((db_path, index_path))
+        if index is None:
+            index = _indexes[(db_path, index_path)] = RecipeSearchIndex(db_path, index_path)
+        return index
+
+
+@on_config_reload
+def close_search_indexes() -> None:
+    """Ferme et oublie les index plein texte du processus (après un rechargement de la configuration)."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+        _indexes.clear()
+    for index in indexes:
+        index.close()
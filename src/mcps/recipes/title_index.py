@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Module providing the TitleIndex fuzzy title resolver.
+
+``marque_recette_faite`` exige le titre exact d'une recette ; une différence de
+casse ou d'accent suffit à faire échouer la mise à jour. Cet index garde en
+mémoire les titres de la base, normalisés (sans accents ni casse) et découpés
+en trigrammes, pour retrouver en un seul appel le titre canonique ou, à défaut,
+une liste de titres proches classés par similarité. Il n'est reconstruit que
+lorsque les titres ont pu changer : une modification du fichier de la base qui
+ne touche pas aux titres (date de réalisation écrite par ``marque_recette_faite``)
+est détectée par l'empreinte des titres, calculée en une requête, et ne
+déclenche pas de reconstruction.
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from mcps.recipes.database_manager import DatabaseManager, database_signature
+
+LIST_TITLES_QUERY = "SELECT DISTINCT title FROM recipe WHERE title IS NOT NULL"
+# Titres concaténés en une seule ligne, pour l'empreinte des titres
+TITLES_SIGNATURE_QUERY = "SELECT count(*), group_concat(title, char(31)) FROM recipe"
+
+# Similarité (coefficient de Dice sur les trigrammes) à partir de laquelle un
+# titre est retenu d'office, à condition de devancer nettement le suivant
+AUTO_RESOLVE_SCORE = 0.8
+AUTO_RESOLVE_MARGIN = 0.1
+# Au-delà de ce nombre de caractères à corriger (ou avec un mot en plus ou en
+# moins), le titre approché n'est que proposé : ``marque_recette_faite`` ne doit
+# pas mettre à jour une autre recette que celle nommée
+AUTO_RESOLVE_MAX_EDITS = 2
+# Similarité minimale d'un titre proposé comme candidat
+CANDIDATE_SCORE = 0.3
+
+_NON_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalise_title(title: str) -> str:
+    """Retire accents, casse et ponctuation d'un titre."""
+    decomposed = unicodedata.normalize("NFKD", title)
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+def trigrams(normalised: str) -> Set[str]:
+    """Trigrammes d'un titre normalisé, bordé d'espaces pour pondérer les débuts de mots."""
+    padded = f"  {normalised} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(first: str, second: str) -> int:
+    """Distance de Levenshtein entre deux chaînes (insertions, suppressions, substitutions)."""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        current = [i]
+        for j, other in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        previous = current
+    return previous[-1]
+
+
+def is_small_typo(typed: str, title: str) -> bool:
+    """Vrai si deux titres normalisés ont les mêmes mots à ``AUTO_RESOLVE_MAX_EDITS`` caractères près."""
+    return (len(typed.split()) == len(title.split())
+            and edit_distance(typed, title) <= AUTO_RESOLVE_MAX_EDITS)
+
+
+class TitleIndex:
+    """Index en mémoire des titres de recettes d'une base Gourmand."""
+
+    def __init__(self, db_path: str):
+        """
+        Parameters
+        ----------
+        db_path : str
+            Chemin de la base, dont la date de modification déclenche la reconstruction.
+        """
+        self.db_path = db_path
+        self._signature: Optional[str] = None
+        self._titles_signature: Optional[str] = None
+        self._titles: List[str] = []
+        self._by_normalised: Dict[str, List[str]] = {}
+        self._trigram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def titles_signature(db_manager: DatabaseManager) -> str:
+        """Empreinte qui ne change qu'avec les titres (ajout, suppression, renommage).
+
+        Une seule ligne est lue ; son condensé coûte bien moins que la
+        reconstruction des trigrammes.
+        """
+        row = db_manager.execute_query(TITLES_SIGNATURE_QUERY)[0]
+        digest = hashlib.blake2b(str(row[1] or "").encode("utf-8", errors="surrogatepass"), digest_size=16)
+        return f"{row[0]}:{digest.hexdigest()}"
+
+    def refresh(self, db_manager: DatabaseManager) -> bool:
+        """Recharge les titres si la base a changé depuis la dernière construction.
+
+        Parameters
+        ----------
+        db_manager : DatabaseManager
+            Gestionnaire déjà connecté à la base.
+
+        Returns
+        -------
+        bool
+            True si l'index a été reconstruit.
+        """
+        signature = database_signature(self.db_path)
+        with self._lock:
+            if signature == self._signature:
+                return False
+            # Le fichier a changé : reconstruction seulement si les titres ont changé
+            titles_signature = self.titles_signature(db_manager)
+            if titles_signature == self._titles_signature:
+                self._signature = None if signature.startswith("-") else signature
+                return False
+            titles = [row[0] for row in db_manager.execute_query(LIST_TITLES_QUERY)]
+            by_normalised: Dict[str, List[str]] = defaultdict(list)
+            postings: Dict[str, List[int]] = defaultdict(list)
+            counts = []
+            for position, title in enumerate(titles):
+                normalised = normalise_title(title)
+                by_normalised[normalised].append(title)
+                grams = trigrams(normalised)
+                counts.append(len(grams))
+                for gram in grams:
+                    postings[gram].append(position)
+            self._titles = titles
+            self._by_normalised = dict(by_normalised)
+            self._postings = dict(postings)
+            self._trigram_counts = counts
+            self._titles_signature = titles_signature
+            # Une base introuvable n'a pas de signature stable : elle sera relue au prochain appel
+            self._signature = None if signature.startswith("-") else signature
+            return True
+
+    def candidates(self, titre: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Titres les plus proches de ``titre``, du plus au moins similaire.
+
+        Returns
+        -------
+        list
+            Tuples (titre, similarité entre 0 et 1) au-dessus de ``CANDIDATE_SCORE``.
+        """
+        query = trigrams(normalise_title(titre))
+        with self._lock:
+            shared: Dict[int, int] = defaultdict(int)
+            for gram in query:
+                for position in self._postings.get(gram, ()):
+                    shared[position] += 1
+            scored = [
+                (self._titles[position], 2 * count / (len(query) + self._trigram_counts[position]))
+                for position, count in shared.items()
+            ]
+        scored = [entry for entry in scored if entry[1] >= CANDIDATE_SCORE]
+        scored.sort(key=lambda entry: (-entry[1], entry[0]))
+        return scored[:limit]
+
+    def resolve(self, titre: str, limit: int = 5) -> Tuple[Optional[str], List[str]]:
+        """Retrouve le titre canonique correspondant à une saisie approximative.
+
+        Parameters
+        ----------
+        titre : str
+            Titre saisi, éventuellement sans accents ou avec une autre casse.
+        limit : int
+            Nombre maximal de titres proposés quand la saisie est ambiguë.
+
+        Returns
+        -------
+        tuple
+            Titre canonique (ou None si aucun titre ne s'impose) et liste des
+            titres proches, classés par similarité décroissante. Hors accents et
+            casse, seule une faute d'au plus ``AUTO_RESOLVE_MAX_EDITS`` caractères,
+            sans mot ajouté ni retiré, est corrigée d'office.
+        """
+        with self._lock:
+            same = self._by_normalised.get(normalise_title(titre), [])
+        if titre in same:
+            return titre, [titre]
+        if len(same) == 1:
+            return same[0], same
+        if len(same) > 1:
+            return None, sorted(same)[:limit]
+
+        # Un titre approché n'est retenu que pour une petite faute de frappe
+        ranked = self.candidates(titre, limit)
+        titles = [title for title, _ in ranked]
+        if ranked and ranked[0][1] >= AUTO_RESOLVE_SCORE:
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if (ranked[0][1] - runner_up >= AUTO_RESOLVE_MARGIN
+                    and is_small_typo(normalise_title(titre), normalise_title(ranked[0][0]))):
+                return ranked[0][0], titles
+        return None, titles
+
+
+_indexes: Dict[str, TitleIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_title_index(db_path: str) -> TitleIndex:
+    """Retourne l'index de titres du processus pour une base, créé au premier appel."""
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = TitleIndex(db_path)
+        return index
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Annulation coopérative et délais d'exécution des outils.
+
+Le serveur associe un ``CancelToken`` à chaque appel d'outil. Le jeton est
+annulé par une notification ``notifications/cancelled`` du client ou expire
+quand le délai configuré pour l'outil est dépassé. Les traitements longs le
+consultent à intervalles réguliers (entre deux emails d'un mbox, pendant
+l'attente d'un sous-processus) et s'interrompent en levant ``Cancelled``.
+
+Le jeton de l'appel en cours est accessible par ``current_token()`` dans le
+thread qui exécute l'outil : les fonctions des outils n'ont pas à le recevoir
+en argument.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Cancelled(BaseException):
+    """Levée quand un traitement est annulé ou a dépassé son délai.
+
+    Comme ``asyncio.CancelledError``, elle dérive de ``BaseException`` pour
+    traverser les ``except Exception`` des outils sans être prise pour une erreur.
+    """
+
+    def __init__(self, reason: str = "requête annulée", timeout: bool = False):
+        super().__init__(reason)
+        self.reason = reason
+        self.timeout = timeout
+
+
+class CancelToken:
+    """Jeton d'annulation d'un appel, avec délai optionnel."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._deadline: Optional[float] = None
+        self.timeout: Optional[float] = None
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "requête annulée") -> None:
+        """Demande l'arrêt du traitement."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def set_timeout(self, seconds: Optional[float]) -> None:
+        """Fixe le délai d'exécution, compté à partir de maintenant (None : sans limite)."""
+        self.timeout = seconds
+        self._deadline = None if seconds is None else time.monotonic() + seconds
+
+    @property
+    def timed_out(self) -> bool:
+        """Le délai est-il dépassé ?"""
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """Le traitement doit-il s'arrêter (annulation ou délai dépassé) ?"""
+        return self._event.is_set() or self.timed_out
+
+    def remaining(self) -> Optional[float]:
+        """Secondes restantes avant l'échéance, ou None sans délai."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def check(self) -> None:
+        """Lève ``Cancelled`` si le traitement doit s'arrêter.
+
+        Raises
+        ------
+        Cancelled
+            Après une annulation, ou avec ``timeout=True`` si le délai est dépassé.
+        """
+        if self._event.is_set():
+            raise Cancelled(self.reason or "requête annulée")
+        if self.timed_out:
+            raise Cancelled(f"délai de {self.timeout:g} s dépassé", timeout=True)
+
+    def wait(self, seconds: float) -> bool:
+        """Attend au plus ``seconds`` secondes une annulation ou l'échéance.
+
+        Returns
+        -------
+        bool
+            True si le traitement doit s'arrêter.
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        return self._event.wait(seconds) or self.timed_out
+
+
+_current_token: ContextVar[Optional[CancelToken]] = ContextVar("mcps_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    """Jeton de l'appel d'outil en cours dans ce thread, ou None."""
+    return _current_token.get()
+
+
+@contextmanager
+def bind_token(token: Optional[CancelToken]) -> Iterator[Optional[CancelToken]]:
+    """Rend ``token`` accessible par ``current_token()`` le temps du bloc."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    """Lève ``Cancelled`` si l'appel en cours a été annulé ou a dépassé son délai."""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
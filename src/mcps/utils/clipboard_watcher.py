@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Surveillance du presse-papiers en tâche de fond.
+
+Un thread relit à intervalle régulier les sélections X (PRIMARY, CLIPBOARD) et
+garde en mémoire la dernière valeur de chacune, avec sa taille et son
+empreinte, ainsi qu'un historique court des sélections récentes. Les outils
+``prepare_synthese`` et ``gourmandise_recette`` lisent alors le presse-papiers
+en mémoire au lieu de lancer ``xclip`` à chaque appel.
+
+La source des sélections est une simple fonction ``source(selection) -> texte``
+: ``send_clipboard.lire_selection`` pour X11, ``StubSource`` pour les tests
+sans affichage.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Intervalle par défaut entre deux lectures des sélections, en secondes
+DEFAULT_INTERVAL = 0.5
+# Nombre de sélections récentes conservées
+DEFAULT_HISTORY = 10
+DEFAULT_SELECTIONS = ("primary", "clipboard")
+
+# Lecture d'une sélection : nom ("primary", "clipboard") -> texte, "" si elle est
+# vide, None si elle ne peut pas être lue
+SelectionSource = Callable[[str], Optional[str]]
+
+
+class Selection:
+    """Valeur d'une sélection à un instant donné."""
+
+    __slots__ = ("name", "text", "size", "digest", "timestamp")
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.size = len(text)
+        self.digest = hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+        self.timestamp = time.time()
+
+
+class StubSource:
+    """Source de sélections en mémoire, pour les tests et les postes sans X."""
+
+    def __init__(self, selections: Optional[Dict[str, str]] = None):
+        self.selections = dict(selections or {})
+
+    def set(self, name: str, text: Optional[str]) -> None:
+        """Remplace le contenu d'une sélection ("" : sélection vide, None : illisible)."""
+        self.selections[name] = text
+
+    def __call__(self, name: str) -> Optional[str]:
+        return self.selections.get(name)
+
+
+class ClipboardWatcher:
+    """Thread gardant en mémoire les dernières sélections et leur historique."""
+
+    def __init__(self, source: SelectionSource, selections: Iterable[str] = DEFAULT_SELECTIONS,
+                 interval: float = DEFAULT_INTERVAL, history: int = DEFAULT_HISTORY):
+        """
+        Parameters
+        ----------
+        source : callable
+            Lecture d'une sélection par son nom.
+        selections : iterable of str
+            Sélections surveillées.
+        interval : float
+            Délai entre deux lectures, en secondes.
+        history : int
+            Nombre de sélections récentes conservées, toutes sélections confondues.
+        """
+        self.source = source
+        self.selections = tuple(selections)
+        self.interval = interval
+        self._latest: Dict[str, Selection] = {}
+        self._history: deque = deque(maxlen=max(1, history))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll_once(self) -> List[Selection]:
+        """Relit chaque sélection et retourne celles qui ont changé.
+
+        Une sélection vidée n'a plus de dernière valeur ; une sélection illisible
+        garde la sienne.
+        """
+        changed = []
+        for name in self.selections:
+            try:
+                text = self.source(name)
+            except Exception as e:
+                logging.info(f"Lecture de la sélection {name} impossible : {e}")
+                continue
+            if text is None:
+                continue
+            if not text:
+                with self._lock:
+                    self._latest.pop(name, None)
+                continue
+            selection = Selection(name, text)
+            with self._lock:
+                previous = self._latest.get(name)
+                if previous is not None and previous.digest == selection.digest:
+                    continue
+                self._latest[name] = selection
+                self._history.append(selection)
+            changed.append(selection)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "ClipboardWatcher":
+        """Lance le thread de surveillance (sans effet s'il tourne déjà)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="mcp-clipboard", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête le thread de surveillance."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """Le thread de surveillance est-il actif ?"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self, name: str = "primary") -> Optional[Selection]:
+        """Dernière valeur connue d'une sélection, ou None."""
+        with self._lock:
+            return self._latest.get(name)
+
+    def recent(self) -> List[Selection]:
+        """Sélections récentes, de la plus récente à la plus ancienne."""
+        with self._lock:
+            return list(reversed(self._history))
+
+
+_watcher: Optional[ClipboardWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def current_watcher() -> Optional[ClipboardWatcher]:
+    """Surveillance active du processus, ou None."""
+    watcher = _watcher
+    return watcher if watcher is not None and watcher.running else None
+
+
+def install_watcher(watcher: Optional[ClipboardWatcher]) -> Optional[ClipboardWatcher]:
+    """Démarre ``watcher`` et en fait la surveillance du processus, en arrêtant la précédente.
+
+    None arrête la surveillance en cours.
+    """
+    global _watcher
+    with _watcher_lock:
+        previous, _watcher = _watcher, watcher
+    if previous is not None and previous is not watcher:
+        previous.stop()
+    if watcher is not None:
+        watcher.start()
+    return watcher
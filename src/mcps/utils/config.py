@@ -2,13 +2,104 @@
 """
 Module de configuration centralisée pour le projet MCP.
 Permet de charger et gérer la configuration depuis différents sources.
+
+La configuration chargée est figée dans un ``ConfigSnapshot`` : ses sections ne
+sont plus modifiables et chaque clé pointée (``"database.path"``) y est
+résolue une fois pour toutes au chargement. Un rechargement (``reload_config``,
+déclenché par ``kill -HUP`` ou par ``refresh_config`` quand le fichier a changé)
+construit un nouveau gestionnaire et le substitue d'un bloc à l'ancien : un
+appel en cours garde une configuration cohérente.
 """
 
 import logging
 import os
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Intervalle minimal par défaut entre deux vérifications du fichier de configuration, en secondes
+DEFAULT_CHECK_INTERVAL = 2.0
+
+_MISSING = object()
+
+class _FrozenDict(dict):
+    """Dictionnaire en lecture seule (sections d'un ``ConfigSnapshot``)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("la configuration est en lecture seule")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+def _freeze(value: Any) -> Any:
+    """Copie récursive en lecture seule : dictionnaires figés, listes en tuples."""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _flatten(section: Dict[Any, Any], prefix: Optional[str], values: Dict[str, Any]) -> None:
+    """Associe chaque chemin pointé de ``section`` à sa valeur.
+
+    Seules les clés textuelles sans point sont accessibles par un chemin, comme
+    dans un parcours section par section.
+    """
+    for key, value in section.items():
+        if not isinstance(key, str) or "." in key:
+            continue
+        path = key if prefix is None else f"{prefix}.{key}"
+        values[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path, values)
+
+def file_signature(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Date de modification (ns) et taille d'un fichier, ou None s'il est illisible."""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ConfigSnapshot:
+    """Configuration figée, avec ses clés pointées résolues au chargement."""
+
+    __slots__ = ("data", "path", "signature", "_values")
+
+    def __init__(self, data: Any, path: Optional[str] = None, signature: Optional[Tuple[int, int]] = None):
+        """
+        Parameters
+        ----------
+        data : dict
+            Configuration chargée ; elle est copiée en lecture seule.
+        path : str, optional
+            Fichier dont elle provient.
+        signature : tuple, optional
+            Signature du fichier lu (voir ``file_signature``).
+        """
+        frozen = _freeze(data)
+        values: Dict[str, Any] = {}
+        if isinstance(frozen, dict):
+            _flatten(frozen, None, values)
+        object.__setattr__(self, "data", frozen)
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "signature", signature)
+        object.__setattr__(self, "_values", values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot est immuable")
+
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """Valeur d'une clé pointée (``"database.path"``), ou ``default`` si absente."""
+        value = self._values.get(key_path, _MISSING)
+        return default if value is _MISSING else value
 
 class ConfigManager:
     """Gestionnaire de configuration centralisé."""
@@ -23,7 +114,20 @@ class ConfigManager:
             Chemin vers le fichier de configuration. Si None, cherche dans les emplacements par défaut.
         """
         self.config_path = config_path or self._find_config_file()
-        self.config = self._load_config()
+        # Erreur de lecture du fichier (configuration par défaut utilisée à la place), ou None
+        self.load_error: Optional[Exception] = None
+        # Signature relevée avant la lecture : une écriture concurrente sera vue au prochain contrôle
+        signature = file_signature(self.config_path)
+        self.snapshot = ConfigSnapshot(self._load_config(), self.config_path, signature)
+
+    @property
+    def config(self) -> Any:
+        """Configuration courante, en lecture seule."""
+        return self.snapshot.data
+
+    @config.setter
+    def config(self, value: Any) -> None:
+        self.snapshot = ConfigSnapshot(value, self.config_path, file_signature(self.config_path))
     
     def _find_config_file(self) -> Optional[str]:
         """
@@ -60,17 +164,26 @@ class ConfigManager:
         Returns
         -------
         dict
-            Configuration chargée, ou dictionnaire vide si erreur.
+            Configuration chargée, ou configuration par défaut si erreur
+            (l'erreur est alors conservée dans ``load_error``).
         """
-        if not self.config_path or not Path(self.config_path).exists():
+        if not self.config_path:
+            return self._get_default_config()
+        if not Path(self.config_path).exists():
+            self.load_error = FileNotFoundError(f"fichier de configuration absent : {self.config_path}")
             return self._get_default_config()
         
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                config = yaml.safe_load(f)
         except Exception as e:
             logging.info(f"⚠️  Erreur lors du chargement de la configuration: {e}")
+            self.load_error = e
             return self._get_default_config()
+        if not isinstance(config, dict):
+            # Fichier vide (en cours d'écriture) ou sans sections
+            self.load_error = ValueError(f"configuration vide ou invalide : {self.config_path}")
+        return config or {}
     
     def _get_default_config(self) -> Dict[str, Any]:
         """
@@ -113,15 +226,7 @@ class ConfigManager:
         any
             Valeur de la configuration ou la valeur par défaut.
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self.snapshot.get(key_path, default)
     
     def get_database_path(self) -> str:
         """
@@ -198,6 +303,102 @@ def get_config_value(key_path: str, default: Any = None) -> Any:
     """
     return get_config().get(key_path, default)
 
+# Fonctions appelées après chaque rechargement de la configuration
+_reload_callbacks: List[Callable[[], None]] = []
+
+def on_config_reload(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Enregistre une fonction à appeler après chaque rechargement de la configuration.
+
+    Sert aux modules qui gardent des valeurs dérivées de la configuration
+    (réponses pré-sérialisées, caches) pour les invalider. Utilisable comme décorateur.
+
+    Parameters
+    ----------
+    callback : callable
+        Fonction sans argument.
+
+    Returns
+    -------
+    callable
+        La fonction, inchangée.
+    """
+    _reload_callbacks.append(callback)
+    return callback
+
+def reload_config() -> ConfigManager:
+    """
+    Relit le fichier de configuration et prévient les modules abonnés.
+
+    Si le fichier est absent, vide ou illisible (enregistrement en cours,
+    erreur YAML), la configuration courante est conservée et les abonnés ne
+    sont pas prévenus.
+
+    Returns
+    -------
+    ConfigManager
+        Nouvelle instance du gestionnaire de configuration, ou l'instance
+        courante si le fichier n'a pas pu être relu.
+    """
+    global _config_manager
+    with _reload_lock:
+        previous = _config_manager
+        config_path = previous.config_path if previous is not None else None
+        # Le nouveau gestionnaire est complet avant de remplacer l'ancien
+        manager = ConfigManager(config_path)
+        if previous is not None and manager.load_error is not None:
+            logging.info(f"Configuration non rechargée, la précédente est conservée : {manager.load_error}")
+            return previous
+        _config_manager = manager
+    for callback in list(_reload_callbacks):
+        try:
+            callback()
+        except Exception as e:
+            logging.info(f"Erreur lors de la notification du rechargement de la configuration: {e}")
+    return manager
+
+_reload_lock = threading.Lock()
+# Date (monotone) de la dernière vérification du fichier de configuration
+_last_check = 0.0
+# Signature du dernier fichier illisible : il n'est relu qu'une fois modifié
+_failed_signature: Optional[Tuple[int, int]] = None
+
+def refresh_config(min_interval: float = DEFAULT_CHECK_INTERVAL) -> bool:
+    """
+    Recharge la configuration si son fichier a changé depuis sa lecture.
+
+    Le fichier n'est examiné (``os.stat``) qu'une fois par ``min_interval``
+    secondes au plus ; un intervalle nul ou négatif désactive la vérification.
+
+    Parameters
+    ----------
+    min_interval : float
+        Délai minimal entre deux vérifications, en secondes.
+
+    Returns
+    -------
+    bool
+        True si la configuration a été rechargée.
+    """
+    global _last_check, _failed_signature
+    if min_interval <= 0:
+        return False
+    now = time.monotonic()
+    if now - _last_check < min_interval:
+        return False
+    _last_check = now
+    snapshot = getattr(get_config(), "snapshot", None)
+    if not isinstance(snapshot, ConfigSnapshot) or not snapshot.path:
+        return False
+    signature = file_signature(snapshot.path)
+    if signature is None or signature in (snapshot.signature, _failed_signature):
+        return False
+    logging.info(f"Fichier de configuration modifié, rechargement : {snapshot.path}")
+    if reload_config().snapshot is snapshot:
+        _failed_signature = signature
+        return False
+    return True
+
 # Exemple d'utilisation :
 # db_path = get_config_value("database.path", "~/.local/share/gourmand/recipes.db")
 # env_vars = get_config().get_environment_vars()    return get_config().get(key_path, default)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Notifications de progression des appels d'outils.
+
+Quand un client joint un ``progressToken`` à sa requête ``tools/call``
+(``params._meta.progressToken``), le serveur associe à l'appel un
+``ProgressReporter`` qui émet des notifications ``notifications/progress``.
+Comme le jeton d'annulation (voir ``mcps.utils.cancellation``), il est
+accessible par ``current_reporter()`` dans le thread qui exécute l'outil :
+les traitements longs signalent leur avancement sans connaître le serveur.
+
+Les avancements sont regroupés (au plus une notification par
+``min_interval`` secondes) ; les résultats partiels sont toujours envoyés.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+# Intervalle minimal entre deux notifications d'avancement, en secondes
+DEFAULT_MIN_INTERVAL = 0.25
+
+# Envoi d'une notification : (progression, total, message)
+ProgressSender = Callable[[float, Optional[float], Optional[str]], None]
+
+
+class ProgressReporter:
+    """Émetteur de notifications de progression d'un appel d'outil."""
+
+    def __init__(self, send: ProgressSender, min_interval: float = DEFAULT_MIN_INTERVAL):
+        """
+        Parameters
+        ----------
+        send : callable
+            Fonction envoyant la notification ``(progress, total, message)``.
+        min_interval : float
+            Délai minimal entre deux avancements envoyés, en secondes.
+        """
+        self._send = send
+        self.min_interval = min_interval
+        self._last_progress: Optional[float] = None
+        self._last_sent = float("-inf")
+        self._lock = threading.Lock()
+
+    def report(self, progress: float, total: Optional[float] = None,
+               message: Optional[str] = None, force: bool = False) -> bool:
+        """Signale l'avancement du traitement.
+
+        La progression doit croître d'une notification à l'autre : une valeur
+        déjà signalée est ignorée, de même qu'un avancement arrivé moins de
+        ``min_interval`` secondes après le précédent (sauf ``force``).
+
+        Returns
+        -------
+        bool
+            True si une notification a été envoyée.
+        """
+        with self._lock:
+            if self._last_progress is not None and progress <= self._last_progress:
+                return False
+            now = time.monotonic()
+            if not force and now - self._last_sent < self.min_interval:
+                return False
+            self._last_progress = progress
+            self._last_sent = now
+        self._send(progress, total, message)
+        return True
+
+    def partial(self, progress: float, text: str, total: Optional[float] = None) -> bool:
+        """Envoie un résultat partiel (``message`` de la notification), sans regroupement."""
+        return self.report(progress, total, text, force=True)
+
+
+_current_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("mcps_progress", default=None)
+
+
+def current_reporter() -> Optional[ProgressReporter]:
+    """Émetteur de progression de l'appel d'outil en cours, ou None si le client n'en a pas demandé."""
+    return _current_reporter.get()
+
+
+@contextmanager
+def bind_reporter(reporter: Optional[ProgressReporter]) -> Iterator[Optional[ProgressReporter]]:
+    """Rend ``reporter`` accessible par ``current_reporter()`` le temps du bloc."""
+    reset = _current_reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current_reporter.reset(reset)
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Signale l'avancement de l'appel en cours ; sans effet si aucune progression n'est suivie."""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.report(progress, total, message)
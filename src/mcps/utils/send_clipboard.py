@@ -4,6 +4,11 @@ import os
 import subprocess
 import shutil
 import json
+import threading
+import time
+
+from mcps.utils.cancellation import current_token
+from mcps.utils.clipboard_watcher import ClipboardWatcher, current_watcher, install_watcher
 
 PROMPT_SYNTHESE = """
 **OBJECTIF**: réaliser la synthèse d’un texte.
@@ -29,74 +34,236 @@ L'objectif est de permettre au lecteur de comprendre rapidement le contenu du te
 
 """
 
+def _run(args, env=None, timeout=5):
+    """Exécute une commande comme ``subprocess.run`` (sortie capturée, texte).
+
+    Pendant un appel d'outil, l'attente est découpée en tranches courtes pour
+    consulter le jeton d'annulation : un ``xclip`` bloqué est tué dès que
+    l'appel est annulé ou dépasse son délai.
+    """
+    token = current_token()
+    if token is None:
+        return subprocess.run(args, capture_output=True, text=True, env=env, timeout=timeout)
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=0.1)
+            return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+        except subprocess.TimeoutExpired:
+            if token.cancelled or time.monotonic() >= deadline:
+                proc.kill()
+                proc.communicate()
+                token.check()
+                raise subprocess.TimeoutExpired(args, timeout)
+
+# Variables d'affichage validées par ``xset q`` (DISPLAY, XAUTHORITY), réutilisées
+# d'un appel à l'autre ; None tant qu'aucun affichage n'a été validé
+_display_env = None
+_display_lock = threading.Lock()
+# Sans affichage, l'échec de la détection est gardé PROBE_BACKOFF secondes : la
+# surveillance du presse-papiers ne relance pas /proc et ``xset q`` à chaque lecture
+PROBE_BACKOFF = 30.0
+_display_failure = None
+_display_retry_at = 0.0
+
+def _x_server_from_proc():
+    """Cherche un serveur X dans /proc : (DISPLAY, fichier d'autorisation) ou (None, None)."""
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                args = f.read().decode('utf-8', errors='replace').split('\0')
+        except OSError:
+            continue
+        if not args or not ('Xorg' in args[0] or args[0] == '/usr/bin/X'):
+            continue
+        display = xauthority = None
+        for i, arg in enumerate(args):
+            if arg.startswith(':') and arg[1:].split('.')[0].isdigit():
+                display = arg
+            elif arg == '-auth' and i + 1 < len(args):
+                xauthority = args[i + 1]
+        return display, xauthority
+    return None, None
+
+def _x_server_from_ps():
+    """Cherche le DISPLAY d'un serveur X dans la sortie de ``ps aux`` (sans /proc)."""
+    result = _run(['ps', 'aux'], timeout=2)
+    # Chercher une ligne avec Xorg ou X11
+    for line in result.stdout.split('\n'):
+        if 'Xorg' in line or '/usr/bin/X' in line:
+            # Extraire le display (généralement après "vt" ou seul)
+            for part in line.split():
+                if part.startswith(':') and part[1:].split('.')[0].isdigit():
+                    return part
+            break
+    return None
+
+def _probe_display_env():
+    """Détermine DISPLAY et XAUTHORITY à partir de l'environnement et des serveurs X actifs."""
+    env = {}
+    display = os.environ.get('DISPLAY')
+    xauthority = os.environ.get('XAUTHORITY')
+    # Si DISPLAY n'est pas défini ou est :0, essayer de le détecter
+    if not display or display == ':0':
+        # Méthode 1: depuis /tmp/.X11-unix/
+        try:
+            x_sockets = os.listdir('/tmp/.X11-unix/')
+            if x_sockets:
+                # Prendre le premier display trouvé (ex: X0 -> :0)
+                display = x_sockets[0].replace('X', ':')
+        except OSError:
+            pass
+        # Méthode 2: depuis les processus actifs (ligne de commande du serveur X)
+        if not display or display == ':0':
+            try:
+                if os.path.isdir('/proc'):
+                    found, auth = _x_server_from_proc()
+                    xauthority = xauthority or auth
+                else:
+                    found = _x_server_from_ps()
+                display = found or display
+            except Exception:
+                pass
+    if not xauthority:
+        default_auth = os.path.expanduser('~/.Xauthority')
+        if os.path.isfile(default_auth):
+            xauthority = default_auth
+    if display:
+        env['DISPLAY'] = display
+    if xauthority:
+        env['XAUTHORITY'] = xauthority
+    return env
+
+def _validated_display_env(refresh=False):
+    """Retourne (variables d'affichage, erreur), en ne sondant l'affichage qu'une fois.
+
+    La détection et le test ``xset q`` ne sont refaits que si ``refresh`` est
+    vrai, c'est-à-dire après un échec de ``xclip`` avec les variables en cache.
+    Un échec est lui aussi gardé en cache ``PROBE_BACKOFF`` secondes.
+    """
+    global _display_env, _display_failure, _display_retry_at
+    with _display_lock:
+        if _display_env is not None and not refresh:
+            return _display_env, None
+        if _display_failure is not None and not refresh and time.monotonic() < _display_retry_at:
+            return _display_failure
+        _display_env = None
+        display_env = _probe_display_env()
+        # Tester la connexion X11
+        test_result = _run(['xset', 'q'], env={**os.environ, **display_env}, timeout=2)
+        if test_result.returncode != 0:
+            _display_failure = (display_env, f"Erreur X11 avec DISPLAY={display_env.get('DISPLAY')}: {test_result.stderr}")
+            _display_retry_at = time.monotonic() + PROBE_BACKOFF
+            return _display_failure
+        _display_env = display_env
+        _display_failure = None
+        return display_env, None
+
+# Messages de xclip signalant un affichage injoignable ou refusé (session X relancée)
+_DISPLAY_ERRORS = ("can't open display", "cannot open display", "authorization required",
+                   "no protocol specified", "invalid mit-magic-cookie", "connection refused")
+
+def _is_display_error(stderr):
+    """Vrai si ``xclip`` a échoué faute de pouvoir joindre l'affichage X."""
+    message = (stderr or "").lower()
+    return any(error in message for error in _DISPLAY_ERRORS)
+
+def _is_empty_selection(result):
+    """Vrai si ``xclip`` a échoué parce que la sélection est vide ("target STRING not available")."""
+    return result.returncode != 0 and "not available" in (result.stderr or "").lower()
+
+def _read_selection(xclip_path, name):
+    """Lit une sélection avec ``xclip`` : (résultat, erreur X11 éventuelle).
+
+    Si ``xclip`` ne peut plus joindre l'affichage en cache, l'affichage est
+    sondé de nouveau et la lecture retentée une fois. Les autres échecs (une
+    sélection vide, notamment) ne remettent pas le cache en cause.
+    """
+    with _display_lock:
+        cached = _display_env is not None
+    display_env, error = _validated_display_env()
+    if error:
+        return None, error
+    args = [xclip_path, '-selection', name, '-o']
+    result = _run(args, env={**os.environ, **display_env}, timeout=5)
+    if result.returncode != 0 and cached and _is_display_error(result.stderr):
+        # L'affichage en cache n'est plus valable (session relancée) : nouvelle détection
+        display_env, error = _validated_display_env(refresh=True)
+        if error:
+            return None, error
+        result = _run(args, env={**os.environ, **display_env}, timeout=5)
+    return result, None
+
+def lire_selection(name):
+    """Source X11 de la surveillance du presse-papiers.
+
+    Retourne le texte d'une sélection, une chaîne vide si elle est vide, ou None
+    si elle ne peut pas être lue (pas de ``xclip``, pas d'affichage).
+    """
+    xclip_path = shutil.which('xclip')
+    if not xclip_path:
+        return None
+    result, error = _read_selection(xclip_path, name)
+    if error:
+        return None
+    if result.returncode != 0:
+        return "" if _is_empty_selection(result) else None
+    return result.stdout
+
+def start_clipboard_watcher(interval=None, history=None, source=None):
+    """Lance la surveillance du presse-papiers en tâche de fond.
+
+    Parameters
+    ----------
+    interval : float, optional
+        Délai entre deux lectures des sélections, en secondes.
+    history : int, optional
+        Nombre de sélections récentes conservées.
+    source : callable, optional
+        Source des sélections ; par défaut ``lire_selection`` (X11).
+
+    Returns
+    -------
+    ClipboardWatcher
+        Surveillance démarrée.
+    """
+    options = {}
+    if interval is not None:
+        options["interval"] = float(interval)
+    if history is not None:
+        options["history"] = int(history)
+    return install_watcher(ClipboardWatcher(source or lire_selection, **options))
+
 def recuperer_texte_du_presse_papier():
+    """Récupère la sélection PRIMARY, encodée en JSON.
+
+    Si la surveillance du presse-papiers est active, la dernière sélection
+    connue est servie depuis la mémoire. Sinon, l'affichage X est détecté et
+    validé au premier appel puis mis en cache : les appels suivants se
+    réduisent à un seul ``xclip``.
+    """
+    watcher = current_watcher()
+    if watcher is not None:
+        latest = watcher.latest("primary")
+        if latest is not None:
+            return json.dumps(latest.text, ensure_ascii=False)
     try:
         xclip_path = shutil.which('xclip')
         if not xclip_path:
             raise RuntimeError("xclip n'est pas disponible")
-        
-        env = os.environ.copy()
-        
-        # Si DISPLAY n'est pas défini ou est :0, essayer de le détecter
-        if not env.get('DISPLAY') or env.get('DISPLAY') == ':0':
-            # Chercher les displays actifs
-            try:
-                # Méthode 1: depuis /tmp/.X11-unix/
-                x_sockets = os.listdir('/tmp/.X11-unix/')
-                if x_sockets:
-                    # Prendre le premier display trouvé (ex: X0 -> :0)
-                    display_num = x_sockets[0].replace('X', ':')
-                    env['DISPLAY'] = display_num
-            except:
-                pass
-            
-            # Méthode 2: depuis les processus actifs de USER A
-            if not env.get('DISPLAY') or env['DISPLAY'] == ':0':
-                try:
-                    result = subprocess.run(
-                        ['ps', 'aux'],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    # Chercher une ligne avec Xorg ou X11
-                    for line in result.stdout.split('\n'):
-                        if 'Xorg' in line or '/usr/bin/X' in line:
-                            # Extraire le display (généralement après "vt" ou seul)
-                            parts = line.split()
-                            for i, part in enumerate(parts):
-                                if part.startswith(':') and part[1:].split('.')[0].isdigit():
-                                    env['DISPLAY'] = part
-                                    break
-                            break
-                except:
-                    pass
-        
-        # Tester la connexion X11
-        test_result = subprocess.run(
-            ['xset', 'q'],
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=2
-        )
-        
-        if test_result.returncode != 0:
-            return json.dumps(f"Erreur X11 avec DISPLAY={env.get('DISPLAY')}: {test_result.stderr}")
-        
+
         # Récupérer le clipboard
-        result = subprocess.run(
-            [xclip_path, '-selection', 'primary', '-o'],
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=5
-        )
-        
-        if result.returncode != 0:
+        result, error = _read_selection(xclip_path, 'primary')
+        if error:
+            return json.dumps(error)
+
+        if result.returncode != 0 and not _is_empty_selection(result):
             return json.dumps(f"Erreur xclip: {result.stderr}")
         
-        if not result.stdout:
+        if result.returncode != 0 or not result.stdout:
             return json.dumps("Presse-papiers PRIMARY vide")
         
         return json.dumps(result.stdout, ensure_ascii=False)
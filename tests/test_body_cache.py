@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for the body_cache module."""
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+import mcps.email_processing.jsonise as jsonise
+from mcps.email_processing.body_cache import BodyCache, get_body_cache
+
+
+class TestBodyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'bodies.sqlite')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_put_get_and_persistence(self):
+        """Test qu'un corps ajouté est relu, avant comme après enregistrement"""
+        cache = BodyCache(self.path)
+        self.assertIsNone(cache.get('k1'))
+        cache.put('k1', 'corps nettoyé')
+        self.assertEqual(cache.get('k1'), 'corps nettoyé')
+        cache.close()
+
+        reopened = BodyCache(self.path)
+        self.assertEqual(reopened.get('k1'), 'corps nettoyé')
+        self.assertEqual(len(reopened), 1)
+        reopened.close()
+
+    def test_lru_eviction(self):
+        """Test que les corps les moins récemment utilisés sont supprimés au-delà de la taille maximale"""
+        cache = BodyCache(self.path, max_bytes=25)
+        for key in ('a', 'b'):
+            cache.put(key, key * 10)
+            cache.flush()
+        # 'a' est relu : 'b' devient le moins récemment utilisé
+        self.assertEqual(cache.get('a'), 'a' * 10)
+        cache.put('c', 'c' * 10)
+        cache.flush()
+
+        self.assertEqual(cache.get('a'), 'a' * 10)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'c' * 10)
+        cache.close()
+
+    def test_pickle_drops_connection(self):
+        """Test que le cache transmis aux processus du pool ne garde que sa configuration"""
+        cache = BodyCache(self.path, max_bytes=123)
+        cache.put('k', 'v')
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((copy.path, copy.max_bytes), (self.path, 123))
+        self.assertIsNone(copy.get('k'))
+        cache.close()
+
+    def test_email_to_dict_skips_cleaning_on_hit(self):
+        """Test qu'un corps en cache n'est ni décodé ni nettoyé de nouveau"""
+        msg = MIMEMultipart()
+        msg['Subject'] = 'Lettre'
+        msg.attach(MIMEText('<html><body><p>Nouvelles du mois</p></body></html>', 'html'))
+        cache = BodyCache(self.path)
+
+        first = jsonise.email_to_dict(msg, cache)
+        cache.flush()
+        with patch('mcps.email_processing.jsonise.clean_message') as mock_clean:
+            second = jsonise.email_to_dict(msg, cache)
+
+        mock_clean.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIn('Nouvelles du mois', second['body'])
+        cache.close()
+
+    def test_cleaner_version_changes_key(self):
+        """Test que la version du nettoyage fait partie de la clé"""
+        part = MIMEText('Bonjour', 'plain')
+        key = jsonise.body_key(part)
+        self.assertEqual(key, jsonise.body_key(MIMEText('Bonjour', 'plain')))
+        with patch('mcps.email_processing.jsonise.CLEANER_VERSION', 'autre'):
+            self.assertNotEqual(key, jsonise.body_key(part))
+
+    def test_presummary_settings_change_key(self):
+        """Test que les réglages du pré-résumé font partie de la clé, sauf s'il est désactivé"""
+        part = MIMEText('Bonjour', 'plain')
+        key = jsonise.body_key(part)
+        self.assertEqual(key, jsonise.body_key(part, (0, 250)))
+        self.assertNotEqual(key, jsonise.body_key(part, (600, 250)))
+        self.assertNotEqual(jsonise.body_key(part, (600, 250)), jsonise.body_key(part, (600, 100)))
+
+    def test_process_pool_shares_cache(self):
+        """Test que les processus du pool alimentent le même cache"""
+        raw_messages = [MIMEText(f'Message {i}', 'plain').as_bytes() for i in range(4)]
+        cache = BodyCache(self.path)
+
+        results = list(jsonise.process_raw_messages(raw_messages, workers=2, chunksize=2, body_cache=cache))
+
+        self.assertEqual([r['body'] for r in results], [f'Message {i}' for i in range(4)])
+        self.assertEqual(len(cache), 4)
+        cache.close()
+
+
+    def test_config_reload_flushes_and_forgets_caches(self):
+        """Test qu'un rechargement de la configuration enregistre puis oublie les caches du processus"""
+        from mcps.utils import config
+
+        cache = get_body_cache(self.path)
+        cache.put('clé', 'corps')
+        with patch.object(config, 'ConfigManager') as mock_manager_class:
+            mock_manager_class.return_value.load_error = None
+            config.reload_config()
+        self.addCleanup(setattr, config, '_config_manager', None)
+
+        self.assertIsNot(get_body_cache(self.path), cache)
+        self.assertEqual(BodyCache(self.path).get('clé'), 'corps')
+        get_body_cache(self.path).close()
+
+if __name__ == '__main__':
+    unittest.main()
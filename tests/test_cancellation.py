@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the cancellation module."""
+import sys
+import threading
+import time
+
+import pytest
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.utils.cancellation import CancelToken, Cancelled, bind_token, check_cancelled, current_token
+
+
+def test_cancel_token_cancel():
+    """Test that a cancelled token raises Cancelled with its reason."""
+    token = CancelToken()
+    token.check()
+    assert not token.cancelled
+
+    token.cancel("plus besoin")
+
+    assert token.cancelled
+    with pytest.raises(Cancelled) as info:
+        token.check()
+    assert info.value.reason == "plus besoin"
+    assert not info.value.timeout
+
+
+def test_cancel_token_timeout():
+    """Test that an expired deadline raises Cancelled flagged as a timeout."""
+    token = CancelToken()
+    token.set_timeout(0.01)
+    assert token.remaining() <= 0.01
+    time.sleep(0.02)
+
+    assert token.timed_out
+    with pytest.raises(Cancelled) as info:
+        token.check()
+    assert info.value.timeout
+
+
+def test_cancelled_is_not_an_ordinary_error():
+    """Test that Cancelled passes through ``except Exception`` blocks."""
+    def tool():
+        try:
+            raise Cancelled()
+        except Exception:
+            return "avalée"
+
+    with pytest.raises(Cancelled):
+        tool()
+
+
+def test_wait_returns_on_cancel():
+    """Test that wait wakes up as soon as the token is cancelled."""
+    token = CancelToken()
+    threading.Timer(0.02, token.cancel).start()
+
+    start = time.monotonic()
+    assert token.wait(5)
+    assert time.monotonic() - start < 1
+
+
+def test_bind_token():
+    """Test that the bound token is visible only inside the block."""
+    token = CancelToken()
+    assert current_token() is None
+
+    with bind_token(token):
+        assert current_token() is token
+        check_cancelled()
+        token.cancel()
+        with pytest.raises(Cancelled):
+            check_cancelled()
+
+    assert current_token() is None
+    check_cancelled()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for the clipboard_watcher module."""
+import json
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.utils.clipboard_watcher import ClipboardWatcher, StubSource, current_watcher, install_watcher
+from mcps.utils.send_clipboard import recuperer_texte_du_presse_papier, start_clipboard_watcher
+
+
+@pytest.fixture(autouse=True)
+def no_watcher():
+    """Leave no watcher running between tests."""
+    yield
+    install_watcher(None)
+
+
+def test_poll_once_keeps_latest_and_history():
+    """Test that only changed selections are recorded, newest first in the history."""
+    source = StubSource({"primary": "premier"})
+    watcher = ClipboardWatcher(source, history=2)
+
+    assert [s.text for s in watcher.poll_once()] == ["premier"]
+    assert watcher.poll_once() == []
+
+    source.set("clipboard", "copié")
+    source.set("primary", "second")
+    watcher.poll_once()
+
+    latest = watcher.latest("primary")
+    assert latest.text == "second"
+    assert latest.size == len("second")
+    assert len(latest.digest) == 32
+    assert [s.text for s in watcher.recent()] == ["copié", "second"]
+
+
+def test_unreadable_or_failing_source_is_ignored():
+    """Test that an unreadable selection or a failing source leaves the last value in place."""
+    source = StubSource({"primary": "texte"})
+    watcher = ClipboardWatcher(source, selections=["primary"])
+    watcher.poll_once()
+
+    source.set("primary", None)
+    watcher.poll_once()
+    assert watcher.latest().text == "texte"
+
+    def broken(name):
+        raise OSError("pas d'affichage")
+    watcher.source = broken
+    assert watcher.poll_once() == []
+    assert watcher.latest().text == "texte"
+
+
+def test_emptied_selection_is_cleared():
+    """Test that an emptied selection no longer has a latest value, while the history is kept."""
+    source = StubSource({"primary": "texte"})
+    watcher = ClipboardWatcher(source, selections=["primary"])
+    watcher.poll_once()
+
+    source.set("primary", "")
+    assert watcher.poll_once() == []
+    assert watcher.latest() is None
+    assert [s.text for s in watcher.recent()] == ["texte"]
+
+
+def test_background_thread_follows_changes():
+    """Test that the running watcher picks up a new selection by itself."""
+    source = StubSource({"primary": "avant"})
+    watcher = install_watcher(ClipboardWatcher(source, interval=0.01))
+    assert current_watcher() is watcher
+
+    source.set("primary", "après")
+    deadline = time.monotonic() + 2
+    while watcher.latest().text != "après" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert watcher.latest().text == "après"
+    install_watcher(None)
+    assert not watcher.running
+    assert current_watcher() is None
+
+
+def test_clipboard_tool_answers_from_memory():
+    """Test that the clipboard reader uses the watcher instead of running xclip."""
+    start_clipboard_watcher(interval=60, source=StubSource({"primary": "Texte à résumer"}))
+    deadline = time.monotonic() + 2
+    while current_watcher().latest() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with patch('mcps.utils.send_clipboard._run') as mock_run:
+        text = recuperer_texte_du_presse_papier()
+
+    mock_run.assert_not_called()
+    assert json.loads(text) == "Texte à résumer"
@@ -5,7 +5,7 @@ from pathlib import Path
 from unittest.mock import patch, mock_open, MagicMock
 import yaml
 
-from mcps.utils.config import ConfigManager, get_config, get_config_value
+from mcps.utils.config import ConfigManager, ConfigSnapshot, get_config, get_config_value, on_config_reload, refresh_config, reload_config
 
 class TestConfigManager(unittest.TestCase):
 
@@ -227,5 +227,152 @@ class TestConfigManager(unittest.TestCase):
             self.assertEqual(result, 'test_value')
             mock_manager.get.assert_called_once_with('test.key', 'default')
 
+    def test_reload_config_notifies_subscribers(self):
+        """Test que reload_config relit le même fichier et prévient les abonnés"""
+        import mcps.utils.config
+        mcps.utils.config._config_manager = MagicMock(config_path='/chemin/config.yaml')
+        self.addCleanup(setattr, mcps.utils.config, '_config_manager', None)
+        calls = []
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+
+        with patch.object(mcps.utils.config, '_reload_callbacks', []):
+            on_config_reload(failing)
+            on_config_reload(lambda: calls.append(get_config()))
+            with patch('mcps.utils.config.ConfigManager') as mock_manager_class:
+                mock_manager_class.return_value.load_error = None
+                result = reload_config()
+
+        mock_manager_class.assert_called_once_with('/chemin/config.yaml')
+        self.assertEqual(calls, [result])
+        failing.assert_called_once_with()
+
+    def test_snapshot_lookups_match_nested_walk(self):
+        """Test que les clés pointées précalculées se comportent comme un parcours des sections"""
+        snapshot = ConfigSnapshot({
+            'server': {'timeouts': {'default': 5}, 'name': None},
+            'liste': [1, 2],
+            'a.b': 'inaccessible',
+            3: 'clé non textuelle',
+        })
+
+        self.assertEqual(snapshot.get('server.timeouts.default'), 5)
+        self.assertEqual(snapshot.get('server.timeouts'), {'default': 5})
+        self.assertIsNone(snapshot.get('server.name', 'défaut'))
+        self.assertEqual(snapshot.get('liste'), (1, 2))
+        self.assertEqual(snapshot.get('liste.0', 'défaut'), 'défaut')
+        self.assertEqual(snapshot.get('a.b', 'défaut'), 'défaut')
+        self.assertEqual(snapshot.get('3', 'défaut'), 'défaut')
+        self.assertEqual(ConfigSnapshot(['pas', 'un', 'dict']).get('pas', 'défaut'), 'défaut')
+
+    def test_snapshot_is_immutable(self):
+        """Test que la configuration figée ne peut être modifiée, mais reste copiable"""
+        import copy
+        import pickle
+
+        source = {'mbox': {'path': '~/Mail'}}
+        manager = ConfigManager()
+        manager.config = source
+        source['mbox']['path'] = '/ailleurs'
+
+        self.assertEqual(manager.get('mbox.path'), '~/Mail')
+        self.assertIsInstance(manager.get('mbox'), dict)
+        with self.assertRaises(TypeError):
+            manager.get('mbox')['path'] = '/autre'
+        with self.assertRaises(TypeError):
+            manager.config.update({'database': {}})
+        with self.assertRaises(AttributeError):
+            manager.snapshot.data = {}
+        self.assertEqual(pickle.loads(pickle.dumps(manager.config)), {'mbox': {'path': '~/Mail'}})
+        self.assertEqual(copy.deepcopy(manager.get('mbox')), {'path': '~/Mail'})
+
+    def test_refresh_config_reloads_modified_file(self):
+        """Test que refresh_config recharge la configuration quand le fichier change, et seulement alors"""
+        import mcps.utils.config
+        self.addCleanup(setattr, mcps.utils.config, '_config_manager', None)
+        calls = []
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = os.path.join(tmpdir, 'config.yaml')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                f.write('mbox:\n  SRC: "a.mbox"\n')
+            mcps.utils.config._config_manager = ConfigManager(config_path)
+            before = get_config()
+
+            with patch.object(mcps.utils.config, '_reload_callbacks', []), \
+                 patch.object(mcps.utils.config, '_last_check', 0.0):
+                on_config_reload(lambda: calls.append(get_config_value('mbox.SRC')))
+                self.assertFalse(refresh_config(0.001))
+                self.assertFalse(refresh_config(0))
+
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    f.write('mbox:\n  SRC: "bb.mbox"\n')
+                # Vérification espacée : le changement n'est vu qu'une fois l'intervalle écoulé
+                self.assertFalse(refresh_config(3600))
+                mcps.utils.config._last_check = 0.0
+                self.assertTrue(refresh_config(0.001))
+
+        self.assertIsNot(get_config(), before)
+        self.assertEqual(before.get('mbox.SRC'), 'a.mbox')
+        self.assertEqual(get_config_value('mbox.SRC'), 'bb.mbox')
+        self.assertEqual(calls, ['bb.mbox'])
+
+    def test_reload_keeps_current_config_when_file_is_broken(self):
+        """Test qu'un fichier illisible, vide ou absent ne remplace pas la configuration en service"""
+        import mcps.utils.config
+        self.addCleanup(setattr, mcps.utils.config, '_config_manager', None)
+        calls = []
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = os.path.join(tmpdir, 'config.yaml')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                f.write('database:\n  path: "/data/recipes.db"\n')
+            mcps.utils.config._config_manager = ConfigManager(config_path)
+            current = get_config()
+
+            with patch.object(mcps.utils.config, '_reload_callbacks', []), \
+                 patch.object(mcps.utils.config, '_last_check', 0.0), \
+                 patch.object(mcps.utils.config, '_failed_signature', None):
+                on_config_reload(lambda: calls.append(get_config_value('database.path')))
+                for content in ('database:\n  path: [non fermé\n', ''):
+                    with open(config_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                    self.assertIs(reload_config(), current)
+
+                # Le fichier cassé n'est relu qu'après une nouvelle modification
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    f.write('database: [\n')
+                self.assertFalse(refresh_config(0.001))
+                mcps.utils.config._last_check = 0.0
+                with patch('mcps.utils.config.reload_config') as mock_reload:
+                    self.assertFalse(refresh_config(0.001))
+                mock_reload.assert_not_called()
+
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    f.write('database:\n  path: "/data/autre.db"\n')
+                mcps.utils.config._last_check = 0.0
+                self.assertTrue(refresh_config(0.001))
+
+                os.unlink(config_path)
+                fixed = get_config()
+                self.assertIs(reload_config(), fixed)
+
+        self.assertEqual(current.get('database.path'), '/data/recipes.db')
+        self.assertEqual(get_config_value('database.path'), '/data/autre.db')
+        self.assertEqual(calls, ['/data/autre.db'])
+
+    def test_refresh_config_ignores_replaced_manager(self):
+        """Test que refresh_config ne fait rien sans fichier de configuration ni gestionnaire réel"""
+        import mcps.utils.config
+        self.addCleanup(setattr, mcps.utils.config, '_config_manager', None)
+
+        with patch.object(mcps.utils.config, '_last_check', 0.0), \
+             patch('mcps.utils.config.reload_config') as mock_reload:
+            mcps.utils.config._config_manager = MagicMock()
+            self.assertFalse(refresh_config(0.001))
+            mcps.utils.config._last_check = 0.0
+            mcps.utils.config._config_manager = ConfigManager('/inexistant/config.yaml')
+            self.assertFalse(refresh_config(0.001))
+        mock_reload.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
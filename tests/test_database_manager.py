@@ -116,3 +116,100 @@ def test_sqlite_database_manager_close_no_connection():
     # This should not raise an exception, just do nothing
     db_manager.close()
     # No assertions needed, just ensure no exception is raised
+
+
+def test_connection_pool_reuses_connection():
+    """Test that a pooled manager reuses the same connection across connect/close."""
+    import tempfile
+    from mcps.recipes.database_manager import SQLiteConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool = SQLiteConnectionPool(f'{tmpdir}/pool.db', size=1)
+
+        first = SQLiteDatabaseManager(pool.db_path, pool)
+        assert first.connect() is True
+        conn = first.conn
+        first.execute_query("CREATE TABLE t (x)")
+        first.close()
+
+        second = SQLiteDatabaseManager(pool.db_path, pool)
+        assert second.connect() is True
+        assert second.conn is conn
+        second.close()
+        pool.close_all()
+
+
+def test_connection_pool_reconnects_unhealthy_connection():
+    """Test that a connection failing the health check is replaced."""
+    import tempfile
+    from mcps.recipes.database_manager import SQLiteConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool = SQLiteConnectionPool(f'{tmpdir}/pool.db', size=1)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()  # the idle connection no longer answers
+
+        fresh = pool.acquire()
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone() == (1,)
+        pool.release(fresh)
+        pool.close_all()
+
+
+def test_connection_pool_limits_borrowed_connections():
+    """Test that no more than size connections are lent at once."""
+    import tempfile
+    from mcps.recipes.database_manager import SQLiteConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool = SQLiteConnectionPool(f'{tmpdir}/pool.db', size=1)
+        conn = pool.acquire()
+        try:
+            pool.acquire(timeout=0.05)
+            assert False, "Expected TimeoutError was not raised"
+        except TimeoutError:
+            pass
+        pool.release(conn)
+        pool.release(pool.acquire(timeout=0.05))
+        pool.close_all()
+
+
+def test_get_connection_pool_is_shared_per_path():
+    """Test that get_connection_pool returns one pool per database path."""
+    from mcps.recipes.database_manager import get_connection_pool, close_connection_pools
+
+    close_connection_pools()
+    assert get_connection_pool('/mock/a.db') is get_connection_pool('/mock/a.db')
+    assert get_connection_pool('/mock/a.db') is not get_connection_pool('/mock/b.db')
+    close_connection_pools()
+
+
+def test_connection_borrowed_during_close_is_closed_on_release():
+    """Test that a connection lent when the pool is closed is closed when it comes back."""
+    import sqlite3
+    import tempfile
+    from mcps.recipes.database_manager import SQLiteConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool = SQLiteConnectionPool(f'{tmpdir}/pool.db', size=1)
+        conn = pool.acquire()
+        pool.close_all()
+        pool.release(conn)
+
+        assert pool._idle == []
+        try:
+            conn.execute("SELECT 1")
+            assert False, "Expected the released connection to be closed"
+        except sqlite3.ProgrammingError:
+            pass
+
+
+def test_connection_pool_size_from_config_is_coerced():
+    """Test that a pool size given as text is converted, and an unusable one falls back to the default."""
+    from mcps.recipes.database_manager import DEFAULT_POOL_SIZE, SQLiteConnectionPool
+
+    assert SQLiteConnectionPool('/mock/a.db', '3').size == 3
+    assert SQLiteConnectionPool('/mock/a.db', None).size == DEFAULT_POOL_SIZE
+    assert SQLiteConnectionPool('/mock/a.db', 'deux').size == DEFAULT_POOL_SIZE
+    assert SQLiteConnectionPool('/mock/a.db', 0).size == 1
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for the email_selection module."""
+import mailbox
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+import mcps.email_processing.jsonise as jsonise
+from mcps.email_processing.email_selection import (
+    EmailSelection, MboxWindow, header_bytes, parse_headers, parse_since
+)
+
+
+class TestEmailSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.mbox_path = os.path.join(self.tmpdir.name, 'test.mbox')
+        box = mailbox.mbox(self.mbox_path)
+        senders = ['alice@example.com', 'bob@example.com']
+        for day in range(1, 7):
+            msg = MIMEText(f'Corps {day}', 'plain')
+            msg['From'] = senders[day % 2]
+            msg['Subject'] = f'Reunion {day}' if day % 3 == 0 else f'Sujet {day}'
+            msg['Date'] = f'Mon, 0{day} Jan 2024 10:00:00 +0000'
+            box.add(msg)
+        box.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _subjects(self, selection):
+        window = MboxWindow(self.mbox_path, selection)
+        subjects = [parse_headers(raw)['Subject'] for raw in window.iter_raw()]
+        return subjects, window.next_cursor
+
+    def test_header_bytes_stops_before_body(self):
+        """Test que seuls les en-têtes sont analysés"""
+        raw = b"From: a@b.c\nSubject: s\n\nCorps\n"
+        self.assertEqual(header_bytes(raw), b"From: a@b.c\nSubject: s\n\n")
+        self.assertEqual(parse_headers(raw).get_payload(), "")
+
+    def test_filters(self):
+        """Test des filtres since, from et subject"""
+        since = EmailSelection(since=parse_since("2024-01-05T00:00:00+00:00"))
+        self.assertEqual(self._subjects(since)[0], ['Sujet 5', 'Reunion 6'])
+
+        sender = EmailSelection.from_arguments({"from": "ALICE"})
+        self.assertEqual(self._subjects(sender)[0], ['Sujet 2', 'Sujet 4', 'Reunion 6'])
+
+        subject = EmailSelection.from_arguments({"subject": "REUNION"})
+        self.assertEqual(self._subjects(subject)[0], ['Reunion 3', 'Reunion 6'])
+
+    def test_encoded_headers_are_decoded(self):
+        """Test qu'un sujet encodé RFC 2047 est comparé une fois décodé"""
+        headers = parse_headers(b"Subject: =?utf-8?q?R=C3=A9union?=\n\n")
+        self.assertTrue(EmailSelection(subject="réunion").matches(headers))
+        self.assertFalse(EmailSelection(since=datetime(2024, 1, 1, tzinfo=timezone.utc)).matches(headers))
+
+    def test_pagination_with_offset_and_cursor(self):
+        """Test que le curseur reprend la lecture là où la page précédente s'est arrêtée"""
+        first, cursor = self._subjects(EmailSelection(limit=2, offset=1))
+        self.assertEqual(first, ['Sujet 2', 'Reunion 3'])
+        self.assertIsNotNone(cursor)
+
+        second, cursor = self._subjects(EmailSelection.from_arguments({"limit": 2, "cursor": str(cursor)}))
+        self.assertEqual(second, ['Sujet 4', 'Sujet 5'])
+        last, cursor = self._subjects(EmailSelection(limit=2, cursor=cursor))
+        self.assertEqual(last, ['Reunion 6'])
+        self.assertIsNone(cursor)
+
+    def test_invalid_arguments(self):
+        """Test que les arguments invalides sont signalés"""
+        for arguments in ({"since": "hier"}, {"limit": -1}, {"limit": 0}, {"offset": "deux"}):
+            with self.assertRaises(ValueError):
+                EmailSelection.from_arguments(arguments)
+        self.assertTrue(EmailSelection.from_arguments({}).is_empty())
+
+    def test_only_selected_bodies_are_cleaned(self):
+        """Test que seuls les emails retenus sont décodés et nettoyés"""
+        config = {"SRC": "test.mbox", "path": self.tmpdir.name}
+        selection = EmailSelection.from_arguments({"from": "bob", "limit": 2})
+        with patch('mcps.email_processing.jsonise.get_config_value', return_value=config), \
+             patch('mcps.email_processing.jsonise.email_to_dict', wraps=jsonise.email_to_dict) as mock_to_dict:
+            result = jsonise.run_jsonise(selection=selection)
+
+        self.assertEqual(mock_to_dict.call_count, 2)
+        self.assertIn('Sujet 1', result['output'])
+        self.assertIn('Reunion 3', result['output'])
+        self.assertNotIn('Sujet 5', result['output'])
+        self.assertIn(f'cursor = "{result["cursor"]}"', result['output'])
+
+
+if __name__ == '__main__':
+    unittest.main()
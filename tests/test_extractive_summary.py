@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for the extractive_summary module."""
+import sys
+
+import pytest
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.email_processing import extractive_summary
+from mcps.email_processing.extractive_summary import (
+    reduce_text, score_sentences, split_sentences, summarize, tokenize
+)
+
+TEXT = (
+    "Le budget du projet de rénovation a été validé lors de la réunion. "
+    "Il fait beau aujourd'hui sur la côte. "
+    "La réunion sur le budget du projet reprendra jeudi avec l'équipe de rénovation. "
+    "Mon chat aime dormir au soleil. "
+    "L'équipe du projet présentera le budget de la rénovation au conseil. "
+    "Les pâtes étaient trop cuites hier soir."
+)
+
+
+def test_split_sentences():
+    """Test that sentences are cut on final punctuation, blank lines and bullets."""
+    text = "Première phrase. Deuxième ? Oui !\n\nNouveau paragraphe\n- puce un\n- puce deux"
+    assert split_sentences(text) == [
+        "Première phrase.", "Deuxième ?", "Oui !", "Nouveau paragraphe", "- puce un", "- puce deux"
+    ]
+    # Pas de coupure devant une minuscule ou un chiffre (abréviations)
+    assert split_sentences("Voir p. 12 et la fig. suivante.") == ["Voir p. 12 et la fig. suivante."]
+    # Pas de coupure sans espace après le point ; une ligne en majuscule commence une phrase
+    assert split_sentences("Vu M.Dupont, etc.Ensuite rien.") == ["Vu M.Dupont, etc.Ensuite rien."]
+    assert split_sentences("Ligne une\nligne coupée\nLigne deux") == ["Ligne une\nligne coupée", "Ligne deux"]
+
+
+def test_tokenize_is_french_aware():
+    """Test that case, accents, elisions, stopwords and simple plurals are normalised."""
+    assert tokenize("L'équipe présente les Budgets qu'elle a validés") == [
+        "equipe", "presente", "budget", "valide"
+    ]
+    assert tokenize("Réunion, REUNION et réunions") == ["reunion", "reunion", "reunion"]
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_summary_keeps_central_sentences_in_order(monkeypatch, numpy_available):
+    """Test that the on-topic sentences are kept, in their original order, with and without NumPy."""
+    if numpy_available:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(extractive_summary, "np", None)
+
+    summary = summarize(TEXT, 40)
+    sentences = split_sentences(summary)
+
+    assert len(sentences) == 3
+    assert all("projet" in sentence for sentence in sentences)
+    assert sentences == sorted(sentences, key=TEXT.index)
+
+
+def test_score_sentences_edge_cases():
+    """Test scoring of no sentence, and of sentences without significant words."""
+    assert score_sentences([]) == []
+    assert len(score_sentences(["Et ou de la.", "Le budget."])) == 2
+
+
+def test_summary_keeps_at_least_one_sentence():
+    """Test that a target below the first sentence length still keeps one sentence."""
+    summary = summarize(TEXT, 1)
+    assert len(split_sentences(summary)) == 1
+
+
+def test_reduce_text_threshold():
+    """Test that only texts above the threshold are reduced, and that 0 disables the reduction."""
+    words = len(TEXT.split())
+    assert reduce_text(TEXT, words, 20) is TEXT
+    assert reduce_text(TEXT, 0, 20) is TEXT
+    assert reduce_text("", 1, 1) == ""
+
+    reduced = reduce_text(TEXT, words - 1, 20)
+    assert len(reduced.split()) <= 20
+    assert reduced in summarize(TEXT, 20)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for the index_advisor module."""
+import os
+import sqlite3
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.recipes.database_manager import SQLiteDatabaseManager, close_connection_pools, get_connection_pool
+from mcps.recipes.index_advisor import IndexAdvisor, RECOMMENDED_INDEXES, ensure_recommended_indexes, format_report
+
+
+class TestIndexAdvisor:
+    """Tests de l'analyse et de la création des index de la table recipe."""
+
+    def setup_method(self):
+        """Crée une base de test sans index."""
+        self.test_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        self.test_db.close()
+
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute('''
+            CREATE TABLE recipe (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                source TEXT
+            )
+        ''')
+        conn.executemany(
+            'INSERT INTO recipe (title, description, source) VALUES (?, ?, ?)',
+            [(f'Recette {i}', f'2025-01-{i % 28 + 1:02d}', f'Source {i % 5}') for i in range(200)]
+        )
+        conn.commit()
+        conn.close()
+
+        self.db_manager = SQLiteDatabaseManager(self.test_db.name)
+        self.db_manager.connect()
+
+    def teardown_method(self):
+        """Ferme la connexion et supprime la base."""
+        self.db_manager.close()
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def test_analyse_detects_full_scans(self):
+        """Test que les requêtes sans index sont signalées comme parcours complets."""
+        report = IndexAdvisor(self.db_manager, repeat=1).analyse()
+
+        assert set(report) == {"search_recipes", "get_recipe", "update_recipe"}
+        assert report["search_recipes"]["full_scan"] is True
+        assert report["get_recipe"]["full_scan"] is True
+        assert report["search_recipes"]["ms"] is not None
+        assert report["update_recipe"]["ms"] is None
+        assert "search_recipes" in format_report(report)
+
+    def test_apply_creates_covering_indexes(self):
+        """Test que apply crée les index et que les requêtes les utilisent ensuite."""
+        advisor = IndexAdvisor(self.db_manager, repeat=1)
+        result = advisor.apply()
+
+        assert sorted(result["created"]) == sorted(RECOMMENDED_INDEXES)
+        assert advisor.missing_indexes() == []
+        after = result["after"]
+        assert all(not entry["full_scan"] for entry in after.values())
+        assert any("COVERING INDEX mcps_recipe_source_description" in step
+                   for step in after["search_recipes"]["plan"])
+
+        # Une seconde passe ne crée rien
+        assert advisor.apply()["created"] == []
+
+    def test_apply_does_not_modify_recipes(self):
+        """Test que l'analyse n'exécute jamais la requête de mise à jour."""
+        before = self.db_manager.execute_query("SELECT title, description FROM recipe ORDER BY id")
+        IndexAdvisor(self.db_manager, repeat=1).apply()
+        after = self.db_manager.execute_query("SELECT title, description FROM recipe ORDER BY id")
+        assert before == after
+
+    def test_ensure_recommended_indexes_runs_once_per_database(self):
+        """Test que la création automatique n'est faite qu'une fois par base."""
+        created = ensure_recommended_indexes(self.db_manager)
+        assert sorted(created) == sorted(RECOMMENDED_INDEXES)
+        assert ensure_recommended_indexes(self.db_manager) == []
+
+    def test_ensure_recommended_indexes_retries_after_error(self):
+        """Test qu'une erreur SQLite est journalisée et que la création est retentée ensuite."""
+        with patch.object(self.db_manager, 'execute_query',
+                          side_effect=sqlite3.OperationalError("database is locked")):
+            assert ensure_recommended_indexes(self.db_manager) == []
+
+        created = ensure_recommended_indexes(self.db_manager)
+        assert sorted(created) == sorted(RECOMMENDED_INDEXES)
+
+    def test_index_error_returns_connection_to_pool(self):
+        """Test qu'un échec de création des index ne garde pas la connexion empruntée au pool."""
+        from mcps.recipes.propose_des_recettes import propose_des_recettes
+
+        config = {"database.path": self.test_db.name, "database.pool_size": 1, "database.auto_index": True}
+        close_connection_pools()
+        with patch('mcps.recipes.propose_des_recettes.get_config_value',
+                   side_effect=lambda key, default=None: config.get(key, default)), \
+             patch('mcps.recipes.index_advisor.IndexAdvisor.missing_indexes',
+                   side_effect=sqlite3.OperationalError("attempt to write a readonly database")):
+            propose_des_recettes("Source 1", 2)
+            assert "Recette" in propose_des_recettes("Source 1", 2)
+
+        pool = get_connection_pool(self.test_db.name, 1)
+        pool.release(pool.acquire(timeout=1))
+        close_connection_pools()
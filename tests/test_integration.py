@@ -236,6 +236,14 @@ class TestMarqueRecetteFaiteIntegration:
         result = marque_recette_faite('Nonexistent Recipe')
         assert 'introuvable' in result.lower()
 
+    def test_mark_recipe_with_approximate_title(self):
+        """Test qu'un titre sans la bonne casse est ramené au titre exact."""
+        result = marque_recette_faite('test recipe')
+
+        assert result.startswith('Test Recipe: ')
+        today = datetime.now().strftime("%Y-%m-%d")
+        assert today in result
+
 
 class TestProposeDesRecettesIntegration:
     """Tests d'intégration pour le module propose_des_recettes."""
@@ -436,8 +444,9 @@ class TestMCPFullIntegration:
     
     def teardown_method(self):
         """Nettoie les patches et la base de données."""
-        self.db_patcher1.stop()
+        # Ordre inverse : les deux patchs visent le même os.path.expanduser
         self.db_patcher2.stop()
+        self.db_patcher1.stop()
         if os.path.exists(self.test_db.name):
             os.unlink(self.test_db.name)
     
@@ -560,7 +569,7 @@ class TestEndToEndWorkflow:
     
     def teardown_method(self):
         """Nettoie l'environnement E2E."""
-        for patcher in self.patchers:
+        for patcher in reversed(self.patchers):
             patcher.stop()
         if os.path.exists(self.test_db.name):
             os.unlink(self.test_db.name)
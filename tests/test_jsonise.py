@@ -2,6 +2,7 @@ import unittest
 import tempfile
 import os
 import json
+import mailbox
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -10,7 +11,7 @@ import sys
 from io import StringIO
 
 # Importez votre module ici
-from mcps.email_processing.jsonise import clean_message, extract_body, clean_body, has_attachment, process_email, process_mbox, run_jsonise
+from mcps.email_processing.jsonise import clean_message, extract_body, clean_body, has_attachment, process_email, process_mbox, process_raw_messages, run_jsonise, email_to_dict, format_digest, iter_emails, iter_email_headers, run_liste_emails
 
 class TestEmailProcessing(unittest.TestCase):
 
@@ -26,6 +27,16 @@ class TestEmailProcessing(unittest.TestCase):
         self.assertIn('Hello', result)
         self.assertIn('World', result)
 
+    def test_clean_message_reuses_shared_cleaner(self):
+        """Test que clean_message ne construit pas de Cleaner à chaque message"""
+        msg = MIMEText('<html><body><p style="color:red">a {color: red} Bonjour</p></body></html>', 'html')
+
+        with patch('mcps.email_processing.jsonise.Cleaner') as mock_cleaner:
+            result = clean_message(msg)
+
+        mock_cleaner.assert_not_called()
+        self.assertEqual(result, 'Bonjour')
+
     def test_clean_message_with_invalid_html(self):
         """Test du nettoyage avec HTML invalide"""
         msg = MIMEText('<html><body><p>Invalid <tag>here</html>', 'html')
@@ -153,33 +164,37 @@ Ceci est le contenu du message."""
 
 
 
-    @patch('mailbox.mbox')
-    @patch('builtins.open', new_callable=mock_open, read_data='mbox:\n  path: /test/path')
-    @patch('os.path.isfile', return_value=True)
-    def test_process_mbox(self, mock_isfile, mock_file, mock_mbox):
-        """Test du traitement d'un fichier mbox"""
-        # Créer un message de test
+    def _write_mbox(self, directory):
+        """Écrit un mbox de test contenant un seul email"""
         msg = MIMEText('Test body', 'plain')
         msg['From'] = 'sender@example.com'
         msg['Subject'] = 'Test Subject'
         msg['Date'] = 'Mon, 01 Jan 2026 12:00:00 +0000'
-        
-        mock_mbox_instance = mock_mbox.return_value.__iter__.return_value
-        mock_mbox_instance.__iter__.return_value = [msg]
-        
-        # Capturer stdout
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
-        
-        try:
-            process_mbox('/test/path')
-            output = captured_output.getvalue()
-            
-            # Vérifier que le JSON est imprimé
-            self.assertIn('Test Subject', output)
-            self.assertIn('sender@example.com', output)
-        finally:
-            sys.stdout = old_stdout
+
+        mbox_path = os.path.join(directory, 'test.mbox')
+        box = mailbox.mbox(mbox_path)
+        box.add(msg)
+        box.close()
+        return mbox_path
+
+    def test_process_mbox(self):
+        """Test du traitement d'un fichier mbox"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = self._write_mbox(tmpdir)
+
+            # Capturer stdout
+            old_stdout = sys.stdout
+            sys.stdout = captured_output = StringIO()
+
+            try:
+                process_mbox(mbox_path)
+                output = captured_output.getvalue()
+
+                # Vérifier que le JSON est imprimé
+                self.assertIn('Test Subject', output)
+                self.assertIn('sender@example.com', output)
+            finally:
+                sys.stdout = old_stdout
 
     @patch('builtins.open', new_callable=mock_open, read_data='mbox:\n  path: /test/path')
     @patch('os.path.isfile', side_effect=lambda x: x == '/test/path')
@@ -188,30 +203,214 @@ Ceci est le contenu du message."""
         with self.assertRaises(SystemExit):
             process_mbox('/nonexistent/path')
 
-    @patch('builtins.open', new_callable=mock_open, read_data='mbox:\n  SRC: "test"\n  path: /test/path')
-    @patch('os.path.isfile', return_value=True)
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_run_jsonise_success(self, mock_stdout, mock_isfile, mock_file):
+    def test_run_jsonise_success(self):
         """Test de l'exécution réussie de run_jsonise"""
-        # Simuler le processus mbox
-        with patch('mailbox.mbox') as mock_mbox:
-            msg = MIMEText('Test body', 'plain')
-            msg['From'] = 'sender@example.com'
-            msg['Subject'] = 'Test Subject'
-            msg['Date'] = 'Mon, 01 Jan 2026 12:00:00 +0000'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._write_mbox(tmpdir)
+            config = {"SRC": "test.mbox", "path": tmpdir}
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config):
+                result = run_jsonise()
 
-            mock_mbox_instance = mock_mbox.return_value.__iter__.return_value
-            mock_mbox_instance.__iter__.return_value = [msg]
-
-            result = run_jsonise()
             # Vérifier que le résultat contient la clé 'output'
             self.assertIn('output', result)
             self.assertIn('écrit un résumé de 80 mots', result['output'])
+            self.assertIn('Test Subject', result['output'])
+
+    def test_run_jsonise_presummarizes_long_bodies(self):
+        """Test que seuls les corps au-delà de mbox.presummary_words sont réduits à leurs phrases centrales"""
+        long_body = ("Le budget du projet est validé par l'équipe. Il pleut sur la ville. "
+                     "L'équipe du projet revoit le budget jeudi. Le chat dort.")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = os.path.join(tmpdir, 'test.mbox')
+            box = mailbox.mbox(mbox_path)
+            for subject, body in (('Long', long_body), ('Court', 'Bonjour Marie.')):
+                msg = MIMEText(body, 'plain')
+                msg['Subject'] = subject
+                box.add(msg)
+            box.close()
+
+            config = {"SRC": "test.mbox", "path": tmpdir, "presummary_words": 10, "presummary_target_words": 16}
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config):
+                output = run_jsonise()['output']
+
+        self.assertIn("Le budget du projet est validé par l'équipe. L'équipe du projet revoit le budget jeudi.", output)
+        self.assertNotIn('Il pleut', output)
+        self.assertNotIn('Le chat dort', output)
+        self.assertIn('Bonjour Marie.', output)
+
+    def test_email_to_dict_presummarizes_line_structured_bodies(self):
+        """Test que le pré-résumé découpe les lignes d'un corps avant que normalise_body ne remplace les sauts de ligne"""
+        digressions = ["Il pleut sur la côte", "Mon chat dort au soleil", "Les pâtes étaient trop cuites",
+                       "Le train avait du retard", "La boulangerie ferme lundi"]
+        lines = []
+        for i in range(150):
+            lines.append(f"Le budget du projet de rénovation est revu par l'équipe au point {i}")
+            lines.append(f"{digressions[i % len(digressions)]} numéro {i}")
+        body = "Bonjour Marie,\n\n" + "\n".join(lines) + "\n\nCordialement\n"
+        reduced = email_to_dict(MIMEText(body, 'plain'), presummary=(100, 60))['body']
+
+        self.assertNotIn('\n', reduced)
+        self.assertLessEqual(len(reduced.split()), 60)
+        self.assertGreaterEqual(reduced.count('Le budget du projet'), 3)
+        self.assertNotIn('Mon chat', reduced)
+
+    def test_process_raw_messages_parallel_keeps_order(self):
+        """Test que le traitement multi-processus renvoie les emails dans l'ordre d'origine"""
+        raw_messages = []
+        for i in range(7):
+            msg = MIMEText(f'<html><body><p>Message {i}</p></body></html>', 'html')
+            msg['Subject'] = f'Sujet {i}'
+            raw_messages.append(msg.as_bytes())
+
+        serial = list(process_raw_messages(raw_messages, workers=1))
+        parallel = list(process_raw_messages(iter(raw_messages), workers=2, chunksize=2))
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r['subject'] for r in parallel], [f'Sujet {i}' for i in range(7)])
+
+    def test_iter_emails_and_format_digest(self):
+        """Test que le digest encode chaque email une seule fois en JSON"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = self._write_mbox(tmpdir)
+            emails = list(iter_emails(mbox_path))
+
+        self.assertEqual(emails[0]['subject'], 'Test Subject')
+        self.assertEqual(emails[0]['body'], 'Test body')
+
+        emails[0]['subject'] = 'Été'
+        digest = format_digest(emails, prompt="consigne")
+        prompt, payload = digest.split("\n", 1)
+        self.assertEqual(prompt, "consigne")
+        # Un seul encodage : le JSON se relit directement en dictionnaire
+        self.assertEqual(json.loads(payload), emails[0])
+        self.assertIn('Été', payload)
+
+    def test_iter_emails_stops_when_cancelled(self):
+        """Test que la lecture du mbox s'arrête entre deux emails après annulation"""
+        from mcps.utils.cancellation import CancelToken, Cancelled
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = os.path.join(tmpdir, 'test.mbox')
+            box = mailbox.mbox(mbox_path)
+            for i in range(5):
+                msg = MIMEText(f'Corps {i}', 'plain')
+                msg['Subject'] = f'Sujet {i}'
+                box.add(msg)
+            box.close()
+
+            for index_path in (None, os.path.join(tmpdir, 'index.sqlite')):
+                token = CancelToken()
+                seen = []
+                with self.assertRaises(Cancelled):
+                    for email_data in iter_emails(mbox_path, index_path, cancel_token=token):
+                        seen.append(email_data['subject'])
+                        if len(seen) == 2:
+                            token.cancel()
+                self.assertEqual(seen, ['Sujet 0', 'Sujet 1'])
+
+            # L'index interrompu n'a rien enregistré : tout est relu au passage suivant
+            emails = list(iter_emails(mbox_path, os.path.join(tmpdir, 'index.sqlite')))
+            self.assertEqual(len(emails), 5)
+
+    def test_run_jsonise_streams_digest_in_chunks(self):
+        """Test que le condensé envoyé par morceaux reconstitue le résultat final"""
+        from mcps.utils.progress import ProgressReporter, bind_reporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = os.path.join(tmpdir, 'test.mbox')
+            box = mailbox.mbox(mbox_path)
+            for i in range(5):
+                msg = MIMEText(f'Corps {i}', 'plain')
+                msg['Subject'] = f'Sujet {i}'
+                box.add(msg)
+            box.close()
+
+            config = {"SRC": "test.mbox", "path": tmpdir}
+            sent = []
+            reporter = ProgressReporter(lambda *notification: sent.append(notification))
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config), \
+                 bind_reporter(reporter):
+                result = run_jsonise(stream_chunk=2)
+
+        self.assertEqual([progress for progress, _, _ in sent], [2, 4, 5])
+        self.assertEqual(sent[-1][1], 5)
+        self.assertTrue(sent[0][2].startswith('écrit un résumé de 80 mots'))
+        self.assertIn('Sujet 1', sent[0][2])
+        self.assertEqual("\n".join(message for _, _, message in sent), result['output'])
+
+    def test_report_digest_last_full_chunk_carries_total(self):
+        """Test que le dernier morceau porte le total quand le nombre d'emails est un multiple de stream_chunk"""
+        from mcps.email_processing.jsonise import report_digest
+        from mcps.utils.progress import ProgressReporter
+
+        for stream_chunk in (2, 0):
+            sent = []
+            reporter = ProgressReporter(lambda *notification: sent.append(notification), min_interval=0)
+            parts = list(report_digest(['a', 'b', 'c', 'd'], reporter, stream_chunk, prompt='P'))
+
+            self.assertEqual(parts, ['a', 'b', 'c', 'd'])
+            self.assertEqual(sent[-1][:2], (4, 4))
+            if stream_chunk:
+                self.assertEqual(sent, [(2, None, 'P\na\nb'), (4, 4, 'c\nd')])
+
+    def test_iter_email_headers_skips_bodies(self):
+        """Test que la liste des en-têtes ne décode ni ne nettoie aucun corps"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = self._write_mbox(tmpdir)
+            with patch('mcps.email_processing.jsonise.extract_body') as mock_extract:
+                headers = list(iter_email_headers(mbox_path))
+
+        mock_extract.assert_not_called()
+        self.assertEqual(headers[0]['subject'], 'Test Subject')
+        self.assertNotIn('body', headers[0])
+
+    def test_run_liste_emails(self):
+        """Test de la liste paginée des emails du mbox configuré"""
+        from mcps.email_processing.email_selection import EmailSelection
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mbox_path = os.path.join(tmpdir, 'test.mbox')
+            box = mailbox.mbox(mbox_path)
+            for i in range(3):
+                msg = MIMEText(f'Corps {i}', 'plain')
+                msg['Subject'] = f'=?utf-8?q?=C3=89t=C3=A9_{i}?='
+                box.add(msg)
+            box.close()
+
+            config = {"SRC": "test.mbox", "path": tmpdir}
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config):
+                result = run_liste_emails(EmailSelection(limit=2))
+
+        lines = result['output'].splitlines()
+        self.assertEqual([json.loads(line)['subject'] for line in lines[:2]], ['Été 0', 'Été 1'])
+        self.assertIn(result['cursor'], lines[2])
+
+    def test_run_jsonise_leaves_stdout_untouched(self):
+        """Test que run_jsonise ne redirige pas sys.stdout"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._write_mbox(tmpdir)
+            config = {"SRC": "test.mbox", "path": tmpdir}
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config), \
+                 patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                result = run_jsonise()
+
+        # Le résultat est renvoyé directement, rien n'est écrit sur stdout
+        self.assertIn('Test Subject', result['output'])
+        self.assertEqual(mock_stdout.getvalue(), '')
+
+    def test_run_jsonise_missing_mbox(self):
+        """Test que run_jsonise signale un mbox absent sans quitter le processus"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = {"SRC": "absent.mbox", "path": tmpdir}
+            with patch('mcps.email_processing.jsonise.get_config_value', return_value=config):
+                result = run_jsonise()
+
+        self.assertIn('error', result)
 
-    @patch('builtins.open', new_callable=mock_open, read_data='invalid: config: yaml')
+    @patch('mcps.email_processing.jsonise.iter_raw_messages', side_effect=OSError("mbox illisible"))
     @patch('os.path.isfile', return_value=True)
-    def test_run_jsonise_config_error(self, mock_isfile, mock_file):
-        """Test de run_jsonise avec erreur de configuration"""
+    def test_run_jsonise_config_error(self, mock_isfile, mock_iter):
+        """Test de run_jsonise avec un mbox illisible"""
         result = run_jsonise()
         
         # Doit contenir une clé 'error'
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Tests for the mbox_index module."""
+import email
+import mailbox
+import os
+import sys
+import tempfile
+from email.mime.text import MIMEText
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.email_processing.mbox_index import MboxIndex, default_index_path
+
+
+def _make_message(subject):
+    msg = MIMEText(f'Body of {subject}', 'plain')
+    msg['From'] = 'sender@example.com'
+    msg['Subject'] = subject
+    msg['Message-ID'] = f'<{subject}@example.com>'
+    return msg
+
+
+def _append(mbox_path, *subjects):
+    box = mailbox.mbox(mbox_path)
+    for subject in subjects:
+        box.add(_make_message(subject))
+    box.close()
+
+
+def _to_dict(message):
+    return {"subject": message['Subject'], "body": message.get_payload()}
+
+
+class CountingProcessor:
+    """Stand-in for process_raw_messages that records each processed subject."""
+
+    def __init__(self):
+        self.subjects = []
+
+    def __call__(self, raw_messages):
+        for raw in raw_messages:
+            message = email.message_from_bytes(raw)
+            self.subjects.append(message['Subject'])
+            yield _to_dict(message)
+
+
+def _paths():
+    tmpdir = tempfile.mkdtemp()
+    mbox_path = os.path.join(tmpdir, 'test.mbox')
+    return mbox_path, default_index_path(mbox_path)
+
+
+def test_index_only_processes_appended_messages():
+    """Test that a second pass only parses the messages appended since the first."""
+    mbox_path, index_path = _paths()
+    _append(mbox_path, 'one', 'two')
+
+    first = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(first))
+    assert first.subjects == ['one', 'two']
+    assert [r['subject'] for r in results] == ['one', 'two']
+    assert os.path.exists(index_path)
+
+    _append(mbox_path, 'three')
+
+    second = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(second))
+    assert second.subjects == ['three']
+    assert [r['subject'] for r in results] == ['one', 'two', 'three']
+
+
+def test_index_matches_mailbox_parsing():
+    """Test that the bodies, fresh and cached, are the same as those seen through mailbox.mbox."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one', 'two')
+
+    expected = [_to_dict(message) for message in mailbox.mbox(mbox_path)]
+    assert list(MboxIndex(mbox_path).iter_emails(CountingProcessor())) == expected
+    assert list(MboxIndex(mbox_path).iter_emails(CountingProcessor())) == expected
+
+
+def test_index_unchanged_mbox_is_served_from_cache():
+    """Test that an unchanged mbox is not parsed again."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one')
+    list(MboxIndex(mbox_path).iter_emails(CountingProcessor()))
+
+    processor = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(processor))
+    assert processor.subjects == []
+    assert len(results) == 1
+
+
+def test_index_rebuilt_when_mbox_is_rewritten():
+    """Test that a truncated or rewritten mbox triggers a full rebuild."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one', 'two')
+    list(MboxIndex(mbox_path).iter_emails(CountingProcessor()))
+
+    os.unlink(mbox_path)
+    _append(mbox_path, 'other')
+
+    processor = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(processor))
+    assert processor.subjects == ['other']
+    assert [r['subject'] for r in results] == ['other']
+
+
+def test_index_rereads_message_still_being_appended():
+    """Test that a last message without its blank separator line is not cached, and is parsed again once complete."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one')
+    with open(mbox_path, 'ab') as f:
+        f.write(b'From MAILER-DAEMON Thu Jan  1 00:00:00 2026\nSubject: two\n\nBody of')
+
+    first = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(first))
+    assert first.subjects == ['one', 'two']
+    assert [r['subject'] for r in results] == ['one', 'two']
+
+    with open(mbox_path, 'ab') as f:
+        f.write(b' two\n\n')
+
+    second = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(second))
+    assert second.subjects == ['two']
+    assert results[-1] == {"subject": "two", "body": "Body of two\n"}
+
+    third = CountingProcessor()
+    assert len(list(MboxIndex(mbox_path).iter_emails(third))) == 2
+    assert third.subjects == []
+
+
+def test_index_rebuilt_when_variant_changes():
+    """Test that changing the processing settings (pre-summary) rebuilds the index."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one')
+    list(MboxIndex(mbox_path).iter_emails(CountingProcessor()))
+
+    processor = CountingProcessor()
+    list(MboxIndex(mbox_path, variant='presummary:600:250').iter_emails(processor))
+    assert processor.subjects == ['one']
+
+    processor = CountingProcessor()
+    list(MboxIndex(mbox_path, variant='presummary:600:250').iter_emails(processor))
+    assert processor.subjects == []
+
+
+def test_concurrent_passes_do_not_lock_each_other():
+    """Test that a pass paused between two messages does not block another pass that updates the index."""
+    mbox_path, _ = _paths()
+    _append(mbox_path, 'one', 'two')
+    list(MboxIndex(mbox_path).iter_emails(CountingProcessor()))
+    _append(mbox_path, 'three')
+
+    paused = MboxIndex(mbox_path).iter_emails(CountingProcessor())
+    assert next(paused)['subject'] == 'one'
+
+    processor = CountingProcessor()
+    results = list(MboxIndex(mbox_path).iter_emails(processor))
+    assert processor.subjects == ['three']
+    assert [r['subject'] for r in results] == ['one', 'two', 'three']
+    assert [r['subject'] for r in paused] == ['two', 'three']
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for the mbox_reader module."""
+import mailbox
+import os
+import sys
+import tempfile
+from email.mime.text import MIMEText
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.email_processing.mbox_reader import iter_messages, iter_raw_messages
+
+
+def _write_mbox(directory, subjects):
+    mbox_path = os.path.join(directory, 'test.mbox')
+    box = mailbox.mbox(mbox_path)
+    for subject in subjects:
+        msg = MIMEText(f'Body of {subject}\n\nFrom the second paragraph', 'plain')
+        msg['From'] = 'sender@example.com'
+        msg['Subject'] = subject
+        box.add(msg)
+    box.close()
+    return mbox_path
+
+
+def test_iter_messages_matches_mailbox():
+    """Test that the streaming reader yields the same messages as mailbox.mbox."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mbox_path = _write_mbox(tmpdir, ['one', 'two', 'three'])
+
+        streamed = [(m['Subject'], m.get_payload()) for m in iter_messages(mbox_path)]
+        expected = [(m['Subject'], m.get_payload()) for m in mailbox.mbox(mbox_path)]
+
+        assert streamed == expected
+        assert [subject for subject, _ in streamed] == ['one', 'two', 'three']
+
+
+def test_iter_raw_messages_offsets_and_start():
+    """Test that offsets point at From lines and that reading can resume from one."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mbox_path = _write_mbox(tmpdir, ['one', 'two'])
+        with open(mbox_path, 'rb') as f:
+            data = f.read()
+
+        raws = list(iter_raw_messages(mbox_path))
+        assert len(raws) == 2
+        for offset, raw in raws:
+            assert data[offset:offset + 5] == b'From '
+            assert data[offset:offset + len(raw)] == raw
+
+        second_offset = raws[1][0]
+        assert list(iter_raw_messages(mbox_path, start=second_offset)) == raws[1:]
+
+
+def test_iter_raw_messages_empty_file():
+    """Test that an empty mbox yields nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mbox_path = os.path.join(tmpdir, 'empty.mbox')
+        open(mbox_path, 'wb').close()
+
+        assert list(iter_raw_messages(mbox_path)) == []
@@ -8,7 +8,7 @@ from unittest.mock import patch, MagicMock
 # Add the src directory to the path so we can import the modules
 sys.path.insert(0, 'src')
 
-from mcps.mcp_server.mcp_perso import handle_initialize, handle_list_tools, handle_call_tool
+from mcps.mcp_server.mcp_perso import handle_initialize, handle_list_tools, handle_call_tool, call_tool
 
 
 def test_handle_initialize():
@@ -31,7 +31,7 @@ def test_handle_initialize():
     assert "capabilities" in response["result"]
     
     # Check that all expected tools are listed
-    expected_tools = {"calcul", "resume_emails", "marque_recette_faite", "propose_des_recettes", "prepare_synthese", "gourmandise_recette"}
+    expected_tools = {"calcul", "resume_emails", "liste_emails", "marque_recette_faite", "propose_des_recettes", "cherche_recettes", "prepare_synthese", "gourmandise_recette"}
     actual_tools = set(response["result"]["capabilities"]["tools"].keys())
     assert actual_tools == expected_tools
   
@@ -55,11 +55,11 @@ def test_handle_list_tools():
     assert "tools" in response["result"]
     
     # Check that we have the expected number of tools
-    assert len(response["result"]["tools"]) == 6
+    assert len(response["result"]["tools"]) == 8
     
     # Check that each tool has the required fields
     tool_names = {tool["name"] for tool in response["result"]["tools"]}
-    expected_tools = {"calcul", "resume_emails", "marque_recette_faite", "propose_des_recettes", "prepare_synthese", "gourmandise_recette"}
+    expected_tools = {"calcul", "resume_emails", "liste_emails", "marque_recette_faite", "propose_des_recettes", "cherche_recettes", "prepare_synthese", "gourmandise_recette"}
     assert tool_names == expected_tools
     
     # Check specific tool details
@@ -168,6 +168,22 @@ def test_handle_call_tool_propose_des_recettes_missing_params():
     assert response["result"]["content"][0]["text"] == "Veuillez spécifier la source et la quantité de recettes."
 
 
+@patch('mcps.mcp_server.mcp_perso.cherche_recettes')
+def test_handle_call_tool_cherche_recettes(mock_cherche_recettes):
+    """Test handle_call_tool for the cherche_recettes tool."""
+    mock_cherche_recettes.return_value = "Tarte aux pommes : [tarte] aux [pommes]"
+
+    captured_output = StringIO()
+    with patch('sys.stdout', captured_output):
+        handle_call_tool("109", {"name": "cherche_recettes", "arguments": {"requete": "tarte pomme"}})
+
+    response = json.loads(captured_output.getvalue().strip())
+
+    assert response["id"] == "109"
+    assert response["result"]["content"][0]["text"] == "Tarte aux pommes : [tarte] aux [pommes]"
+    mock_cherche_recettes.assert_called_once_with("tarte pomme", 10)
+
+
 @patch('mcps.mcp_server.mcp_perso.recuperer_texte_du_presse_papier')
 def test_handle_call_tool_prepare_synthese(mock_recuperer):
     """Test handle_call_tool for the prepare_synthese tool."""
@@ -182,7 +198,10 @@ def test_handle_call_tool_prepare_synthese(mock_recuperer):
 
     assert response["jsonrpc"] == "2.0"
     assert response["id"] == "106"
-    assert response["result"]["content"][0]["text"] == "Texte synthétisé"
+    assert response["result"]["content"][0]["text"] == (
+        "{ '**OBJECTIF**': 'fait une synthèse du texte suivant et affiche la : ', "
+        "'**TEXTE CIBLE**': Texte synthétisé}"
+    )
     mock_recuperer.assert_called_once()
 
 
@@ -218,3 +237,437 @@ def test_handle_call_tool_unknown_tool():
     assert "error" in response
     assert response["error"]["code"] == -32601
     assert "Outil inconnu: unknown_tool" in response["error"]["message"]
+
+
+def test_main_dispatches_tool_calls_concurrently():
+    """Test that a slow tool call does not block a fast one queued behind it."""
+    import time
+    from mcps.mcp_server.mcp_perso import main
+
+    def slow_jsonise():
+        time.sleep(0.3)
+        return {"output": "Résumé lent"}
+
+    requests = "\n".join([
+        json.dumps({"jsonrpc": "2.0", "id": "slow", "method": "tools/call",
+                    "params": {"name": "resume_emails", "arguments": {}}}),
+        json.dumps({"jsonrpc": "2.0", "id": "fast", "method": "tools/call",
+                    "params": {"name": "calcul", "arguments": {"a": 1, "b": 2}}}),
+    ]) + "\n"
+
+    captured_output = StringIO()
+    with patch('sys.stdin', StringIO(requests)), \
+         patch('sys.stdout', captured_output), \
+         patch('mcps.mcp_server.mcp_perso.get_config_value', return_value=4), \
+         patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=slow_jsonise):
+        main()
+
+    responses = [json.loads(line) for line in captured_output.getvalue().strip().splitlines()]
+
+    # Both requests are answered, the fast one first
+    assert [r["id"] for r in responses] == ["fast", "slow"]
+    assert "= 3" in responses[0]["result"]["content"][0]["text"]
+    assert responses[1]["result"]["content"][0]["text"] == "Résumé lent"
+
+
+def test_tool_modules_are_imported_lazily():
+    """Test that importing the server does not load the tool modules (lxml, sqlite3...)."""
+    import os
+    import subprocess
+
+    code = ("import sys, mcps.mcp_server.mcp_perso as m; "
+            "print(sorted(n for n in ('mcps.email_processing.jsonise', 'lxml', 'mcps.recipes.marque_recette_faite', "
+            "'mcps.utils.send_clipboard') if n in sys.modules)); "
+            "print(m.run_jsonise.__module__)")
+    env = dict(os.environ, PYTHONPATH=os.path.abspath('src'))
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+    loaded, module = result.stdout.strip().splitlines()
+    assert loaded == "[]"
+    assert module == "mcps.email_processing.jsonise"
+
+
+def test_start_warm_up_is_optional():
+    """Test that the warm-up thread only starts when server.warmup is enabled."""
+    import mcps.mcp_server.mcp_perso as mcp_perso
+
+    mcp_perso._warm_up_started.clear()
+    with patch('mcps.mcp_server.mcp_perso.get_config_value', return_value=False), \
+         patch('mcps.mcp_server.mcp_perso.threading.Thread') as mock_thread:
+        mcp_perso.start_warm_up()
+    mock_thread.assert_not_called()
+
+    with patch('mcps.mcp_server.mcp_perso.get_config_value', return_value=True), \
+         patch('mcps.mcp_server.mcp_perso.threading.Thread') as mock_thread:
+        mcp_perso.start_warm_up()
+        mcp_perso.start_warm_up()
+    mock_thread.assert_called_once()
+    mock_thread.return_value.start.assert_called_once()
+    mcp_perso._warm_up_started.clear()
+
+
+def test_warm_up_loads_every_tool():
+    """Test that the warm-up imports every lazily loaded tool function."""
+    import mcps.mcp_server.mcp_perso as mcp_perso
+
+    mcp_perso._warm_up()
+
+    for name in mcp_perso._LAZY_IMPORTS:
+        assert callable(vars(mcp_perso)[name])
+
+
+def test_static_responses_are_encoded_once():
+    """Test that initialize reads the configuration once and only splices the id afterwards."""
+    import mcps.mcp_server.mcp_perso as mcp_perso
+
+    mcp_perso.invalidate_static_responses()
+    captured_output = StringIO()
+    with patch('mcps.mcp_server.mcp_perso.get_config_value', return_value="x") as mock_config, \
+         patch('sys.stdout', captured_output):
+        handle_initialize(1)
+        handle_initialize("deux")
+    mcp_perso.invalidate_static_responses()
+
+    first, second = [json.loads(line) for line in captured_output.getvalue().strip().splitlines()]
+    assert mock_config.call_count == 3
+    assert (first["id"], second["id"]) == (1, "deux")
+    assert first["result"] == second["result"]
+
+
+def test_static_responses_written_to_binary_buffer():
+    """Test that pre-serialized responses go straight to the binary stdout buffer."""
+    import io
+
+    raw = io.BytesIO()
+    stdout = io.TextIOWrapper(raw, encoding="utf-8")
+    with patch('sys.stdout', stdout):
+        handle_list_tools(7)
+
+    response = json.loads(raw.getvalue().decode("utf-8"))
+    assert response["id"] == 7
+    assert response["result"]["tools"][0]["name"] == "calcul"
+    assert any("synthèse" in tool["description"] for tool in response["result"]["tools"])
+
+
+def test_static_responses_invalidated_on_config_reload():
+    """Test that a configuration reload rebuilds the initialize response."""
+    import mcps.mcp_server.mcp_perso as mcp_perso
+    from mcps.utils import config
+
+    def versions():
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output):
+            handle_initialize("v")
+        return json.loads(captured_output.getvalue())["result"]["serverInfo"]["version"]
+
+    mcp_perso.invalidate_static_responses()
+    with patch('mcps.mcp_server.mcp_perso.get_config_value', return_value="1.0"):
+        assert versions() == "1.0"
+    with patch('mcps.mcp_server.mcp_perso.get_config_value', return_value="2.0"):
+        assert versions() == "1.0"
+        with patch.object(config, 'ConfigManager') as mock_manager_class:
+            mock_manager_class.return_value.load_error = None
+            config.reload_config()
+        assert versions() == "2.0"
+    mcp_perso.invalidate_static_responses()
+    config._config_manager = None
+
+
+def _run_main(requests, config=None):
+    """Run the server loop on the given request lines and return the parsed output lines."""
+    from mcps.mcp_server.mcp_perso import main
+
+    config = config or {}
+    captured_output = StringIO()
+    with patch('sys.stdin', StringIO("\n".join(json.dumps(r) for r in requests) + "\n")), \
+         patch('sys.stdout', captured_output), \
+         patch('mcps.mcp_server.mcp_perso.get_config_value',
+               side_effect=lambda key, default=None: config.get(key, default)):
+        main()
+    return [json.loads(line) for line in captured_output.getvalue().strip().splitlines()]
+
+
+def test_main_answers_batch_with_one_array():
+    """Test that a JSON-RPC batch gets a single array response, in request order."""
+    batch = [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+         "params": {"name": "calcul", "arguments": {"a": 1, "b": 2}}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/call",
+         "params": {"name": "calcul", "arguments": {"a": 2, "b": 2}}},
+        42,
+    ]
+
+    responses = _run_main([batch])
+
+    assert len(responses) == 1
+    answers = responses[0]
+    assert [answer["id"] for answer in answers] == [1, 2, 3, None]
+    assert "= 3" in answers[0]["result"]["content"][0]["text"]
+    assert len(answers[1]["result"]["tools"]) == 8
+    assert "= 4" in answers[2]["result"]["content"][0]["text"]
+    assert answers[3]["error"]["code"] == -32600
+
+
+def test_main_rejects_empty_batch():
+    """Test that an empty batch is answered with an Invalid Request error."""
+    responses = _run_main([[]])
+
+    assert responses == [{"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}]
+
+
+def test_batch_respects_concurrency_limit():
+    """Test that no more than server.batch_concurrency calls of a batch run at once."""
+    import threading
+    import time
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_jsonise():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return {"output": "ok"}
+
+    batch = [{"jsonrpc": "2.0", "id": i, "method": "tools/call",
+              "params": {"name": "resume_emails", "arguments": {}}} for i in range(6)]
+    with patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=slow_jsonise):
+        responses = _run_main([batch], {"server.max_workers": 4, "server.batch_concurrency": 2})
+
+    assert [answer["id"] for answer in responses[0]] == list(range(6))
+    assert max(peak) == 2
+
+
+def test_tool_timeout_returns_error():
+    """Test that a tool exceeding its configured deadline gets a JSON-RPC error."""
+    import time
+    from mcps.utils.cancellation import check_cancelled
+
+    def slow_jsonise():
+        for _ in range(100):
+            time.sleep(0.01)
+            check_cancelled()
+        return {"output": "trop tard"}
+
+    request = {"jsonrpc": "2.0", "id": "t", "method": "tools/call",
+               "params": {"name": "resume_emails", "arguments": {}}}
+    with patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=slow_jsonise):
+        responses = _run_main([request], {"server.timeouts": {"resume_emails": 0.05}})
+
+    assert responses[0]["id"] == "t"
+    assert responses[0]["error"]["code"] == -32001
+    assert "resume_emails" in responses[0]["error"]["message"]
+
+
+def test_late_result_after_deadline_is_an_error():
+    """Test that a non-cooperative tool finishing past its deadline still gets the timeout error."""
+    import time
+
+    from mcps.mcp_server.mcp_perso import call_tool
+
+    def slow_jsonise():
+        time.sleep(0.05)
+        return {"output": "trop tard"}
+
+    with patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=slow_jsonise), \
+         patch('mcps.mcp_server.mcp_perso.get_config_value', return_value={"default": 0.01}):
+        response = call_tool("late", {"name": "resume_emails", "arguments": {}})
+
+    assert response["error"]["code"] == -32001
+
+
+def test_notifications_cancelled_stops_tool_without_response():
+    """Test that notifications/cancelled interrupts a running tool and suppresses its response."""
+    import threading
+    import time
+    from mcps.utils.cancellation import current_token
+
+    started = threading.Event()
+    stopped = []
+
+    def long_jsonise():
+        started.set()
+        token = current_token()
+        while not token.wait(0.01):
+            pass
+        stopped.append(token.reason)
+        token.check()
+
+    class SlowStdin:
+        """stdin that waits for the tool to start before sending the cancellation."""
+
+        def __iter__(self):
+            yield json.dumps({"jsonrpc": "2.0", "id": 5, "method": "tools/call",
+                              "params": {"name": "resume_emails", "arguments": {}}}) + "\n"
+            started.wait(5)
+            yield json.dumps({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                              "params": {"requestId": 5, "reason": "abandon"}}) + "\n"
+            yield json.dumps({"jsonrpc": "2.0", "id": 6, "method": "tools/call",
+                              "params": {"name": "calcul", "arguments": {"a": 1, "b": 1}}}) + "\n"
+
+    from mcps.mcp_server.mcp_perso import main
+
+    captured_output = StringIO()
+    start = time.monotonic()
+    with patch('sys.stdin', SlowStdin()), \
+         patch('sys.stdout', captured_output), \
+         patch('mcps.mcp_server.mcp_perso.get_config_value', side_effect=lambda key, default=None: default), \
+         patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=long_jsonise):
+        main()
+
+    responses = [json.loads(line) for line in captured_output.getvalue().strip().splitlines()]
+    assert [r["id"] for r in responses] == [6]
+    assert stopped == ["abandon"]
+    assert time.monotonic() - start < 5
+
+
+def test_progress_notifications_for_resume_emails():
+    """Test that a progressToken turns tool progress into notifications/progress messages."""
+    from mcps.utils.progress import current_reporter
+
+    def streaming_jsonise(stream_chunk=None):
+        reporter = current_reporter()
+        reporter.partial(2, "premier morceau")
+        reporter.partial(3, "second morceau", total=3)
+        return {"output": "premier morceau\nsecond morceau"}
+
+    request = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+               "params": {"name": "resume_emails", "arguments": {"lot": 2},
+                          "_meta": {"progressToken": "p1"}}}
+    with patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=streaming_jsonise) as mock_run_jsonise:
+        responses = _run_main([request])
+
+    mock_run_jsonise.assert_called_once_with(stream_chunk=2)
+    notifications = [r for r in responses if r.get("method") == "notifications/progress"]
+    assert [n["params"] for n in notifications] == [
+        {"progressToken": "p1", "progress": 2, "message": "premier morceau"},
+        {"progressToken": "p1", "progress": 3, "total": 3, "message": "second morceau"},
+    ]
+    # La réponse finale suit les notifications
+    assert responses[-1]["id"] == 1
+    assert responses[-1]["result"]["content"][0]["text"] == "premier morceau\nsecond morceau"
+
+
+def test_no_progress_without_progress_token():
+    """Test that tools run without a reporter when the client asks for no progress."""
+    from mcps.utils.progress import current_reporter
+
+    seen = []
+
+    def jsonise():
+        seen.append(current_reporter())
+        return {"output": "ok"}
+
+    request = {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+               "params": {"name": "resume_emails", "arguments": {}}}
+    with patch('mcps.mcp_server.mcp_perso.run_jsonise', side_effect=jsonise):
+        responses = _run_main([request])
+
+    assert seen == [None]
+    assert len(responses) == 1
+
+
+@patch('mcps.mcp_server.mcp_perso.run_jsonise')
+def test_resume_emails_filters(mock_run_jsonise):
+    """Test that resume_emails turns its filters into an EmailSelection."""
+    mock_run_jsonise.return_value = {"output": "Résumé filtré"}
+
+    response = call_tool("f1", {"name": "resume_emails",
+                                "arguments": {"since": "2024-01-05", "from": "alice", "limit": 3}})
+
+    assert response["result"]["content"][0]["text"] == "Résumé filtré"
+    selection = mock_run_jsonise.call_args.kwargs["selection"]
+    assert selection.sender == "alice"
+    assert selection.limit == 3
+    assert selection.since.date().isoformat() == "2024-01-05"
+
+
+@patch('mcps.mcp_server.mcp_perso.run_jsonise')
+def test_resume_emails_invalid_filter(mock_run_jsonise):
+    """Test that an invalid filter is reported without reading the mailbox."""
+    response = call_tool("f2", {"name": "resume_emails", "arguments": {"since": "hier"}})
+
+    assert "Argument invalide" in response["result"]["content"][0]["text"]
+    mock_run_jsonise.assert_not_called()
+
+
+@patch('mcps.mcp_server.mcp_perso.run_liste_emails')
+def test_liste_emails(mock_run_liste_emails):
+    """Test that liste_emails returns the header listing of the mailbox."""
+    mock_run_liste_emails.return_value = {"output": '{"from": "a", "subject": "b", "date": "c"}'}
+
+    response = call_tool("l1", {"name": "liste_emails", "arguments": {"subject": "b"}})
+
+    assert response["result"]["content"][0]["text"] == '{"from": "a", "subject": "b", "date": "c"}'
+    assert mock_run_liste_emails.call_args.args[0].subject == "b"
+
+
+def test_clipboard_watch_started_after_initialize():
+    """Test that clipboard.watch starts the resident clipboard watcher once initialized."""
+    with patch('mcps.mcp_server.mcp_perso.start_clipboard_watcher') as mock_start:
+        _run_main([{"jsonrpc": "2.0", "id": 1, "method": "initialize"}],
+                  {"clipboard.watch": True, "clipboard.interval": 0.2})
+        mock_start.assert_called_once_with(0.2, None)
+
+        mock_start.reset_mock()
+        _run_main([{"jsonrpc": "2.0", "id": 1, "method": "initialize"}])
+        mock_start.assert_not_called()
+
+
+@patch('mcps.mcp_server.mcp_perso.recuperer_texte_du_presse_papier')
+def test_prepare_synthese_long_text_is_split(mock_recuperer):
+    """Test that a long clipboard text is served as numbered parts fetched by cursor."""
+    paragraphs = [f"Paragraphe {i}. " + "mot " * 40 for i in range(6)]
+    mock_recuperer.return_value = json.dumps("\n\n".join(paragraphs))
+    config = {"synthese.max_chars": 500}
+
+    with patch('mcps.mcp_server.mcp_perso.get_config_value',
+               side_effect=lambda key, default=None: config.get(key, default)):
+        first = json.loads(call_tool("s1", {"name": "prepare_synthese", "arguments": {}})
+                           ["result"]["content"][0]["text"])
+        cursors = first["**CURSEURS**"]
+        others = [json.loads(call_tool(f"s{i}", {"name": "prepare_synthese", "arguments": {"cursor": cursor}})
+                             ["result"]["content"][0]["text"]) for i, cursor in enumerate(cursors, 2)]
+
+    total = len(cursors) + 1
+    assert total > 1
+    assert first["**PARTIE**"] == f"1/{total}"
+    assert "map" in first["**OBJECTIF**"] and "reduce" in first["**OBJECTIF**"]
+    parts = [first] + others
+    assert [part["**PARTIE**"] for part in parts] == [f"{i}/{total}" for i in range(1, total + 1)]
+    assert all(len(part["**TEXTE CIBLE**"]) <= 500 for part in parts)
+    assert " ".join(part["**TEXTE CIBLE**"] for part in parts).split() == " ".join(paragraphs).split()
+    mock_recuperer.assert_called_once()
+
+
+@patch('mcps.mcp_server.mcp_perso.recuperer_texte_du_presse_papier')
+def test_prepare_synthese_presummarizes_long_text(mock_recuperer):
+    """Test that a text above synthese.presummary_words is reduced before being wrapped."""
+    texte = ("Le budget du projet est validé par l'équipe. Il pleut sur la ville. "
+             "L'équipe du projet revoit le budget jeudi. Le chat dort.")
+    mock_recuperer.return_value = json.dumps(texte)
+    config = {"synthese.presummary_words": 10, "synthese.presummary_target_words": 16}
+
+    with patch('mcps.mcp_server.mcp_perso.get_config_value',
+               side_effect=lambda key, default=None: config.get(key, default)):
+        text = call_tool("s1", {"name": "prepare_synthese", "arguments": {}})["result"]["content"][0]["text"]
+
+    assert "'**TEXTE CIBLE**'" in text
+    assert "Le budget du projet est validé par l'équipe. L'équipe du projet revoit le budget jeudi." in text
+    assert "Il pleut" not in text
+
+
+@patch('mcps.mcp_server.mcp_perso.refresh_config')
+def test_main_checks_config_file_between_requests(mock_refresh):
+    """Test that the server loop checks config.yaml for changes with server.config_check_interval."""
+    _run_main([{"jsonrpc": "2.0", "id": 1, "method": "ping"}, {"jsonrpc": "2.0", "id": 2, "method": "ping"}],
+              {"server.config_check_interval": 0.5})
+
+    assert mock_refresh.call_count == 2
+    mock_refresh.assert_called_with(0.5)
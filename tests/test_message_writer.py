@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for the message_writer module."""
+import io
+import json
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.mcp_server.message_writer import MessageWriter, encode_message
+
+
+class RecordingBuffer(io.BytesIO):
+    """Tampon binaire qui compte les appels à write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def test_encode_message():
+    """Test that messages are encoded once to UTF-8 with a trailing newline."""
+    data = encode_message({"id": 1, "text": "crème brûlée"})
+
+    assert data.endswith(b"\n")
+    assert json.loads(data.decode("utf-8")) == {"id": 1, "text": "crème brûlée"}
+    assert "crème".encode("utf-8") in data
+
+
+def test_one_write_per_message():
+    """Test that each message reaches the binary buffer in a single write."""
+    buffer = RecordingBuffer()
+    stream = io.TextIOWrapper(buffer, encoding="utf-8")
+    writer = MessageWriter(stream)
+
+    writer.send({"jsonrpc": "2.0", "id": 1, "result": {}})
+    writer.write(b'{"jsonrpc": "2.0", "id": 2, "result": {}}\n')
+
+    assert buffer.writes == 2
+    assert [json.loads(line)["id"] for line in buffer.getvalue().splitlines()] == [1, 2]
+
+
+def test_text_stream_fallback():
+    """Test that a stream without binary buffer receives decoded text."""
+    stream = io.StringIO()
+    MessageWriter(stream).send({"text": "é"})
+
+    assert json.loads(stream.getvalue()) == {"text": "é"}
+
+
+def test_default_stream_is_current_stdout():
+    """Test that the writer follows sys.stdout when no stream is given."""
+    captured_output = io.StringIO()
+    with patch('sys.stdout', captured_output):
+        MessageWriter().send({"id": 3})
+
+    assert json.loads(captured_output.getvalue()) == {"id": 3}
+
+
+def test_concurrent_messages_do_not_interleave():
+    """Test that messages sent from several threads stay on separate lines."""
+    buffer = io.BytesIO()
+    writer = MessageWriter(io.TextIOWrapper(buffer, encoding="utf-8"))
+    payload = "x" * 5000
+
+    def worker(number):
+        for i in range(50):
+            writer.send({"id": f"{number}-{i}", "text": payload})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = buffer.getvalue().splitlines()
+    assert len(lines) == 400
+    assert all(json.loads(line)["text"] == payload for line in lines)
+
+
+def test_orjson_used_when_available():
+    """Test that orjson is preferred and the standard encoder covers its failures."""
+    fake_orjson = MagicMock(OPT_APPEND_NEWLINE=1)
+    fake_orjson.dumps.return_value = b'{"id":1}\n'
+    with patch('mcps.mcp_server.message_writer.orjson', fake_orjson):
+        assert encode_message({"id": 1}) == b'{"id":1}\n'
+
+        fake_orjson.dumps.side_effect = TypeError("clé non textuelle")
+        assert json.loads(encode_message({1: "un"})) == {"1": "un"}
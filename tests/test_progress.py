@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the progress module."""
+import sys
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.utils.progress import ProgressReporter, bind_reporter, current_reporter, report_progress
+
+
+def test_reporter_throttles_and_keeps_progress_increasing():
+    """Test that updates are grouped and that progress never goes backwards."""
+    sent = []
+    reporter = ProgressReporter(lambda *notification: sent.append(notification), min_interval=60)
+
+    assert reporter.report(1, message="1 email")
+    assert not reporter.report(2)
+    assert reporter.report(3, total=3, force=True)
+    assert not reporter.report(3, force=True)
+    assert not reporter.report(2, force=True)
+
+    assert sent == [(1, None, "1 email"), (3, 3, None)]
+
+
+def test_partial_results_are_never_throttled():
+    """Test that partial results are always sent, in their message field."""
+    sent = []
+    reporter = ProgressReporter(lambda *notification: sent.append(notification), min_interval=60)
+
+    reporter.partial(2, "morceau 1")
+    reporter.partial(4, "morceau 2", total=4)
+
+    assert sent == [(2, None, "morceau 1"), (4, 4, "morceau 2")]
+
+
+def test_report_progress_uses_bound_reporter():
+    """Test that report_progress is a no-op without a reporter and reaches the bound one otherwise."""
+    sent = []
+    reporter = ProgressReporter(lambda *notification: sent.append(notification), min_interval=0)
+
+    report_progress(1)
+    with bind_reporter(reporter):
+        assert current_reporter() is reporter
+        report_progress(1, 10)
+    assert current_reporter() is None
+
+    assert sent == [(1, 10, None)]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Tests for the recipe_search and cherche_recettes modules."""
+import os
+import sqlite3
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.recipes.recipe_search import RecipeSearchIndex, build_match_query
+from mcps.recipes.cherche_recettes import cherche_recettes
+
+
+def _bump_mtime(path):
+    """Force une date de modification différente (résolution du système de fichiers)."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestRecipeSearchIndex:
+    """Tests de l'index plein texte d'une base Gourmand."""
+
+    def setup_method(self):
+        """Crée une base de test au schéma Gourmand (recettes, catégories, ingrédients)."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'recipes.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript('''
+            CREATE TABLE recipe (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                source TEXT,
+                instructions TEXT,
+                deleted INTEGER DEFAULT 0
+            );
+            CREATE TABLE categories (id INTEGER PRIMARY KEY, recipe_id INTEGER, category TEXT);
+            CREATE TABLE ingredients (id INTEGER PRIMARY KEY, recipe_id INTEGER, item TEXT);
+        ''')
+        conn.executemany(
+            'INSERT INTO recipe (id, title, instructions) VALUES (?, ?, ?)',
+            [
+                (1, 'Tarte aux pommes', 'Étaler la pâte, disposer les pommes.'),
+                (2, 'Crème brûlée', 'Cuire la crème au bain-marie.'),
+                (3, 'Gratin dauphinois', 'Trancher les pommes de terre.'),
+            ]
+        )
+        conn.executemany('INSERT INTO categories (recipe_id, category) VALUES (?, ?)',
+                         [(1, 'Dessert'), (2, 'Dessert'), (3, 'Plat')])
+        conn.executemany('INSERT INTO ingredients (recipe_id, item) VALUES (?, ?)',
+                         [(1, 'pomme'), (1, 'beurre'), (2, 'crème'), (3, 'pomme de terre'), (3, 'crème')])
+        conn.commit()
+        conn.close()
+        self.index = RecipeSearchIndex(self.db_path)
+
+    def teardown_method(self):
+        """Ferme l'index et supprime les fichiers."""
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def test_build_match_query(self):
+        """Test que chaque mot devient un préfixe combiné par OR."""
+        assert build_match_query('tarte pomme') == '"tarte"* OR "pomme"*'
+        assert build_match_query('  ,; ') is None
+
+    def test_search_ignores_case_and_accents(self):
+        """Test qu'une saisie sans accents ni majuscules retrouve le titre exact."""
+        results = self.index.search('CREME brulee')
+
+        assert results[0][0] == 'Crème brûlée'
+
+    def test_search_ranks_title_matches_first(self):
+        """Test que le titre pèse plus que les ingrédients dans le classement."""
+        titles = [title for title, _, _ in self.index.search('pomme')]
+
+        assert titles[0] == 'Tarte aux pommes'
+        assert 'Gratin dauphinois' in titles
+
+    def test_search_matches_categories_and_snippet(self):
+        """Test la recherche sur les catégories et la présence d'un extrait."""
+        results = self.index.search('plat')
+
+        assert [title for title, _, _ in results] == ['Gratin dauphinois']
+        assert '[' in results[0][2]
+
+    def test_sync_is_incremental(self):
+        """Test que seules les recettes modifiées ou supprimées sont réindexées."""
+        assert self.index.sync() == 3
+        assert self.index.sync() == 0
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE recipe SET title = 'Tarte fine aux poires' WHERE id = 1")
+        conn.execute("UPDATE recipe SET deleted = 1 WHERE id = 2")
+        conn.commit()
+        conn.close()
+        _bump_mtime(self.db_path)
+
+        assert self.index.sync() == 2
+        assert [title for title, _, _ in self.index.search('poires')] == ['Tarte fine aux poires']
+        assert self.index.search('brulee') == []
+
+    def test_sync_skips_scan_when_recipes_unchanged(self):
+        """Test qu'une écriture de la seule description ne relit pas les recettes (last_modified)."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("ALTER TABLE recipe ADD COLUMN last_modified INTEGER")
+        conn.execute("UPDATE recipe SET last_modified = id")
+        conn.commit()
+        assert self.index.sync() == 3
+
+        conn.execute("UPDATE recipe SET description = '2026-01-01' WHERE id = 1")
+        conn.commit()
+        _bump_mtime(self.db_path)
+        with patch.object(RecipeSearchIndex, '_documents_query') as mock_query:
+            assert self.index.sync() == 0
+        mock_query.assert_not_called()
+
+        conn.execute("UPDATE recipe SET title = 'Tarte fine aux poires', last_modified = 10 WHERE id = 1")
+        conn.commit()
+        conn.close()
+        _bump_mtime(self.db_path)
+
+        assert self.index.sync() == 1
+        assert [title for title, _, _ in self.index.search('poires')] == ['Tarte fine aux poires']
+
+    def test_sync_reads_replaced_database(self):
+        """Test qu'une base remplacée par renommage (nouvel inode) est relue, et non l'ancien fichier."""
+        assert self.index.sync() == 3
+
+        replacement = os.path.join(self.tmpdir.name, 'recipes.db.new')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("VACUUM INTO ?", (replacement,))
+        conn.close()
+        conn = sqlite3.connect(replacement)
+        conn.execute("UPDATE recipe SET title = 'Tarte fine aux poires' WHERE id = 1")
+        conn.commit()
+        conn.close()
+        os.replace(replacement, self.db_path)
+        _bump_mtime(self.db_path)
+
+        assert self.index.sync() == 1
+        assert [title for title, _, _ in self.index.search('poires')] == ['Tarte fine aux poires']
+
+    def test_index_does_not_modify_gourmand_db(self):
+        """Test que la base Gourmand n'est pas modifiée par l'indexation."""
+        before = os.stat(self.db_path).st_mtime_ns
+        self.index.search('tarte')
+
+        assert os.stat(self.db_path).st_mtime_ns == before
+        assert os.path.exists(self.index.index_path)
+
+    def test_minimal_schema(self):
+        """Test une base réduite à la seule table recipe."""
+        db_path = os.path.join(self.tmpdir.name, 'minimal.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE recipe (id INTEGER PRIMARY KEY, title TEXT NOT NULL, description TEXT, source TEXT)')
+        conn.execute("INSERT INTO recipe (title) VALUES ('Soupe à l''oignon')")
+        conn.commit()
+        conn.close()
+
+        index = RecipeSearchIndex(db_path)
+        try:
+            assert [title for title, _, _ in index.search('oignon')] == ["Soupe à l'oignon"]
+        finally:
+            index.close()
+
+    @patch('mcps.recipes.cherche_recettes.get_config_value')
+    def test_cherche_recettes(self, mock_config):
+        """Test la fonction cherche_recettes de bout en bout."""
+        fts_path = os.path.join(self.tmpdir.name, 'fts.sqlite')
+        mock_config.side_effect = lambda key, default=None: {
+            'database.path': self.db_path, 'database.fts_path': fts_path
+        }.get(key, default)
+
+        result = cherche_recettes('gratin')
+        assert result.startswith('Gratin dauphinois : ')
+        assert cherche_recettes('introuvable') == "Aucune recette trouvée pour 'introuvable'."
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for the send_clipboard module."""
+import os
+import sys
+import threading
+import time
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.utils.cancellation import CancelToken, Cancelled, bind_token
+import mcps.utils.send_clipboard as send_clipboard
+from mcps.utils.send_clipboard import _run, recuperer_texte_du_presse_papier
+
+
+def test_run_outside_tool_call():
+    """Test that commands run normally when no tool call is in progress."""
+    result = _run([sys.executable, "-c", "print('ok')"])
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "ok"
+
+
+def test_run_kills_hung_command_on_cancel():
+    """Test that a hung subprocess is killed as soon as the call is cancelled."""
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    start = time.monotonic()
+    with bind_token(token), pytest.raises(Cancelled):
+        _run([sys.executable, "-c", "import time; time.sleep(30)"], timeout=30)
+    assert time.monotonic() - start < 5
+
+
+class FakeCommands:
+    """Stands in for ``_run``: records each command and answers xset and xclip."""
+
+    def __init__(self, xclip_codes, stderr="Error: Can't open display: :1", xset_code=0):
+        self.calls = []
+        self.xclip_codes = list(xclip_codes)
+        self.stderr = stderr
+        self.xset_code = xset_code
+
+    def __call__(self, args, env=None, timeout=5):
+        self.calls.append(os.path.basename(args[0]))
+        if args[0] == 'xset':
+            return subprocess.CompletedProcess(args, self.xset_code, "", "" if self.xset_code == 0 else "unable to open display")
+        code = self.xclip_codes.pop(0)
+        return subprocess.CompletedProcess(args, code, "texte" if code == 0 else "", "" if code == 0 else self.stderr)
+
+
+@pytest.fixture
+def fake_x(monkeypatch):
+    """Isolate the display cache and pretend xclip is installed."""
+    monkeypatch.setattr(send_clipboard, '_display_env', None)
+    monkeypatch.setattr(send_clipboard, '_display_failure', None)
+    monkeypatch.setattr(send_clipboard.shutil, 'which', lambda name: f'/usr/bin/{name}')
+    monkeypatch.setenv('DISPLAY', ':1')
+
+
+def test_display_is_probed_once(fake_x):
+    """Test that only the first read validates the display; later reads run xclip alone."""
+    commands = FakeCommands([0, 0])
+    with patch('mcps.utils.send_clipboard._run', side_effect=commands):
+        assert recuperer_texte_du_presse_papier() == '"texte"'
+        assert recuperer_texte_du_presse_papier() == '"texte"'
+
+    assert commands.calls == ['xset', 'xclip', 'xclip']
+
+
+def test_display_is_probed_again_after_failure(fake_x):
+    """Test that xclip losing the cached display triggers a new probe and one retry."""
+    commands = FakeCommands([0, 1, 0])
+    with patch('mcps.utils.send_clipboard._run', side_effect=commands):
+        recuperer_texte_du_presse_papier()
+        assert recuperer_texte_du_presse_papier() == '"texte"'
+
+    assert commands.calls == ['xset', 'xclip', 'xclip', 'xset', 'xclip']
+
+
+def test_empty_selection_keeps_cached_display(fake_x):
+    """Test that an empty selection is reported as empty without probing the display again."""
+    commands = FakeCommands([1] * 5, stderr="Error: target STRING not available")
+    with patch('mcps.utils.send_clipboard._run', side_effect=commands):
+        for _ in range(5):
+            assert recuperer_texte_du_presse_papier() == '"Presse-papiers PRIMARY vide"'
+        commands.xclip_codes = [1]
+        assert send_clipboard.lire_selection('clipboard') == ""
+
+    assert commands.calls == ['xset'] + ['xclip'] * 6
+
+
+def test_other_xclip_error_is_reported(fake_x):
+    """Test that an xclip failure unrelated to the display is reported without a new probe."""
+    commands = FakeCommands([0, 1], stderr="Error: unexpected failure")
+    with patch('mcps.utils.send_clipboard._run', side_effect=commands):
+        recuperer_texte_du_presse_papier()
+        assert recuperer_texte_du_presse_papier() == '"Erreur xclip: Error: unexpected failure"'
+
+    assert commands.calls == ['xset', 'xclip', 'xclip']
+
+
+
+def test_missing_display_is_probed_again_after_backoff(fake_x, monkeypatch):
+    """Test that a failed probe is kept for PROBE_BACKOFF seconds instead of being redone at each read."""
+    now = [1000.0]
+    monkeypatch.setattr(send_clipboard.time, 'monotonic', lambda: now[0])
+    commands = FakeCommands([], xset_code=1)
+    with patch('mcps.utils.send_clipboard._run', side_effect=commands):
+        for _ in range(3):
+            assert send_clipboard.lire_selection('primary') is None
+        assert commands.calls == ['xset']
+
+        now[0] += send_clipboard.PROBE_BACKOFF
+        assert send_clipboard.lire_selection('primary') is None
+
+    assert commands.calls == ['xset', 'xset']
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for the text_chunker module."""
+import json
+import sys
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.email_processing.text_chunker import (
+    chunk_text, decoupe_pour_synthese, partie_de_synthese, split_text
+)
+
+
+def test_short_text_is_one_part():
+    """Test that a text under the limit is kept whole, and an empty one gives no part."""
+    assert split_text("Court texte.", 100) == ["Court texte."]
+    assert split_text("   ", 100) == []
+
+
+def test_split_prefers_headings_then_paragraphs():
+    """Test that sections start at headings when the text has some."""
+    text = "# Titre A\nIntro A.\n\nSuite A.\n# Titre B\nIntro B.\n\nSuite B."
+    parts = split_text(text, 30)
+
+    assert parts[0].startswith("# Titre A")
+    assert any(part.startswith("# Titre B") for part in parts)
+    assert all(len(part) <= 30 for part in parts)
+
+
+def test_split_falls_back_to_sentences_and_words():
+    """Test that a single long paragraph is cut between sentences, then between words."""
+    text = "Première phrase assez longue. Deuxième phrase assez longue. Troisième."
+    assert split_text(text, 35) == ["Première phrase assez longue.", "Deuxième phrase assez longue.", "Troisième."]
+
+    words = split_text("un deux trois quatre cinq six", 10)
+    assert all(len(part) <= 10 for part in words)
+    assert " ".join(words) == "un deux trois quatre cinq six"
+
+
+def test_parts_are_fetched_by_cursor():
+    """Test the cursor round-trip and its errors."""
+    text = "\n\n".join(f"Paragraphe {i} " + "x" * 50 for i in range(4))
+    first = json.loads(decoupe_pour_synthese(text, 80))
+    document = chunk_text(text, 80)
+
+    assert first["**CURSEURS**"] == [document.cursor(i) for i in range(2, len(document.parts) + 1)]
+    last = json.loads(partie_de_synthese(first["**CURSEURS**"][-1]))
+    assert last["**TEXTE CIBLE**"] == document.parts[-1]
+    assert "**SUITE**" not in last
+
+    assert "invalide" in json.loads(partie_de_synthese("pas-un-curseur"))
+    assert "introuvable" in json.loads(partie_de_synthese("inconnu:1"))
+    assert "inexistante" in json.loads(partie_de_synthese(document.cursor(99)))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for the title_index module."""
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.recipes.database_manager import SQLiteDatabaseManager
+from mcps.recipes.title_index import TitleIndex, is_small_typo, normalise_title, trigrams
+
+
+def test_normalise_title():
+    """Test que accents, casse et ponctuation sont ignorés."""
+    assert normalise_title("  Crème BRÛLÉE, à l'orange ") == "creme brulee a l orange"
+
+
+def test_trigrams_mark_word_starts():
+    """Test le découpage en trigrammes bordés d'espaces."""
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_is_small_typo():
+    """Test que seule une faute de deux caractères au plus, sans mot de plus ou de moins, est une faute de frappe."""
+    assert is_small_typo("gratin dauphinoi", "gratin dauphinois")
+    assert not is_small_typo("soupe de potiron", "soupe de potimarron")
+    assert not is_small_typo("risotto aux champignons", "risotto aux champignons et parmesan")
+
+
+class TestTitleIndex:
+    """Tests de la résolution des titres approchés."""
+
+    def setup_method(self):
+        """Crée une base de test contenant quelques recettes."""
+        self.test_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        self.test_db.close()
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute('CREATE TABLE recipe (id INTEGER PRIMARY KEY, title TEXT NOT NULL, description TEXT, source TEXT)')
+        conn.executemany('INSERT INTO recipe (title) VALUES (?)', [
+            ('Crème brûlée',),
+            ('Tarte aux pommes',),
+            ('Tarte aux poires',),
+            ('Gratin dauphinois',),
+            ('Soupe de potimarron',),
+            ('Risotto aux champignons et parmesan',),
+        ])
+        conn.commit()
+        conn.close()
+
+        self.db_manager = SQLiteDatabaseManager(self.test_db.name)
+        self.db_manager.connect()
+        self.index = TitleIndex(self.test_db.name)
+        self.index.refresh(self.db_manager)
+
+    def teardown_method(self):
+        """Ferme la connexion et supprime la base."""
+        self.db_manager.close()
+        if os.path.exists(self.test_db.name):
+            os.unlink(self.test_db.name)
+
+    def test_exact_title(self):
+        """Test qu'un titre exact est renvoyé tel quel."""
+        assert self.index.resolve('Tarte aux pommes') == ('Tarte aux pommes', ['Tarte aux pommes'])
+
+    def test_accent_and_case_folding(self):
+        """Test qu'un titre sans accents ni majuscules retrouve le titre canonique."""
+        title, _ = self.index.resolve('CREME BRULEE')
+        assert title == 'Crème brûlée'
+
+    def test_typo_is_resolved(self):
+        """Test qu'une petite faute est corrigée quand un seul titre s'impose."""
+        title, candidates = self.index.resolve('Gratin dauphinoi')
+        assert title == 'Gratin dauphinois'
+        assert candidates[0] == 'Gratin dauphinois'
+
+    def test_other_recipe_is_only_proposed(self):
+        """Test qu'un titre voisin mais différent n'est jamais retenu d'office, seulement proposé."""
+        title, candidates = self.index.resolve('Soupe de potiron')
+        assert title is None
+        assert candidates[0] == 'Soupe de potimarron'
+        title, candidates = self.index.resolve('Risotto aux champignons')
+        assert title is None
+        assert candidates[0] == 'Risotto aux champignons et parmesan'
+
+    def test_ambiguous_title_returns_candidates(self):
+        """Test qu'une saisie ambiguë renvoie les titres proches classés."""
+        title, candidates = self.index.resolve('tarte')
+        assert title is None
+        assert set(candidates[:2]) == {'Tarte aux pommes', 'Tarte aux poires'}
+
+    def test_unknown_title(self):
+        """Test qu'une saisie sans rapport ne renvoie rien."""
+        assert self.index.resolve('Bœuf bourguignon xyz') == (None, [])
+
+    def test_refresh_only_when_database_changes(self):
+        """Test que l'index n'est reconstruit qu'après modification de la base."""
+        assert self.index.refresh(self.db_manager) is False
+
+        self.db_manager.execute_query("INSERT INTO recipe (title) VALUES ('Clafoutis')")
+        self.db_manager.commit()
+        stat = os.stat(self.test_db.name)
+        os.utime(self.test_db.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert self.index.refresh(self.db_manager) is True
+        assert self.index.resolve('clafoutis')[0] == 'Clafoutis'
+
+    def _touch(self):
+        """Avance la date de modification de la base."""
+        stat = os.stat(self.test_db.name)
+        os.utime(self.test_db.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_description_update_does_not_rebuild(self):
+        """Test qu'une écriture hors titres (marque_recette_faite) ne reconstruit pas l'index."""
+        from mcps.recipes.recipe_manager import UPDATE_RECIPE_QUERY
+
+        self.db_manager.execute_query(UPDATE_RECIPE_QUERY, ('2026-01-01', 'Tarte aux pommes'))
+        self.db_manager.commit()
+        self._touch()
+        assert self.index.refresh(self.db_manager) is False
+
+        self.db_manager.execute_query("UPDATE recipe SET title = 'Tarte aux pêches' WHERE title = 'Tarte aux poires'")
+        self.db_manager.commit()
+        self._touch()
+        assert self.index.refresh(self.db_manager) is True
+        assert self.index.resolve('tarte aux peches')[0] == 'Tarte aux pêches'
+
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the tool_registry module."""
+import json
+import sys
+
+import pytest
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, 'src')
+
+from mcps.mcp_server.tool_registry import ToolRegistry, CACHEABLE, CPU_BOUND, IO_BOUND, SIDE_EFFECT
+
+
+def _registry():
+    """Registre de test contenant deux outils."""
+    registry = ToolRegistry()
+
+    @registry.tool("double", "Double un nombre", properties={"x": {"type": "number"}},
+                   required=["x"], traits=[CPU_BOUND, CACHEABLE])
+    def double(arguments):
+        return str(arguments["x"] * 2)
+
+    @registry.tool("ecrit", "Écrit quelque chose", traits=[IO_BOUND, SIDE_EFFECT])
+    def ecrit(arguments):
+        return "ok"
+
+    return registry
+
+
+def test_decorator_registers_tools_in_order():
+    """Test that decorated functions are registered in declaration order."""
+    registry = _registry()
+
+    assert [tool.name for tool in registry] == ["double", "ecrit"]
+    assert len(registry) == 2
+    assert "double" in registry
+    assert registry.get("double").handler({"x": 4}) == "8"
+    assert registry.get("inconnu") is None
+
+
+def test_tool_traits():
+    """Test execution traits declared on each tool."""
+    registry = _registry()
+
+    assert registry.get("double").has_trait(CACHEABLE)
+    assert not registry.get("double").has_trait(SIDE_EFFECT)
+    assert registry.get("ecrit").traits == frozenset({IO_BOUND, SIDE_EFFECT})
+
+
+def test_schemas_and_capabilities():
+    """Test the tools/list entries and initialize capabilities built from the registry."""
+    registry = _registry()
+
+    assert registry.capabilities() == {"double": {}, "ecrit": {}}
+    assert registry.schemas()[0] == {
+        "name": "double",
+        "description": "Double un nombre",
+        "inputSchema": {"type": "object", "properties": {"x": {"type": "number"}}, "required": ["x"]},
+    }
+    assert registry.schemas()[1]["inputSchema"] == {"type": "object", "properties": {}, "required": []}
+
+
+def test_tools_json_is_serialized_once():
+    """Test that the tools/list payload is cached until a tool is added."""
+    registry = _registry()
+
+    first = registry.tools_json()
+    assert registry.tools_json() is first
+    assert json.loads(first) == registry.schemas()
+
+    registry.tool("autre", "Encore un outil")(lambda arguments: "")
+    assert len(json.loads(registry.tools_json())) == 3
+
+
+def test_invalid_declarations():
+    """Test that duplicate names and unknown traits are rejected."""
+    registry = _registry()
+
+    with pytest.raises(ValueError):
+        registry.tool("double", "Doublon")(lambda arguments: "")
+    with pytest.raises(ValueError):
+        registry.tool("lent", "Trait inconnu", traits=["gpu"])(lambda arguments: "")